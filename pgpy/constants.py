@@ -284,18 +284,21 @@ class CompressionAlgorithm(IntEnum):
     #: Bzip2
     BZ2 = 0x03
 
-    def compress(self, data):
+    def compress(self, data, level=None):
+        if level is None:
+            level = self.default_level
+
         if self is CompressionAlgorithm.Uncompressed:
             return data
 
         if self is CompressionAlgorithm.ZIP:
-            return zlib.compress(data)[2:-4]
+            return zlib.compress(data, level)[2:-4]
 
         if self is CompressionAlgorithm.ZLIB:
-            return zlib.compress(data)
+            return zlib.compress(data, level)
 
         if self is CompressionAlgorithm.BZ2:
-            return bz2.compress(data)
+            return bz2.compress(data, level)
 
         raise NotImplementedError(self)
 
@@ -317,6 +320,149 @@ class CompressionAlgorithm(IntEnum):
 
         raise NotImplementedError(self)
 
+    @property
+    def default_level(self):
+        """The compression level used when none is specified."""
+        if self is CompressionAlgorithm.BZ2:
+            return 9
+
+        return zlib.Z_DEFAULT_COMPRESSION
+
+    def compressor(self, level=None):
+        """
+        Get an incremental compressor for this algorithm, for compressing data that is too large to hold in memory
+        all at once. It has the same interface as :py:func:`zlib.compressobj`: ``compress(data)`` returns the
+        compressed data that is ready so far, and ``flush()`` returns whatever is left once all of the data has been
+        fed to it.
+
+        :param level: The compression level, from ``1`` (fastest) to ``9`` (smallest).
+                      Defaults to :py:attr:`default_level`.
+        :type level: ``int``
+        """
+        if level is None:
+            level = self.default_level
+
+        if self is CompressionAlgorithm.Uncompressed:
+            return namedtuple('Uncompressed', ['compress', 'flush'])(compress=bytes, flush=bytes)
+
+        if self is CompressionAlgorithm.ZIP:
+            return zlib.compressobj(level, zlib.DEFLATED, -15)
+
+        if self is CompressionAlgorithm.ZLIB:
+            return zlib.compressobj(level)
+
+        if self is CompressionAlgorithm.BZ2:
+            return bz2.BZ2Compressor(level)
+
+        raise NotImplementedError(self)
+
+    def decompressor(self):
+        """
+        Get an incremental decompressor for this algorithm. It has a ``decompress(data)`` method that returns the
+        decompressed data that is ready so far.
+        """
+        if self is CompressionAlgorithm.Uncompressed:
+            return namedtuple('Uncompressed', ['decompress'])(decompress=bytes)
+
+        if self is CompressionAlgorithm.ZIP:
+            return zlib.decompressobj(-15)
+
+        if self is CompressionAlgorithm.ZLIB:
+            return zlib.decompressobj()
+
+        if self is CompressionAlgorithm.BZ2:
+            return bz2.BZ2Decompressor()
+
+        raise NotImplementedError(self)
+
+    def compress_iter(self, chunks, level=None):
+        """
+        Compress an iterable of chunks, yielding compressed data as it becomes available.
+
+        :param chunks: The data to compress.
+        :type chunks: an iterable of ``bytes``, ``bytearray``, or ``memoryview``
+        :param level: The compression level. See :py:meth:`compressor`.
+        :type level: ``int``
+        :returns: A generator of ``bytes``
+        """
+        c = self.compressor(level)
+
+        for chunk in chunks:
+            out = c.compress(bytes(bytearray(chunk)) if six.PY2 else chunk)
+            if out:
+                yield out
+
+        out = c.flush()
+        if out:
+            yield out
+
+    def is_worthwhile(self, sample, threshold=0.9):
+        """
+        Guess whether compressing some data with this algorithm is worth the CPU time, by quickly compressing a sample
+        of it. Data that is already compressed or encrypted (images, archives, and so on) will not shrink any further.
+
+        :param sample: Some of the data, usually the first few tens of kilobytes.
+        :type sample: ``bytes``, ``bytearray``, ``memoryview``
+        :param threshold: The largest compressed size, as a fraction of ``len(sample)``, that is still worthwhile.
+        :type threshold: ``float``
+        :returns: ``bool``
+        """
+        if self is CompressionAlgorithm.Uncompressed or len(sample) == 0:
+            return False
+
+        return sum(len(c) for c in self.compress_iter([sample], level=1)) <= len(sample) * threshold
+
+    def decompress_iter(self, chunks, bufsize=0):
+        """
+        Decompress an iterable of chunks, yielding decompressed data as it becomes available.
+
+        :param chunks: The data to decompress.
+        :type chunks: an iterable of ``bytes``, ``bytearray``, or ``memoryview``
+        :param bufsize: If greater than ``0``, no single piece of output will be larger than this, no matter how
+                        much a chunk of input expands to. (Not supported for :py:obj:`BZ2` on Python 2.)
+        :type bufsize: ``int``
+        :returns: A generator of ``bytes``
+        """
+        d = self.decompressor()
+        bounded = bufsize > 0 and self is not CompressionAlgorithm.Uncompressed
+        bounded &= not (six.PY2 and self is CompressionAlgorithm.BZ2)
+
+        for chunk in chunks:
+            if getattr(d, 'eof', False):
+                # anything following the end of the compressed stream is ignored
+                break
+
+            if six.PY2:
+                chunk = bytes(bytearray(chunk))
+
+            if not bounded:
+                out = d.decompress(chunk)
+                if out:
+                    yield out
+                continue
+
+            while True:
+                out = d.decompress(chunk, bufsize)
+                if out:
+                    yield out
+
+                if self is CompressionAlgorithm.BZ2:
+                    # bz2 keeps hold of the input itself, and tells us whether it has more output ready
+                    if d.eof or d.needs_input:
+                        break
+                    chunk = b''
+
+                else:
+                    # zlib hands back whatever input it did not get to
+                    chunk = d.unconsumed_tail
+                    if not chunk:
+                        break
+
+        if hasattr(d, 'flush'):
+            out = d.flush()
+            if out:
+                yield out
+
 
 class HashAlgorithm(IntEnum):
     Invalid = 0x00
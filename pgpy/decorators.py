@@ -2,6 +2,7 @@
 """
 import contextlib
 import functools
+import itertools
 import six
 import warnings
 
@@ -73,59 +74,70 @@ def sdproperty(fget):
 class KeyAction(object):
     def __init__(self, *usage, **conditions):
         super(KeyAction, self).__init__()
-        self.flags = set(usage)
+        self.flags = frozenset(usage)
         self.conditions = conditions
 
-    @contextlib.contextmanager
-    def usage(self, key, user):
-        def _preiter(first, iterable):
-            yield first
-            for item in iterable:
-                yield item
+        # these are the same for every call, so they are only worked out once
+        self._flagnames = ', '.join(flag.name for flag in sorted(self.flags))
+        self._checks = tuple(sorted(conditions.items()))
 
-        em = {}
-        em['keyid'] = key.fingerprint.keyid
-        em['flags'] = ', '.join(flag.name for flag in self.flags)
+    def select(self, key, user=None):
+        """
+        Find the key to use for this action: ``key`` itself if it has one of the required usage flags, or else the first
+        of its subkeys that does. The result is kept with the rest of the key's cached state, so it is only looked up
+        again after the key has changed.
+        """
+        if not self.flags:
+            return key
 
-        if len(self.flags):
-            for _key in _preiter(key, key.subkeys.values()):
-                if self.flags & set(_key.usage_flags(user)):
-                    break
+        def _select():
+            for _key in itertools.chain([key], key.subkeys.values()):
+                if not self.flags.isdisjoint(_key.usage_flags(user)):
+                    return _key
 
-            else:  # pragma: no cover
-                raise PGPError("Key {keyid:s} does not have the required usage flag {flags:s}".format(**em))
+            raise PGPError("Key {keyid:s} does not have the required usage flag {flags:s}"
+                           "".format(keyid=key.fingerprint.keyid, flags=self._flagnames))
 
-        else:
-            _key = key
+        return key._memo(('select', self.flags, user), _select)
+
+    @contextlib.contextmanager
+    def usage(self, key, user):
+        yield self._select(key, user, stacklevel=4)
+
+    def _select(self, key, user, stacklevel=3):
+        _key = self.select(key, user)
 
         if _key is not key:
-            em['subkeyid'] = _key.fingerprint.keyid
             warnings.warn("Key {keyid:s} does not have the required usage flag {flags:s}; using subkey {subkeyid:s}"
-                          "".format(**em), stacklevel=4)
+                          "".format(keyid=key.fingerprint.keyid, flags=self._flagnames, subkeyid=_key.fingerprint.keyid),
+                          stacklevel=stacklevel)
 
-        yield _key
+        return _key
 
     def check_attributes(self, key):
-        for attr, expected in self.conditions.items():
-            if getattr(key, attr) != expected:
+        for attr, expected in self._checks:
+            got = getattr(key, attr)
+            if got != expected:
                 raise PGPError("Expected: {attr:s} == {eval:s}. Got: {got:s}"
-                               "".format(attr=attr, eval=str(expected), got=str(getattr(key, attr))))
+                               "".format(attr=attr, eval=str(expected), got=str(got)))
 
     def __call__(self, action):
+        # if a key is in the process of being created, it needs to be allowed to certify its own user id
+        allow_incomplete = action.__name__ == 'certify'
+
         # @functools.wraps(action)
         @six.wraps(action)
         def _action(key, *args, **kwargs):
             if key._key is None:
                 raise PGPError("No key!")
 
-            # if a key is in the process of being created, it needs to be allowed to certify its own user id
-            if len(key._uids) == 0 and key.is_primary and action is not key.certify.__wrapped__:
+            if not allow_incomplete and key.is_primary and not key._uids:
                 raise PGPError("Key is not complete - please add a User ID!")
 
-            with self.usage(key, kwargs.get('user', None)) as _key:
-                self.check_attributes(key)
+            _key = self._select(key, kwargs.get('user', None))
+            self.check_attributes(key)
 
-                # do the thing
-                return action(_key, *args, **kwargs)
+            # do the thing
+            return action(_key, *args, **kwargs)
 
         return _action
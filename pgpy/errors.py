@@ -4,6 +4,7 @@
 __all__ = ('PGPError',
            'PGPEncryptionError',
            'PGPDecryptionError',
+           'PGPDecompressionError',
            'PGPOpenSSLCipherNotSupported',
            'PGPInsecureCipher',
            'WontImplementError',)
@@ -24,6 +25,11 @@ class PGPDecryptionError(Exception):
     pass
 
 
+class PGPDecompressionError(PGPError):
+    """Raised when decompressing data would exceed the configured limits"""
+    pass
+
+
 class PGPOpenSSLCipherNotSupported(Exception):
     """Raised when OpenSSL does not support the requested cipher"""
     pass
@@ -8,4 +8,8 @@ from .types import Sub
 
 from .packets import *  # NOQA
 
-__all__ = ['Key', 'Opaque', 'Packet', 'Primary', 'Private', 'Public', 'Sub']
+from .scanner import PacketEntry
+from .scanner import scan
+from .scanner import scan_stream
+
+__all__ = ['Key', 'Opaque', 'Packet', 'PacketEntry', 'Primary', 'Private', 'Public', 'Sub', 'scan', 'scan_stream']
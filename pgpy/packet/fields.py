@@ -11,6 +11,8 @@ import itertools
 import math
 import os
 
+import six
+
 from pyasn1.codec.der import decoder
 from pyasn1.codec.der import encoder
 from pyasn1.type.univ import Integer
@@ -365,6 +367,25 @@ class PubKey(MPIs):
     def verify(self, subj, sigbytes, hash_alg):
         return NotImplemented  # pragma: no cover
 
+    def _verify(self, subj, sigbytes, *args):
+        # subj is either a digest computed ahead of time, to be verified with a Prehashed algorithm in one shot, or an
+        # iterable of pieces of the data, which are fed to a verification context one at a time
+        pubkey = self.__pubkey__()
+        try:
+            if isinstance(subj, (six.binary_type, bytearray)):
+                pubkey.verify(sigbytes, bytes(subj), *args)
+
+            else:
+                verifier = pubkey.verifier(sigbytes, *args)
+                for chunk in subj:
+                    verifier.update(chunk)
+                verifier.verify()
+
+        except InvalidSignature:
+            return False
+
+        return True
+
 
 class OpaquePubKey(PubKey):  # pragma: no cover
     def __init__(self):
@@ -394,16 +415,7 @@ class RSAPub(PubKey):
     def verify(self, subj, sigbytes, hash_alg):
         # zero-pad sigbytes if necessary
         sigbytes = (b'\x00' * (self.n.byte_length() - len(sigbytes))) + sigbytes
-        verifier = self.__pubkey__().verifier(sigbytes, padding.PKCS1v15(), hash_alg)
-        verifier.update(subj)
-
-        try:
-            verifier.verify()
-
-        except InvalidSignature:
-            return False
-
-        return True
+        return self._verify(subj, sigbytes, padding.PKCS1v15(), hash_alg)
 
     def parse(self, packet):
         self.n = MPI(packet)
@@ -418,16 +430,7 @@ class DSAPub(PubKey):
         return dsa.DSAPublicNumbers(self.y, params).public_key(default_backend())
 
     def verify(self, subj, sigbytes, hash_alg):
-        verifier = self.__pubkey__().verifier(sigbytes, hash_alg)
-        verifier.update(subj)
-
-        try:
-            verifier.verify()
-
-        except InvalidSignature:
-            return False
-
-        return True
+        return self._verify(subj, sigbytes, hash_alg)
 
     def parse(self, packet):
         self.p = MPI(packet)
@@ -478,16 +481,7 @@ class ECDSAPub(PubKey):
         return pkt
 
     def verify(self, subj, sigbytes, hash_alg):
-        verifier = self.__pubkey__().verifier(sigbytes, ec.ECDSA(hash_alg))
-        verifier.update(subj)
-
-        try:
-            verifier.verify()
-
-        except InvalidSignature:
-            return False
-
-        return True
+        return self._verify(subj, sigbytes, ec.ECDSA(hash_alg))
 
     def parse(self, packet):
         oidlen = packet[0]
@@ -1041,7 +1035,7 @@ class PrivKey(PubKey):
         pt += hashlib.new('sha1', pt).digest()
 
         # encrypt
-        self.encbytes = bytearray(_encrypt(bytes(pt), bytes(sessionkey), enc_alg, bytes(self.s2k.iv)))
+        self.encbytes = _encrypt(pt, bytes(sessionkey), enc_alg, bytes(self.s2k.iv))
 
         # delete pt and clear self
         del pt
@@ -1066,7 +1060,7 @@ class PrivKey(PubKey):
         del passphrase
 
         # attempt to decrypt this key
-        pt = _decrypt(bytes(self.encbytes), bytes(sessionkey), self.s2k.encalg, bytes(self.s2k.iv))
+        pt = _decrypt(self.encbytes, bytes(sessionkey), self.s2k.encalg, bytes(self.s2k.iv))
 
         # check the hash to see if we decrypted successfully or not
         if self.s2k.usage == 254 and not pt[-20:] == hashlib.new('sha1', pt[:-20]).digest():
@@ -1084,6 +1078,17 @@ class PrivKey(PubKey):
     def sign(self, sigdata, hash_alg):
         return NotImplemented  # pragma: no cover
 
+    def _sign(self, sigdata, *args):
+        # like PubKey._verify, sigdata is either a digest computed ahead of time, or an iterable of pieces of the data
+        privkey = self.__privkey__()
+        if isinstance(sigdata, (six.binary_type, bytearray)):
+            return privkey.sign(bytes(sigdata), *args)
+
+        signer = privkey.signer(*args)
+        for chunk in sigdata:
+            signer.update(chunk)
+        return signer.finalize()
+
     def clear(self):
         """delete and re-initialize all private components to zero"""
         for field in self.__privfields__:
@@ -1174,9 +1179,7 @@ class RSAPriv(PrivKey, RSAPub):
             del kb
 
     def sign(self, sigdata, hash_alg):
-        signer = self.__privkey__().signer(padding.PKCS1v15(), hash_alg)
-        signer.update(sigdata)
-        return signer.finalize()
+        return self._sign(sigdata, padding.PKCS1v15(), hash_alg)
 
 
 class DSAPriv(PrivKey, DSAPub):
@@ -1235,9 +1238,7 @@ class DSAPriv(PrivKey, DSAPub):
             del kb
 
     def sign(self, sigdata, hash_alg):
-        signer = self.__privkey__().signer(hash_alg)
-        signer.update(sigdata)
-        return signer.finalize()
+        return self._sign(sigdata, hash_alg)
 
 
 class ElGPriv(PrivKey, ElGPub):
@@ -1327,9 +1328,7 @@ class ECDSAPriv(PrivKey, ECDSAPub):
         self.s = MPI(kb)
 
     def sign(self, sigdata, hash_alg):
-        signer = self.__privkey__().signer(ec.ECDSA(hash_alg))
-        signer.update(sigdata)
-        return signer.finalize()
+        return self._sign(sigdata, ec.ECDSA(hash_alg))
 
 
 class ECDHPriv(ECDSAPriv, ECDHPub):
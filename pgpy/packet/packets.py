@@ -3,10 +3,16 @@
 import abc
 import binascii
 import calendar
+import contextlib
 import copy
+import functools
 import hashlib
+import itertools
+import mmap as mmap_
 import os
 import re
+import threading
+import weakref
 
 from datetime import datetime
 
@@ -26,6 +32,7 @@ from .fields import String2Key
 from .fields import SubPackets
 from .fields import UserAttributeSubPackets
 
+from .types import Encrypted
 from .types import Packet
 from .types import Primary
 from .types import Private
@@ -43,12 +50,16 @@ from ..constants import TrustLevel
 
 from ..decorators import sdproperty
 
+from ..errors import PGPDecompressionError
 from ..errors import PGPDecryptionError
+from ..errors import PGPError
 
+from ..symenc import _CFB
 from ..symenc import _decrypt
 from ..symenc import _encrypt
 
 from ..types import Fingerprint
+from ..types import KeyID
 
 __all__ = ['PKESessionKey',
            'PKESessionKeyV3',
@@ -160,9 +171,11 @@ class PKESessionKeyV3(PKESessionKey):
     def encrypter(self):
         return self._encrypter
 
+    @encrypter.register(str)
+    @encrypter.register(six.text_type)
     @encrypter.register(bytearray)
     def encrypter_bin(self, val):
-        self._encrypter = binascii.hexlify(val).upper().decode('latin-1')
+        self._encrypter = KeyID(val)
 
     @sdproperty
     def pkalg(self):
@@ -191,7 +204,7 @@ class PKESessionKeyV3(PKESessionKey):
     def __bytearray__(self):
         _bytes = bytearray()
         _bytes += super(PKESessionKeyV3, self).__bytearray__()
-        _bytes += binascii.unhexlify(self.encrypter.encode())
+        _bytes += self.encrypter.__bytes__()
         _bytes += bytearray([self.pkalg])
         _bytes += self.ct.__bytearray__() if self.ct is not None else b'\x00' * (self.header.length - 10)
         return _bytes
@@ -559,7 +572,7 @@ class SKESessionKeyV4(SKESessionKey):
             return self.symalg, sk
 
         # otherwise, we now need to decrypt the encrypted session key
-        m = bytearray(_decrypt(bytes(self.ct), sk, self.symalg))
+        m = _decrypt(self.ct, sk, self.symalg)
         del sk
 
         symalg = SymmetricKeyAlgorithm(m[0])
@@ -665,19 +678,16 @@ class OnePassSignatureV3(OnePassSignature):
 
     @signer.register(str)
     @signer.register(six.text_type)
-    def signer_str(self, val):
-        self._signer = val
-
     @signer.register(bytearray)
     def signer_bin(self, val):
-        self._signer = binascii.hexlify(val).upper().decode('latin-1')
+        self._signer = KeyID(val)
 
     def __init__(self):
         super(OnePassSignatureV3, self).__init__()
         self._sigtype = None
         self._halg = None
         self._pubalg = None
-        self._signer = b'\x00' * 8
+        self._signer = KeyID(bytearray(8))
         self.nested = False
 
     def __bytearray__(self):
@@ -686,7 +696,7 @@ class OnePassSignatureV3(OnePassSignature):
         _bytes += bytearray([self.sigtype])
         _bytes += bytearray([self.halg])
         _bytes += bytearray([self.pubalg])
-        _bytes += binascii.unhexlify(six.b(self.signer))
+        _bytes += self.signer.__bytes__()
         _bytes += bytearray([int(self.nested)])
         return _bytes
 
@@ -732,6 +742,7 @@ class PubKeyV4(PubKey):
     @created.register(datetime)
     def created_datetime(self, val):
         self._created = val
+        self._fingerprint = None
 
     @created.register(int)
     def created_int(self, val):
@@ -786,6 +797,11 @@ class PubKeyV4(PubKey):
 
     @property
     def fingerprint(self):
+        # the fingerprint is only computed again if the key material object has been replaced, or created has changed;
+        # key material is only ever filled in place before the fingerprint is first needed
+        if self._fingerprint is not None and self._fingerprint[0] is self.keymaterial:
+            return self._fingerprint[1]
+
         # A V4 fingerprint is the 160-bit SHA-1 hash of the octet 0x99, followed by the two-octet packet length,
         # followed by the entire Public-Key packet starting with the version field.  The Key ID is the
         # low-order 64 bits of the fingerprint.
@@ -808,10 +824,12 @@ class PubKeyV4(PubKey):
         fp.update(self.keymaterial.__bytearray__()[:plen])
 
         # and return the digest
-        return Fingerprint(fp.hexdigest().upper())
+        self._fingerprint = (self.keymaterial, Fingerprint(fp.digest()))
+        return self._fingerprint[1]
 
     def __init__(self):
         super(PubKeyV4, self).__init__()
+        self._fingerprint = None
         self.created = datetime.utcnow()
         self.pkalg = 0
         self.keymaterial = None
@@ -831,6 +849,9 @@ class PubKeyV4(PubKey):
         pk.pkalg = self.pkalg
         pk.keymaterial = copy.copy(self.keymaterial)
 
+        if self._fingerprint is not None and self._fingerprint[0] is self.keymaterial:
+            pk._fingerprint = (pk.keymaterial, self._fingerprint[1])
+
         return pk
 
     def verify(self, subj, sigbytes, hash_alg):
@@ -948,6 +969,18 @@ class CompressedData(Packet):
     algorithm.
     """
     __typeid__ = 0x08
+    #: The size of the pieces that compressed data is fed to the decompressor in.
+    chunksize = 1 << 16
+    #: The largest number of octets that a compressed data packet, including any compressed data packets nested in
+    #: it, is allowed to decompress to. ``None`` means no limit.
+    max_size = None
+    #: The largest allowed ratio of decompressed size to compressed size. ``None`` means no limit.
+    max_ratio = None
+    #: How deeply compressed data packets are allowed to be nested inside one another. ``None`` means no limit.
+    max_depth = 32
+
+    # decompression state shared by nested compressed data packets that are being parsed on this thread
+    _nesting = threading.local()
 
     @sdproperty
     def calg(self):
@@ -961,33 +994,183 @@ class CompressedData(Packet):
     def __init__(self):
         super(CompressedData, self).__init__()
         self._calg = None
+        self._cdata = None
+        self.level = None
         self.packets = []
 
     def __bytearray__(self):
+        data = self._pktdata()
+        if self._cdata is None or self._cdata[0] != self._cdata_key(data):
+            self._update(data)
+
         _bytes = bytearray()
         _bytes += super(CompressedData, self).__bytearray__()
         _bytes += bytearray([self.calg])
+        _bytes += self._cdata[1]
+        return _bytes
 
-        _pb = bytearray()
+    def _pktdata(self):
+        data = bytearray()
         for pkt in self.packets:
-            _pb += pkt.__bytearray__()
-        _bytes += self.calg.compress(bytes(_pb))
+            data += pkt.__bytearray__()
+        return data
 
-        return _bytes
+    def _cdata_key(self, data):
+        # the compressed data kept by update_hlen is only good as long as nothing it was made from has changed since.
+        # serializing the packets again to check is still much cheaper than compressing them again
+        return self.calg, self.level, hashlib.sha256(data).digest()
+
+    def iter_bytes(self):
+        if not any(getattr(pkt, 'is_file', False) for pkt in self.packets):
+            return super(CompressedData, self).iter_bytes()
+
+        return self.iter_wrapped(chunk for pkt in self.packets for chunk in pkt.iter_bytes())
+
+    def iter_wrapped(self, chunks, partial=True):
+        """
+        Serialize a Compressed Data packet in pieces, like :py:meth:`iter_bytes`, with the already serialized packets
+        in ``chunks`` as its contents instead of :py:attr:`packets`.
+
+        :param partial: If ``True``, the compressed data is written as it is produced, using partial body lengths.
+                        Otherwise, it is all compressed first, and written with a definite length.
+        :type partial: ``bool``
+        """
+        body = self.calg.compress_iter(chunks, self.level)
+
+        if not partial:
+            cdata = bytearray()
+            for chunk in body:
+                cdata += chunk
+
+            self.header.length = 1 + len(cdata)
+            yield super(CompressedData, self).__bytearray__() + bytearray([self.calg]) + cdata
+            return
+
+        # the compressed length is not known until everything has been compressed
+        for chunk in self._partial_body(itertools.chain([bytearray([self.calg])], body)):
+            yield chunk
+
+    def _compress(self, data):
+        cdata = bytearray()
+        for chunk in self.calg.compress_iter([data], self.level):
+            cdata += chunk
+        return cdata
+
+    @staticmethod
+    def _slices(view, length, size):
+        for i in range(0, length, size):
+            piece = view[i:min(i + size, length)]
+            try:
+                yield piece
+
+            finally:
+                if not six.PY2:
+                    piece.release()
+
+    @classmethod
+    def decompress_checked(cls, calg, pieces, total, depth=0, clen=None):
+        """
+        Decompress compressed data that arrives in pieces, yielding the output in pieces of at most :py:attr:`chunksize`
+        octets. :py:attr:`max_depth`, :py:attr:`max_size`, and :py:attr:`max_ratio` are checked as the output is
+        produced, rather than once it is already in memory. :py:meth:`parse` decompresses with this, and so does
+        anything else that reads compressed data, such as :py:meth:`~pgpy.PGPKey.verify_onepass`.
+
+        :param calg: The compression algorithm.
+        :type calg: :py:obj:`~constants.CompressionAlgorithm`
+        :param pieces: The compressed data, not including the algorithm octet.
+        :type pieces: an iterable of ``bytes``, ``bytearray``, or ``memoryview``
+        :param total: A one-item ``list`` holding how many octets have been decompressed so far by this packet and
+                      the packets that it is nested in, which is what counts against :py:attr:`max_size`. It is
+                      updated as the output is produced.
+        :type total: ``list``
+        :param depth: How many compressed data packets this one is nested in.
+        :type depth: ``int``
+        :param clen: The length of the compressed data. If it is not known up front, :py:attr:`max_ratio` is checked
+                     against how much of it has been read so far instead.
+        :type clen: ``int``
+        :raises: :py:exc:`~pgpy.errors.PGPDecompressionError` if a limit is exceeded.
+        """
+        if cls.max_depth is not None and depth >= cls.max_depth:
+            raise PGPDecompressionError("Compressed data is nested more than {:d} deep".format(cls.max_depth))
+
+        read = [0]
+
+        def _counted(pieces):
+            for piece in pieces:
+                read[0] += len(piece)
+                yield piece
+
+        if clen is None:
+            pieces = _counted(pieces)
+
+        size = 0
+        output = calg.decompress_iter(pieces, cls.chunksize)
+        try:
+            for chunk in output:
+                size += len(chunk)
+                total[0] += len(chunk)
+
+                if cls.max_size is not None and total[0] > cls.max_size:
+                    raise PGPDecompressionError("Decompressed data exceeds {:d} octets".format(cls.max_size))
+
+                if cls.max_ratio is not None and size > (read[0] if clen is None else clen) * cls.max_ratio:
+                    raise PGPDecompressionError("Decompressed data exceeds {:g} times its compressed size"
+                                                "".format(cls.max_ratio))
+
+                yield chunk
+
+        finally:
+            output.close()
+
+    def update_hlen(self):
+        # compressing is expensive, so keep the result for the __bytearray__ call that follows this
+        self._update(self._pktdata())
+
+    def _update(self, data):
+        self._cdata = (self._cdata_key(data), self._compress(data))
+        self.header.length = 1 + len(self._cdata[1])
 
     def parse(self, packet):
         super(CompressedData, self).parse(packet)
         self.calg = packet[0]
         del packet[0]
 
-        cdata = bytearray(self.calg.decompress(packet[:self.header.length - 1]))
-        del packet[:self.header.length - 1]
+        cdata = bytearray()
+        clen = self.header.length - 1
+
+        nesting = CompressedData._nesting
+        depth = getattr(nesting, 'depth', 0)
+        if depth == 0:
+            nesting.total = [0]
+
+        nesting.depth = depth + 1
+        try:
+            # feed the compressed data to the decompressor in pieces rather than copying it out of packet first
+            view = memoryview(packet)
+            pieces = self._slices(view, clen, self.chunksize)
+            output = self.decompress_checked(self.calg, pieces, nesting.total, depth, clen)
+            try:
+                for chunk in output:
+                    cdata += chunk
+
+            finally:
+                # packet can't be resized while any part of it is still exported, and on runtimes without
+                # refcounting, dropping the last reference to a view doesn't release it right away
+                output.close()
+                pieces.close()
+                if not six.PY2:
+                    view.release()
+
+            del packet[:clen]
 
-        while len(cdata) > 0:
-            self.packets.append(Packet(cdata))
+            while len(cdata) > 0:
+                self.packets.append(Packet(cdata))
 
+        finally:
+            nesting.depth = depth
 
-class SKEData(Packet):
+
+class SKEData(Packet, Encrypted):
     """
     5.7.  Symmetrically Encrypted Data Packet (Tag 9)
 
@@ -1045,7 +1228,7 @@ class SKEData(Packet):
 
     def __copy__(self):
         skd = self.__class__()
-        skd.ct = self.ct[:]
+        skd.ct = bytearray(self.ct)
         return skd
 
     def parse(self, packet):
@@ -1054,7 +1237,7 @@ class SKEData(Packet):
         del packet[:self.header.length]
 
     def decrypt(self, key, alg):  # pragma: no cover
-        pt = _decrypt(bytes(self.ct), bytes(key), alg)
+        pt = _decrypt(self.ct, bytes(key), alg)
 
         iv = bytes(pt[:alg.block_size // 8])
         del pt[:alg.block_size // 8]
@@ -1152,15 +1335,44 @@ class LiteralData(Packet):
     def mtime_bin(self, val):
         self.mtime = self.bytes_to_int(val)
 
+    #: The size of the pieces that file-backed contents are read in, and that redirected contents are written in.
+    chunksize = 1 << 16
+
+    # where the contents of packets parsed by this thread go, when they are being redirected
+    _sink = threading.local()
+
     @property
     def contents(self):
+        """
+        The contents of this packet. If they are backed by a file, the entire file is read in order to return them;
+        use :py:meth:`iter_contents` to avoid that.
+        """
+        _contents = self._contents
+        if self._file is not None or self._redirected:
+            _contents = bytearray()
+            for chunk in self.iter_contents():
+                _contents += chunk
+
         if self.format == 't':
-            return self._contents.decode('latin-1')
+            return _contents.decode('latin-1')
 
         if self.format == 'u':
-            return self._contents.decode('utf-8')
+            return _contents.decode('utf-8')
 
-        return self._contents
+        return _contents
+
+    @property
+    def is_file(self):
+        """``True`` if the contents of this packet are read from a file as they are needed."""
+        return self._file is not None
+
+    @property
+    def is_redirected(self):
+        """
+        ``True`` if the contents of this packet were written somewhere else while it was being parsed
+        (see :py:meth:`redirect`), in which case only its metadata is available.
+        """
+        return self._redirected
 
     def __init__(self):
         super(LiteralData, self).__init__()
@@ -1168,15 +1380,18 @@ class LiteralData(Packet):
         self.filename = ''
         self.mtime = datetime.utcnow()
         self._contents = bytearray()
+        # (file object or mmap, offset, length) if the contents are backed by a file
+        self._file = None
+        # (what attach_file was given, whether it was memory mapped) if this packet opened a file or mmap itself,
+        # along with what closes them again
+        self._source = None
+        self._close = None
+        self._redirected = False
 
     def __bytearray__(self):
         _bytes = bytearray()
-        _bytes += super(LiteralData, self).__bytearray__()
-        _bytes += self.format.encode('latin-1')
-        _bytes += bytearray([len(self.filename)])
-        _bytes += self.filename.encode('latin-1')
-        _bytes += self.int_to_bytes(calendar.timegm(self.mtime.timetuple()), 4)
-        _bytes += self._contents
+        for chunk in self.iter_bytes():
+            _bytes += chunk
         return _bytes
 
     def __copy__(self):
@@ -1186,9 +1401,154 @@ class LiteralData(Packet):
         pkt.filename = self.filename
         pkt.mtime = self.mtime
         pkt._contents = self._contents[:]
+        pkt._file = self._file
+        pkt._redirected = self._redirected
+
+        if self._source is not None:
+            # whatever this packet opened itself is closed along with it, so the copy needs its own
+            fp, mmap = self._source
+            _, start, length = self._file
+            pkt._attach(fp, start, length, mmap)
 
         return pkt
 
+    @classmethod
+    @contextlib.contextmanager
+    def redirect(cls, sink):
+        """
+        Context manager that, while it is active, writes the contents of every Literal Data packet parsed in the
+        current thread to ``sink`` as they are parsed, instead of keeping them in the packet. Only the metadata of the
+        packets (format, filename, and modification time) is kept.
+
+        :param sink: A writable binary file object, or a callable that is called with each piece of the contents in
+                     turn. ``None`` turns off any redirection that is already active.
+        :type sink: file object, ``callable``, ``None``
+        """
+        prev = getattr(cls._sink, 'write', None)
+        cls._sink.write = getattr(sink, 'write', sink)
+
+        try:
+            yield
+
+        finally:
+            cls._sink.write = prev
+
+    def attach_file(self, fp, mmap=False):
+        """
+        Back the contents of this packet with a file, which is then read in pieces whenever the contents are needed
+        (e.g. when serializing, signing, or encrypting), instead of being loaded into memory.
+
+        :param fp: The path to the file, or a binary file object. The contents are everything from the current
+                   position of the file object to the end of the file.
+        :type fp: ``str``, file object
+        :param mmap: If ``True``, memory map the file instead of reading it.
+        :type mmap: ``bool``
+
+        If ``fp`` is a path, or ``mmap`` is ``True``, the file or memory map opened here belongs to this packet, and is
+        closed by :py:meth:`close`, when leaving a ``with`` block, or when the packet is garbage collected. A file
+        object passed in is never closed here.
+        """
+        self._attach(fp, None, None, mmap)
+        self.update_hlen()
+
+    def _attach(self, fp, start, length, mmap):
+        self.close()
+        source, opened = fp, []
+
+        if isinstance(fp, six.string_types):
+            fp = open(fp, 'rb')
+            opened.append(fp)
+
+        try:
+            if start is None:
+                start = fp.tell()
+                fp.seek(0, os.SEEK_END)
+                length = fp.tell() - start
+                fp.seek(start)
+
+            src = fp
+            if mmap and length > 0:
+                src = mmap_.mmap(fp.fileno(), 0, access=mmap_.ACCESS_READ)
+                opened.append(src)
+
+        except Exception:
+            LiteralData._close_all(opened)
+            raise
+
+        self._contents = bytearray()
+        self._file = (src, start, length)
+
+        if opened:
+            self._source = (source, mmap)
+            # weakref.finalize is not available on Python 2, where files and memory maps are closed when collected
+            self._close = weakref.finalize(self, LiteralData._close_all, opened) if six.PY3 \
+                else functools.partial(LiteralData._close_all, opened)
+
+    @staticmethod
+    def _close_all(opened):
+        for obj in reversed(opened):
+            obj.close()
+
+    def close(self):
+        """
+        Close the file, or memory map, that :py:meth:`attach_file` opened for this packet, if any. The contents can
+        not be read afterwards.
+        """
+        if self._close is not None:
+            self._close()
+            self._source = self._close = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def iter_contents(self):
+        """
+        A generator yielding the contents of this packet in pieces of at most :py:attr:`chunksize` octets.
+
+        :raises: :py:exc:`~pgpy.errors.PGPError` if the contents were redirected when this packet was parsed.
+        """
+        if self._redirected:
+            raise PGPError("The contents of this Literal Data packet were redirected when it was parsed")
+
+        if self._file is None:
+            for pos in range(0, len(self._contents), self.chunksize):
+                yield self._contents[pos:pos + self.chunksize]
+
+        else:
+            src, start, length = self._file
+            for pos in range(start, start + length, self.chunksize):
+                size = min(self.chunksize, start + length - pos)
+
+                if isinstance(src, mmap_.mmap):
+                    yield src[pos:pos + size]
+                    continue
+
+                src.seek(pos)
+                chunk = src.read(size)
+                if len(chunk) != size:
+                    raise PGPError("{:s} changed while it was being read".format(getattr(src, 'name', 'File')))
+                yield chunk
+
+    def iter_bytes(self):
+        _bytes = bytearray()
+        _bytes += super(LiteralData, self).__bytearray__()
+        _bytes += self.format.encode('latin-1')
+        _bytes += bytearray([len(self.filename)])
+        _bytes += self.filename.encode('latin-1')
+        _bytes += self.int_to_bytes(calendar.timegm(self.mtime.timetuple()), 4)
+        yield _bytes
+
+        for chunk in self.iter_contents():
+            yield chunk
+
+    def update_hlen(self):
+        # this does not need to serialize (or for file-backed contents, read) the whole packet
+        clen = len(self._contents) if self._file is None else self._file[2]
+        self.header.length = 6 + len(self.filename.encode('latin-1')) + clen
+
     def parse(self, packet):
         super(LiteralData, self).parse(packet)
         self.format = chr(packet[0])
@@ -1203,8 +1563,18 @@ class LiteralData(Packet):
         self.mtime = packet[:4]
         del packet[:4]
 
-        self._contents = packet[:self.header.length - (6 + fnl)]
-        del packet[:self.header.length - (6 + fnl)]
+        clen = self.header.length - (6 + fnl)
+        write = getattr(LiteralData._sink, 'write', None)
+
+        if write is None:
+            self._contents = packet[:clen]
+
+        else:
+            for pos in range(0, clen, self.chunksize):
+                write(packet[pos:min(pos + self.chunksize, clen)])
+            self._redirected = True
+
+        del packet[:clen]
 
 
 class Trust(Packet):
@@ -1408,7 +1778,7 @@ class IntegrityProtectedSKEData(VersionedPacket):
     __ver__ = 0
 
 
-class IntegrityProtectedSKEDataV1(IntegrityProtectedSKEData):
+class IntegrityProtectedSKEDataV1(IntegrityProtectedSKEData, Encrypted):
     """
     5.13.  Sym. Encrypted Integrity Protected Data Packet (Tag 18)
 
@@ -1522,7 +1892,7 @@ class IntegrityProtectedSKEDataV1(IntegrityProtectedSKEData):
 
     def __copy__(self):
         skd = self.__class__()
-        skd.ct = self.ct[:]
+        skd.ct = bytearray(self.ct)
         return skd
 
     def parse(self, packet):
@@ -1531,20 +1901,57 @@ class IntegrityProtectedSKEDataV1(IntegrityProtectedSKEData):
         del packet[:self.header.length - 1]
 
     def encrypt(self, key, alg, data):
-        iv = alg.gen_iv()
-        data = iv + iv[-2:] + data
+        """
+        :param data: The plaintext, either all at once or as an iterable of chunks (such as the output of
+                     :py:meth:`~Packet.iter_bytes`), which are hashed and encrypted one at a time.
+        :type data: ``bytes``, ``bytearray``, or an iterable of them
+        """
+        # the MDC packet is always 22 octets long
+        ctlen = None
+        if isinstance(data, (six.binary_type, bytearray)):
+            ctlen = len(data) + 22
+            data = [data]
 
+        iv = alg.gen_iv()
+        prefix = iv + iv[-2:]
+
+        # hash and encrypt the prefix, data, and MDC straight into one buffer, rather than concatenating the plaintext
+        # first. if the length of the data is known, the buffer is allocated just once; otherwise it grows as needed.
+        mdcsum = hashlib.new('SHA1', prefix)
+        cfb = _CFB(key, alg)
+        self.ct = bytearray(len(prefix) + (ctlen or 0) + cfb.block_size - 1)
+        pos = 0
+
+        def _update(chunk, pos):
+            need = pos + len(chunk) + cfb.block_size - 1
+            if len(self.ct) < need:
+                self.ct += bytearray(max(need - len(self.ct), len(self.ct)))
+
+            # the view has to be gone before the buffer can grow again
+            ctv = memoryview(self.ct)
+            pos += cfb.update_into(chunk, ctv[pos:])
+            del ctv
+            return pos
+
+        pos = _update(prefix, pos)
+        for chunk in data:
+            mdcsum.update(chunk)
+            pos = _update(chunk, pos)
+
+        mdcsum.update(b'\xd3\x14')
         mdc = MDC()
-        mdc.mdc = binascii.hexlify(hashlib.new('SHA1', data + b'\xd3\x14').digest())
+        mdc.mdc = binascii.hexlify(mdcsum.digest())
         mdc.update_hlen()
 
-        data += mdc.__bytes__()
-        self.ct = _encrypt(data, key, alg)
+        pos = _update(mdc.__bytes__(), pos)
+        cfb.finalize()
+
+        del self.ct[pos:]
         self.update_hlen()
 
     def decrypt(self, key, alg):
         # iv, ivl2, pt = super(IntegrityProtectedSKEDataV1, self).decrypt(key, alg)
-        pt = _decrypt(bytes(self.ct), bytes(key), alg)
+        pt = _decrypt(self.ct, bytes(key), alg)
 
         # do the MDC checks
         _expected_mdcbytes = b'\xd3\x14' + hashlib.new('SHA1', pt[:-20]).digest()
@@ -0,0 +1,256 @@
+""" scanner.py
+
+walk OpenPGP packet headers without constructing packet objects
+"""
+import collections
+
+import six
+
+from .types import Packet
+
+from ..constants import PacketTag
+
+from ..errors import PGPError
+
+from ..types import MetaDispatchable
+
+__all__ = ['PacketEntry',
+           'scan',
+           'scan_stream',
+           '_new_length',
+           '_reader']
+
+_tags = dict((t.value, t) for t in PacketTag)
+# the size of the length field of an old format header, by length type
+_old_llen = {0: 1, 1: 2, 2: 4, 3: 0}
+
+
+def _new_length(data, pos):
+    # returns (the parsed length, size of length field, whether the length was of partial type)
+    fo = data[pos]
+
+    if 192 > fo:
+        return (fo, 1, False)
+
+    if 224 > fo:  # >= 192 is implied
+        return (((fo - 192) << 8) + data[pos + 1] + 192, 2, False)
+
+    if 255 > fo:  # >= 224 is implied
+        return (1 << (fo & 0x1f), 1, True)
+
+    return ((data[pos + 1] << 24) | (data[pos + 2] << 16) | (data[pos + 3] << 8) | data[pos + 4], 5, False)
+
+
+def _reader(chunks):
+    # turn an iterable of chunks into a function that reads exactly n octets, or fewer only at the end
+    chunks = iter(chunks)
+    buf = bytearray()
+
+    def read(n):
+        while len(buf) < n:
+            chunk = next(chunks, None)
+            if chunk is None:
+                break
+            buf.extend(chunk)
+
+        out = buf[:n]
+        del buf[:n]
+        return out
+
+    return read
+
+
+class PacketEntry(collections.namedtuple('PacketEntry', ['offset', 'hlen', 'length', 'tag', 'version', 'size'])):
+    """
+    One entry in the index produced by :py:func:`scan`.
+
+    ``offset`` - the offset of the first octet of the packet header in the scanned buffer.
+
+    ``hlen`` - the length of the packet header, in octets. For packets with partial body lengths, this only counts
+    the first length field.
+
+    ``length`` - the length of the packet body, in octets. For packets with partial body lengths, this is the sum of
+    all of the partial lengths.
+
+    ``tag`` - the :py:obj:`~constants.PacketTag` of the packet, or an ``int`` if the tag is unknown.
+
+    ``version`` - the version octet of the packet if it is of a versioned type, otherwise ``None``.
+
+    ``size`` - the total number of octets the packet occupies in the buffer, including any partial length fields.
+    """
+    __slots__ = ()
+
+    @property
+    def partial(self):
+        """``True`` if this packet was encoded with partial body lengths."""
+        return self.size != self.hlen + self.length
+
+    @property
+    def end(self):
+        """The offset of the first octet following this packet."""
+        return self.offset + self.size
+
+
+def scan(data, offset=0):
+    """
+    Build an index of the packets in a buffer of raw (not ASCII-armored) OpenPGP data by reading only packet headers.
+    No packet objects are constructed and packet bodies are never copied, so this is a cheap way to find out what a
+    blob contains, count its packets, or find the offset of a specific packet in a large file.
+
+    Both old and new format headers are understood, including new format packets with partial body lengths.
+
+    :param data: The data to scan. Memory mapped files work too.
+    :type data: ``bytes``, ``bytearray``, ``memoryview``, :py:obj:`mmap.mmap`
+    :param offset: The offset at which to start scanning. Defaults to ``0``.
+    :type offset: ``int``
+    :raises: :py:exc:`~pgpy.errors.PGPError` if a malformed or truncated packet header is encountered.
+    :returns: A ``list`` of :py:obj:`PacketEntry`, in the order they appear in ``data``.
+    """
+    if six.PY2:  # pragma: no cover
+        # indexing anything but a bytearray yields str on Python 2
+        data = bytearray(data)
+
+    index = []
+    end = len(data)
+    pos = offset
+
+    try:
+        while pos < end:
+            ptag = data[pos]
+
+            if not ptag & 0x80:
+                raise PGPError("Malformed packet header at offset {:d}: 0x{:02x}".format(pos, ptag))
+
+            if ptag & 0x40:
+                # new format
+                tag = ptag & 0x3F
+                length, llen, partial = _new_length(data, pos + 1)
+                hlen = 1 + llen
+                size = hlen + length
+
+                while partial:
+                    plen, llen, partial = _new_length(data, pos + size)
+                    length += plen
+                    size += llen + plen
+
+            else:
+                # old format
+                tag = (ptag & 0x3C) >> 2
+                llen = _old_llen[ptag & 0x03]
+                hlen = 1 + llen
+
+                if llen:
+                    length = 0
+                    for i in range(pos + 1, pos + hlen):
+                        length = (length << 8) | data[i]
+
+                else:
+                    # indeterminate length; the packet extends to the end of the data
+                    length = end - pos - 1
+
+                size = hlen + length
+
+            if pos + size > end:
+                raise PGPError("Truncated packet at offset {:d}: expected {:d} octets, got {:d}"
+                               "".format(pos, size, end - pos))
+
+            version = None
+            if length > 0 and (Packet, tag) in MetaDispatchable._versioned:
+                version = data[pos + hlen]
+
+            index.append(PacketEntry(pos, hlen, length, _tags.get(tag, tag), version, size))
+            pos += size
+
+    except IndexError as ex:
+        six.raise_from(PGPError("Truncated packet header at offset {:d}".format(pos)), ex)
+
+    return index
+
+
+def scan_stream(chunks, chunksize=1 << 16):
+    """
+    Walk the packets in raw (not ASCII-armored) OpenPGP data as it is read, the way :py:func:`scan` does for data that
+    is already in memory. Packet bodies are never held in memory all at once; each one is handed out as a generator of
+    pieces of at most ``chunksize`` octets, with any partial body lengths already taken care of. Whatever part of a
+    body has not been read by the time the next packet is asked for is skipped.
+
+    :param chunks: The data to walk, in pieces, such as ``iter(functools.partial(fp.read, 65536), b'')`` for a binary
+                   file object ``fp``, or the output of :py:meth:`~constants.CompressionAlgorithm.decompress_iter`.
+    :type chunks: an iterable of ``bytes`` or ``bytearray``
+    :param chunksize: The largest piece of a packet body to hand out at once. Defaults to 64 KiB.
+    :type chunksize: ``int``
+    :raises: :py:exc:`~pgpy.errors.PGPError` if a malformed or truncated packet is encountered.
+    :returns: A generator of ``(tag, body)`` tuples, where ``tag`` is the :py:obj:`~constants.PacketTag` of the
+              packet (or an ``int`` if the tag is unknown).
+    """
+    read = _reader(chunks)
+
+    def _length():
+        # a new format length field; returns (length, whether the length was of partial type)
+        field = read(1)
+        if field and field[0] == 255:
+            field += read(4)
+
+        elif field and 192 <= field[0] < 224:
+            field += read(1)
+
+        try:
+            length, llen, partial = _new_length(field, 0)
+
+        except IndexError as ex:
+            six.raise_from(PGPError("Truncated packet header"), ex)
+
+        return length, partial
+
+    def _body(length, partial):
+        # a length of None means that the packet extends to the end of the data
+        while length is None:
+            chunk = read(chunksize)
+            if not chunk:
+                return
+            yield chunk
+
+        while True:
+            while length > 0:
+                chunk = read(min(length, chunksize))
+                if not chunk:
+                    raise PGPError("Truncated packet")
+                length -= len(chunk)
+                yield chunk
+
+            if not partial:
+                return
+            length, partial = _length()
+
+    while True:
+        ptag = read(1)
+        if not ptag:
+            return
+        ptag = ptag[0]
+
+        if not ptag & 0x80:
+            raise PGPError("Malformed packet header: 0x{:02x}".format(ptag))
+
+        if ptag & 0x40:
+            # new format
+            tag = ptag & 0x3F
+            length, partial = _length()
+
+        else:
+            # old format
+            tag = (ptag & 0x3C) >> 2
+            llen = _old_llen[ptag & 0x03]
+            partial = False
+            length = None
+
+            if llen:
+                field = read(llen)
+                if len(field) < llen:
+                    raise PGPError("Truncated packet header")
+                length = Packet.bytes_to_int(field)
+
+        body = _body(length, partial)
+        yield _tags.get(tag, tag), body
+
+        for _ in body:
+            pass
@@ -2,7 +2,6 @@
 
 Signature SubPackets
 """
-import binascii
 import calendar
 
 from datetime import datetime
@@ -27,6 +26,7 @@ from ...constants import SymmetricKeyAlgorithm
 from ...decorators import sdproperty
 
 from ...types import Fingerprint
+from ...types import KeyID
 
 
 __all__ = ['URI',
@@ -550,7 +550,7 @@ class RevocationKey(Signature):
 
     @fingerprint.register(bytearray)
     def fingerprint_bytearray(self, val):
-        self.fingerprint = ''.join('{:02x}'.format(c) for c in val).upper()
+        self._fingerprint = Fingerprint(val)
 
     def __init__(self):
         super(RevocationKey, self).__init__()
@@ -582,17 +582,19 @@ class Issuer(Signature):
     def issuer(self):
         return self._issuer
 
+    @issuer.register(str)
+    @issuer.register(six.text_type)
     @issuer.register(bytearray)
     def issuer_bytearray(self, val):
-        self._issuer = binascii.hexlify(val).upper().decode('latin-1')
+        self._issuer = KeyID(val)
 
     def __init__(self):
         super(Issuer, self).__init__()
-        self.issuer = bytearray()
+        self.issuer = bytearray(8)
 
     def __bytearray__(self):
         _bytes = super(Issuer, self).__bytearray__()
-        _bytes += binascii.unhexlify(self._issuer.encode())
+        _bytes += self._issuer.__bytes__()
         return _bytes
 
     def parse(self, packet):
@@ -915,7 +917,7 @@ class IssuerFingerprint(Signature):
 
     @issuer_fingerprint.register(bytearray)
     def issuer_fingerprint_bytearray(self, val):
-        self.issuer_fingerprint = ''.join('{:02x}'.format(c) for c in val).upper()
+        self._issuer_fpr = Fingerprint(val)
 
     def __init__(self):
         super(IssuerFingerprint, self).__init__()
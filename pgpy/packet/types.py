@@ -12,6 +12,8 @@ from ..constants import PacketTag
 
 from ..decorators import sdproperty
 
+from ..symenc import _decrypt
+
 from ..types import Dispatchable
 from ..types import Field
 from ..types import Header as _Header
@@ -26,6 +28,7 @@ __all__ = ['Header',
            'Private',
            'Primary',
            'Sub',
+           'Encrypted',
            'MPI',
            'MPIs', ]
 
@@ -166,6 +169,32 @@ class Packet(Dispatchable):
     def update_hlen(self):
         self.header.length = len(self.__bytearray__()) - len(self.header)
 
+    def iter_bytes(self):
+        """
+        Serialize this packet in pieces, so that large packets never have to be held in memory all at once.
+        Concatenated, the pieces form a valid encoding of this packet, although packets whose length is not known
+        ahead of time are written using partial body lengths, so it is not necessarily identical to
+        ``self.__bytearray__()``.
+        """
+        yield self.__bytearray__()
+
+    def _partial_body(self, chunks, psize=16):
+        # a new format header followed by the body in partial lengths of 2 ** psize octets,
+        # with whatever is left over at the end written with a regular length.
+        yield bytearray([0xC0 | self.header.tag])
+
+        buf = bytearray()
+        for chunk in chunks:
+            buf += chunk
+
+            while len(buf) >= (1 << psize):
+                yield bytearray([0xE0 | psize])
+                yield buf[:1 << psize]
+                del buf[:1 << psize]
+
+        yield self.header.encode_length(len(buf))
+        yield buf
+
     @abc.abstractmethod
     def parse(self, packet):
         if self.header.tag == 0:
@@ -237,6 +266,27 @@ class Sub(Key):
     pass
 
 
+# marker class for packets whose encrypted data starts with the random prefix of OpenPGP's CFB mode
+class Encrypted(object):
+    def __getstate__(self):
+        # the ciphertext of a parsed message may be a memoryview of the data it was parsed from, which can't be
+        # pickled or deep copied, so it is copied out here
+        state = self.__dict__.copy()
+        if isinstance(state.get('ct'), memoryview):
+            state['ct'] = bytearray(state['ct'])
+        return state
+
+    def quick_check(self, key, alg):
+        """
+        Decrypt only the random prefix at the start of the encrypted data, and check that its last two octets are
+        repeated. This rules out a wrong session key cheaply, but a wrong key passes about once in 65536 tries, so the
+        data still needs to be decrypted in full before the key can be trusted.
+        """
+        bs = alg.block_size // 8
+        prefix = _decrypt(self.ct[:bs + 2], bytes(key), alg)
+        return bytes_eq(bytes(prefix[bs - 2:bs]), bytes(prefix[bs:bs + 2]))
+
+
 # This is required for class MPI to work in both Python 2 and 3
 if not six.PY2:
     long = int
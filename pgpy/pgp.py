@@ -2,8 +2,8 @@
 
 this is where the armorable PGP block objects live
 """
-import binascii
 import calendar
+import codecs
 import collections
 import contextlib
 import copy
@@ -19,8 +19,18 @@ import six
 
 from datetime import datetime
 
+from multiprocessing.pool import ThreadPool
+
 from cryptography.hazmat.primitives import hashes
 from cryptography.hazmat.primitives.constant_time import bytes_eq
+from cryptography.hazmat.primitives.keywrap import InvalidUnwrap
+
+try:
+    from cryptography.hazmat.primitives.asymmetric.utils import Prehashed
+
+except ImportError:  # pragma: no cover
+    # cryptography < 1.6 can only sign and verify data that it hashes itself
+    Prehashed = None
 
 from .constants import CompressionAlgorithm
 from .constants import Features
@@ -34,6 +44,7 @@ from .constants import RevocationKeyClass
 from .constants import RevocationReason
 from .constants import SignatureType
 from .constants import SymmetricKeyAlgorithm
+from .constants import TrustLevel
 
 from .decorators import KeyAction
 
@@ -53,6 +64,8 @@ from .packet import Public
 from .packet import Sub
 from .packet import UserID
 from .packet import UserAttribute
+from .packet import scan
+from .packet import scan_stream
 
 from .packet.packets import CompressedData
 from .packet.packets import IntegrityProtectedSKEData
@@ -69,14 +82,20 @@ from .packet.packets import Marker
 from .packet.packets import SKESessionKey
 from .packet.packets import SKESessionKeyV4
 
+from .packet.scanner import _reader
 from .packet.types import Opaque
 
 from .types import Armorable
 from .types import Fingerprint
+from .types import Header
+from .types import KeyID
+from .types import KeyValidation
 from .types import ParentRef
 from .types import PGPObject
 from .types import SignatureVerification
-from .types import SorteDeque
+from .types import SignatureList
+from .types import SortedList
+from .types import VerificationCache
 
 __all__ = ['PGPSignature',
            'PGPDetachedSignature',
@@ -89,6 +108,9 @@ __all__ = ['PGPSignature',
 class PGPSignature(Armorable, ParentRef, PGPObject):
     _revocation_key = collections.namedtuple('revocation_key', ['keyclass','algorithm', 'fingerprint'])
     _reason_for_revocation = collections.namedtuple('ReasonForRevocation', ['code', 'comment'])
+    _trust = collections.namedtuple('trust', ['level', 'amount'])
+    # a document that arrives in pieces, such as the lines of a cleartext message as it is signed
+    _document = collections.namedtuple('document', ['chunks'])
 
     @property
     def __sig__(self):
@@ -244,6 +266,15 @@ class PGPSignature(Armorable, ParentRef, PGPObject):
             return next(iter(self._signature.subpackets['Policy'])).uri
         return ''
 
+    @property
+    def regex(self):
+        """
+        The regular expression that constrains the trust signature in this signature, if any. Otherwise, ``None``.
+        """
+        # only the hashed area is covered by the signature, so a regular expression anywhere else is ignored
+        subpacket = next(iter(self._signature.subpackets['h_RegularExpression']), None)
+        return subpacket.regex if subpacket is not None else None
+
     @property
     def revocable(self):
         """
@@ -295,6 +326,21 @@ class PGPSignature(Armorable, ParentRef, PGPObject):
     def target_signature(self):
         return NotImplemented
 
+    @property
+    def trust(self):
+        """
+        The trust signature in this signature, if any. Otherwise, ``None``.
+
+        It is a namedtuple with the following attributes:
+        ``trust.level`` - the depth of the trust that is asserted; ``0`` is an ordinary certification, ``1`` makes the
+        certified key a trusted introducer, ``2`` a meta-introducer, and so on.
+
+        ``trust.amount`` - ``int`` of how much the certified key is trusted; ``120`` and over is complete trust.
+        """
+        # only the hashed area is covered by the signature, so a trust signature anywhere else is ignored
+        subpacket = next(iter(self._signature.subpackets['h_TrustSignature']), None)
+        return self._trust(subpacket.level, subpacket.amount) if subpacket is not None else None
+
     @property
     def type(self):
         """
@@ -310,7 +356,7 @@ class PGPSignature(Armorable, ParentRef, PGPObject):
         sigpkt.header.tag = 2
         sigpkt.header.version = 4
         sigpkt.subpackets.addnew('CreationTime', hashed=True, created=datetime.utcnow())
-        sigpkt.subpackets.addnew('Issuer', _issuer=signer)
+        sigpkt.subpackets.addnew('Issuer', issuer=signer)
 
         sigpkt.sigtype = sigtype
         sigpkt.pubalg = pkalg
@@ -379,6 +425,47 @@ class PGPSignature(Armorable, ParentRef, PGPObject):
         sig |= copy.copy(self._signature)
         return sig
 
+    @staticmethod
+    def canonicalize(chunks):
+        """
+        Convert the line endings in a document to <CR><LF>, as is done for text document signatures, a piece at a
+        time.
+
+        :param chunks: The document, in pieces.
+        :type chunks: an iterable of ``bytes`` or ``bytearray``
+        :returns: A generator of ``bytes``
+        """
+        # a \r at the end of one chunk may be followed by a \n at the start of the next
+        cr = b''
+        for chunk in chunks:
+            chunk = cr + bytes(chunk)
+            cr = b'\r' if chunk.endswith(b'\r') else b''
+            yield re.subn(br'\r?\n', b'\r\n', chunk[:len(chunk) - len(cr)])[0]
+        yield cr
+
+    def iter_hashdata(self, subject):
+        """
+        Yield the data that is hashed to make or verify this signature, in pieces.
+
+        If ``subject`` is a :py:obj:`~pgpy.packet.packets.LiteralData` packet, its contents are read with
+        :py:meth:`~pgpy.packet.packets.LiteralData.iter_contents` and canonicalized as they go, so that documents
+        backed by a file are never loaded into memory all at once. The pieces of a ``PGPSignature._document`` are
+        hashed (and canonicalized) the same way.
+        """
+        if isinstance(subject, (LiteralData, PGPSignature._document)) and \
+                self.type in {SignatureType.BinaryDocument, SignatureType.CanonicalDocument}:
+            chunks = subject.iter_contents() if isinstance(subject, LiteralData) else subject.chunks
+            if self.type == SignatureType.CanonicalDocument:
+                chunks = self.canonicalize(chunks)
+
+            for chunk in chunks:
+                yield chunk
+
+            # the contents have been taken care of; all that is left is the trailer
+            subject = b''
+
+        yield self.hashdata(subject)
+
     def hashdata(self, subject):
         _data = bytearray()
 
@@ -572,11 +659,11 @@ class PGPDetachedSignature(Armorable, PGPObject):
 
     @property
     def signers(self):
-        return set(m.signer for m in self._signatures)
+        return self._signatures.signers
 
     def __init__(self):
         super(PGPDetachedSignature, self).__init__()
-        self._signatures = SorteDeque()
+        self._signatures = SignatureList()
 
     def __iter__(self):
         for sig in self._signatures:
@@ -689,14 +776,15 @@ class PGPUID(ParentRef):
         This will be the most recent, self-signature of this User ID or Attribute. If there isn't one, this will be ``None``.
         """
         if self.parent is not None:
-            return next((sig for sig in reversed(self._signatures) if sig.signer == self.parent.fingerprint.keyid), None)
+            sigs = self._signatures.by_signer(self.parent.fingerprint.keyid)
+            return sigs[-1] if sigs else None
 
     @property
     def signers(self):
         """
         This will be a set of all of the key ids which have signed this User ID or Attribute.
         """
-        return set(s.signer for s in self._signatures)
+        return self._signatures.signers
 
     @property
     def signatures(self):
@@ -750,7 +838,7 @@ class PGPUID(ParentRef):
         """
         super(PGPUID, self).__init__()
         self._uid = None
-        self._signatures = SorteDeque()
+        self._signatures = SignatureList()
 
     def __repr__(self):
         if self.selfsig is not None:
@@ -782,8 +870,11 @@ class PGPUID(ParentRef):
     def __or__(self, other):
         if isinstance(other, PGPSignature):
             self._signatures.insort(other)
-            if self.parent is not None and self in self.parent._uids:
-                self.parent._uids.resort(self)
+            # only self-signatures can change where this uid sorts among its siblings, or the state of the key
+            if self.parent is not None and other.signer == self.parent.fingerprint.keyid:
+                self.parent._invalidate()
+                if self in self.parent._uids:
+                    self.parent._uids.resort(self)
 
             return self
 
@@ -835,6 +926,10 @@ class PGPUID(ParentRef):
 
 
 class PGPMessage(Armorable, PGPObject):
+    _peek = collections.namedtuple('MessagePeek', ['recipients', 'passphrases', 'signers', 'encrypted'])
+    _recipient = collections.namedtuple('recipient', ['keyid', 'algorithm'])
+    _signer = collections.namedtuple('signer', ['keyid', 'algorithm', 'hash_algorithm', 'type'])
+
     @staticmethod
     def dash_unescape(text):
         return re.subn(r'^- -', '-', text, flags=re.MULTILINE)[0]
@@ -909,7 +1004,7 @@ class PGPMessage(Armorable, PGPObject):
     @property
     def signers(self):
         """A ``set`` containing all key ids (if any) which have signed this message."""
-        return set(m.signer for m in self._signatures)
+        return self._signatures.signers
 
     @property
     def detached_signature(self):
@@ -947,15 +1042,17 @@ class PGPMessage(Armorable, PGPObject):
         """
         super(PGPMessage, self).__init__()
         self._compression = CompressionAlgorithm.Uncompressed
+        self._compression_level = None
         self._message = None
         self._mdc = None
-        self._signatures = SorteDeque()
+        self._signatures = SignatureList()
         self._sessionkeys = []
 
     def __bytearray__(self):
         if self.is_compressed:
             comp = CompressedData()
             comp.calg = self._compression
+            comp.level = self._compression_level
             comp.packets = [pkt for pkt in self]
             comp.update_hlen()
             return comp.__bytearray__()
@@ -965,6 +1062,86 @@ class PGPMessage(Armorable, PGPObject):
             _bytes += pkt.__bytearray__()
         return _bytes
 
+    def iter_bytes(self):
+        """
+        Serialize this message in binary format, in pieces. Unlike ``bytes(message)``, this never needs to hold the
+        entire message in memory, which matters for messages whose contents are backed by a file
+        (see :py:meth:`PGPMessage.new`). A compressed message that is backed by a file is written using partial body
+        lengths, so the output is not necessarily identical to ``bytes(message)``, although it parses to the same
+        message. Messages that are already in memory are written exactly as ``bytes(message)`` writes them.
+
+        :returns: A generator of ``bytearray``
+        """
+        if not self._is_file:
+            return iter([self.__bytearray__()])
+
+        return self._iter_compressed(chunk for pkt in self for chunk in pkt.iter_bytes())
+
+    def iter_signed(self, *signers, **prefs):
+        """
+        Serialize this message in pieces, like :py:meth:`iter_bytes`, while signing it with each of ``signers`` in the
+        same pass: the one-pass signature packets are written first, then the contents are hashed for every signer as
+        they are written, and the signatures are made and written at the end. The contents are read only once, so
+        this works for messages of any size (see the ``file`` option of :py:meth:`PGPMessage.new`).
+
+        Once the generator is exhausted, the new signatures have also been added to this message.
+
+        :param signers: The private keys to sign this message with. They must be unlocked.
+        :type signers: :py:obj:`PGPKey`
+        :raises: :py:exc:`~pgpy.errors.PGPError` if this is not a literal message, or if a key cannot be used to sign.
+        :returns: A generator of ``bytearray``
+
+        Accepts the same optional keyword arguments as :py:meth:`PGPKey.sign`, which apply to every new signature.
+        """
+        if self.type != 'literal':
+            raise PGPError("Only literal messages can be signed in one pass")
+
+        # the keys are checked, and the hash algorithms chosen, up front
+        pending = [signer._sign_onepass(**prefs) for signer in signers]
+        hashers = [sig.hash_algorithm.hasher for sig, _ in pending]
+        sigs = list(self._signatures) + [sig for sig, _ in pending]
+
+        def _chunks():
+            for sig in sigs:
+                ops = sig.make_onepass()
+                if sig is not sigs[-1]:
+                    ops.nested = True
+                yield ops.__bytearray__()
+
+            # the first piece is the packet header and metadata, which are not part of the signed data
+            literal = self._message.iter_bytes()
+            yield next(literal)
+
+            for chunk in literal:
+                for h in hashers:
+                    h.update(chunk)
+                yield chunk
+
+            for (sig, finish), h in zip(pending, hashers):
+                finish(h)
+                self._signatures.insort(sig)
+
+            for sig in sigs:
+                for pkt in sig:
+                    yield pkt.__bytearray__()
+
+        return self._iter_compressed(_chunks())
+
+    @property
+    def _is_file(self):
+        return self.type == 'literal' and self._message.is_file
+
+    def _iter_compressed(self, chunks):
+        # wrap the serialized packets in chunks in a Compressed Data packet, if this message is compressed.
+        # partial body lengths are only needed when the contents are too big to hold in memory
+        if not self.is_compressed:
+            return chunks
+
+        comp = CompressedData()
+        comp.calg = self._compression
+        comp.level = self._compression_level
+        return comp.iter_wrapped(chunks, partial=self._is_file)
+
     def __str__(self):
         if self.type == 'cleartext':
             tmpl = u"-----BEGIN PGP SIGNED MESSAGE-----\n" \
@@ -1061,6 +1238,7 @@ class PGPMessage(Armorable, PGPObject):
             self._message = other._message
             self._mdc = other._mdc
             self._compression = other._compression
+            self._compression_level = other._compression_level
             self._sessionkeys += other._sessionkeys
             self._signatures += other._signatures
             return self
@@ -1070,6 +1248,7 @@ class PGPMessage(Armorable, PGPObject):
     def __copy__(self):
         msg = super(PGPMessage, self).__copy__()
         msg._compression = self._compression
+        msg._compression_level = self._compression_level
         msg._message = copy.copy(self._message)
         msg._mdc = copy.copy(self._mdc)
 
@@ -1087,14 +1266,19 @@ class PGPMessage(Armorable, PGPObject):
         Create a new PGPMessage object.
 
         :param message: The message to be stored.
-        :type message: ``str``, ``unicode``, ``bytes``, ``bytearray``
+        :type message: ``str``, ``unicode``, ``bytes``, ``bytearray``, file object
         :returns: :py:obj:`PGPMessage`
 
         The following optional keyword arguments can be used with :py:meth:`PGPMessage.new`:
 
-        :keyword file: if True, ``message`` should be a path to a file. The contents of that file will be read and used
-                       as the contents of the message.
+        :keyword file: if True, ``message`` should be a path to a file, or a binary file object. The contents of that
+                       file are used as the contents of the message, and are read in pieces as they are needed instead
+                       of being loaded into memory, so the file must not be changed while the message is in use.
+                       Cleartext messages, and textual messages that need to be transcoded from a charset other than
+                       UTF-8, are still read into memory.
         :type file: ``bool``
+        :keyword mmap: if True, and ``file`` is True, memory map the file instead of reading it.
+        :type mmap: ``bool``
         :keyword cleartext: if True, the message will be cleartext with inline signatures.
         :type cleartext: ``bool``
         :keyword sensitive: if True, the filename will be set to '_CONSOLE' to signal other OpenPGP clients to treat
@@ -1104,6 +1288,13 @@ class PGPMessage(Armorable, PGPObject):
         :type format: ``str``
         :keyword compression: Set the compression algorithm for the new message.
                               Defaults to :py:obj:`CompressionAlgorithm.ZIP`. Ignored if cleartext is True.
+        :keyword compression_level: Set the compression level for the new message, from ``1`` (fastest) to ``9``
+                                    (smallest). Defaults to the default level of the compression algorithm.
+        :type compression_level: ``int``
+        :keyword skip_incompressible: if True, compress a sample from the start of the message first, and if it does
+                                      not shrink by at least 10%, do not compress the message at all. This saves a lot
+                                      of CPU time when the message is already compressed, e.g. an image or an archive.
+        :type skip_incompressible: ``bool``
         :keyword encoding: Set the Charset header for the message.
         :type encoding: ``str`` representing a valid codec in codecs
         """
@@ -1112,7 +1303,10 @@ class PGPMessage(Armorable, PGPObject):
         format = kwargs.pop('format', None)
         sensitive = kwargs.pop('sensitive', False)
         compression = kwargs.pop('compression', CompressionAlgorithm.ZIP)
+        compression_level = kwargs.pop('compression_level', None)
+        skip_incompressible = kwargs.pop('skip_incompressible', False)
         file = kwargs.pop('file', False)
+        mmap = kwargs.pop('mmap', False)
         charset = kwargs.pop('encoding', None)
 
         filename = ''
@@ -1127,13 +1321,27 @@ class PGPMessage(Armorable, PGPObject):
         #     # if message format is text or unicode and we got binary data, we'll need to transcode it to UTF-8
         #     message =
 
-        if file and os.path.isfile(message):
-            filename = message
-            message = bytearray(os.path.getsize(filename))
-            mtime = datetime.utcfromtimestamp(os.path.getmtime(filename))
+        lit = LiteralData()
+
+        if file and (hasattr(message, 'read') or os.path.isfile(message)):
+            if isinstance(message, six.string_types):
+                filename = message
+                mtime = datetime.utcfromtimestamp(os.path.getmtime(filename))
+
+            elif isinstance(getattr(message, 'name', None), six.string_types):
+                filename = message.name
 
-            with open(filename, 'rb') as mf:
-                mf.readinto(message)
+            lit.attach_file(message, mmap=mmap)
+
+            if format is None:
+                format = 't' if all(cls.is_ascii(chunk) for chunk in lit.iter_contents()) else 'b'
+
+            if cleartext or (format in 'tu' and codecs.lookup(charset or 'utf-8').name != 'utf-8'):
+                # these need the whole message in memory anyway
+                message = bytearray()
+                for chunk in lit.iter_contents():
+                    message += chunk
+                lit = LiteralData()
 
         # if format is None, we can try to detect it
         if format is None:
@@ -1150,7 +1358,7 @@ class PGPMessage(Armorable, PGPObject):
                 format = 'b'
 
         # if message is a binary type and we're building a textual message, we need to transcode the bytes to UTF-8
-        if isinstance(message, (six.binary_type, bytearray)) and (cleartext or format in 'tu'):
+        if not lit.is_file and isinstance(message, (six.binary_type, bytearray)) and (cleartext or format in 'tu'):
             message = message.decode(charset or 'utf-8')
 
         if cleartext:
@@ -1158,8 +1366,8 @@ class PGPMessage(Armorable, PGPObject):
 
         else:
             # load literal data
-            lit = LiteralData()
-            lit._contents = bytearray(msg.text_to_bytes(message))
+            if not lit.is_file:
+                lit._contents = bytearray(msg.text_to_bytes(message))
             lit.filename = '_CONSOLE' if sensitive else os.path.basename(filename)
             lit.mtime = mtime
             lit.format = format
@@ -1170,10 +1378,104 @@ class PGPMessage(Armorable, PGPObject):
             lit.update_hlen()
 
             msg |= lit
+
+            if skip_incompressible and not compression.is_worthwhile(next(lit.iter_contents(), b'')):
+                compression = CompressionAlgorithm.Uncompressed
+
             msg._compression = compression
+            msg._compression_level = compression_level
 
         return msg
 
+    @classmethod
+    def peek(cls, data):
+        """
+        Find out who a message is for and who signed it without loading the whole message.
+
+        Only packet headers are walked, and only the session key, one-pass signature, and signature packets are parsed.
+        The body of an encrypted message is never copied or decrypted, so this is a cheap way to decide which key to
+        unlock before calling :py:meth:`PGPKey.decrypt`. If the message is compressed (but not encrypted), it is
+        decompressed in order to find the signers.
+
+        :param data: The message to peek at, either ASCII-armored or binary.
+        :type data: ``str``, ``unicode``, ``bytes``, ``bytearray``, ``memoryview``
+        :raises: :py:exc:`ValueError` if ``data`` is armored, but is not a PGP message.
+        :raises: :py:exc:`~pgpy.errors.PGPError` if a malformed or truncated packet header is encountered.
+        :returns: A namedtuple with the following attributes:
+
+            ``recipients`` - A ``list`` of namedtuples, one for each public key encrypted session key packet, with
+            the attributes ``keyid`` and ``algorithm`` (a :py:obj:`~constants.PubKeyAlgorithm`).
+
+            ``passphrases`` - A ``list`` of :py:obj:`~constants.SymmetricKeyAlgorithm`, one for each symmetric key
+            encrypted session key packet.
+
+            ``signers`` - A ``list`` of namedtuples, one for each signature, with the attributes ``keyid``,
+            ``algorithm`` (a :py:obj:`~constants.PubKeyAlgorithm`), ``hash_algorithm``
+            (a :py:obj:`~constants.HashAlgorithm`), and ``type`` (a :py:obj:`~constants.SignatureType`).
+
+            ``encrypted`` - ``True`` if the message contains encrypted data; otherwise, ``False``.
+        """
+        if isinstance(data, six.text_type) and not cls.is_ascii(data):
+            data = bytearray(data, 'latin-1')
+
+        if isinstance(data, (six.string_types, six.binary_type, bytearray)) and cls.is_ascii(data):
+            unarmored = cls.ascii_unarmor(data)
+
+            if unarmored['magic'] is not None and unarmored['magic'] not in ['MESSAGE', 'SIGNATURE']:
+                raise ValueError('Expected: MESSAGE. Got: {}'.format(str(unarmored['magic'])))
+
+            data = unarmored['body']
+
+        recipients = []
+        passphrases = []
+        onepass = []
+        signatures = []
+        encrypted = False
+
+        def _peek(pkt):
+            if isinstance(pkt, PKESessionKey):
+                recipients.append(cls._recipient(pkt.encrypter, pkt.pkalg))
+
+            elif isinstance(pkt, SKESessionKey):
+                passphrases.append(pkt.symalg)
+
+            elif isinstance(pkt, OnePassSignature):
+                onepass.append(cls._signer(pkt.signer, pkt.pubalg, pkt.halg, pkt.sigtype))
+
+            elif isinstance(pkt, Signature):
+                signatures.append(cls._signer(pkt.signer, pkt.pubalg, pkt.halg, pkt.sigtype))
+
+            elif isinstance(pkt, CompressedData):
+                for p in pkt.packets:
+                    _peek(p)
+
+        for entry in scan(data):
+            if entry.tag in [PacketTag.SymmetricallyEncryptedData,
+                             PacketTag.SymmetricallyEncryptedIntegrityProtectedData]:
+                encrypted = True
+
+            elif entry.tag in [PacketTag.PublicKeyEncryptedSessionKey, PacketTag.SymmetricKeyEncryptedSessionKey,
+                               PacketTag.OnePassSignature, PacketTag.Signature, PacketTag.CompressedData]:
+                _peek(Packet(bytearray(data[entry.offset:entry.end])))
+
+        # signature packets trailing a one-pass signed message describe the same signatures again, but a message can
+        # also carry signatures that have no one-pass signature packet in front of them
+        _onepass = {s.keyid for s in onepass}
+        signers = onepass + [s for s in signatures if s.keyid not in _onepass]
+        return cls._peek(recipients, passphrases, signers, encrypted)
+
+    @staticmethod
+    def _skesk(passphrase, sessionkey, cipher_algo, hash_algo):
+        # set up a new SKESessionKeyV4
+        skesk = SKESessionKeyV4()
+        skesk.s2k.usage = 255
+        skesk.s2k.specifier = 3
+        skesk.s2k.halg = hash_algo
+        skesk.s2k.encalg = cipher_algo
+        skesk.s2k.count = skesk.s2k.halg.tuned_count
+        skesk.encrypt_sk(passphrase, sessionkey)
+        return skesk
+
     def encrypt(self, passphrase, sessionkey=None, **prefs):
         """
         Encrypt the contents of this message using a passphrase.
@@ -1196,24 +1498,16 @@ class PGPMessage(Armorable, PGPObject):
         cipher_algo = prefs.pop('cipher', SymmetricKeyAlgorithm.AES256)
         hash_algo = prefs.pop('hash', HashAlgorithm.SHA256)
 
-        # set up a new SKESessionKeyV4
-        skesk = SKESessionKeyV4()
-        skesk.s2k.usage = 255
-        skesk.s2k.specifier = 3
-        skesk.s2k.halg = hash_algo
-        skesk.s2k.encalg = cipher_algo
-        skesk.s2k.count = skesk.s2k.halg.tuned_count
-
         if sessionkey is None:
             sessionkey = cipher_algo.gen_key()
-        skesk.encrypt_sk(passphrase, sessionkey)
+        skesk = PGPMessage._skesk(passphrase, sessionkey, cipher_algo, hash_algo)
         del passphrase
 
         msg = PGPMessage() | skesk
 
         if not self.is_encrypted:
             skedata = IntegrityProtectedSKEDataV1()
-            skedata.encrypt(sessionkey, cipher_algo, self.__bytes__())
+            skedata.encrypt(sessionkey, cipher_algo, self.iter_bytes())
             msg |= skedata
 
         else:
@@ -1221,12 +1515,145 @@ class PGPMessage(Armorable, PGPObject):
 
         return msg
 
-    def decrypt(self, passphrase):
+    def encrypt_to(self, recipients, passphrases=(), cipher=None, sessionkey=None, **prefs):
+        """
+        Encrypt the contents of this message to any number of public keys and passphrases in one go. A single session
+        key is used for all of them, so the contents are only encrypted once, no matter how many recipients there are,
+        and the resulting message can be decrypted by any one of ``recipients``, or with any one of ``passphrases``.
+
+        If this message is already encrypted, its ``cipher`` and ``sessionkey`` (see :py:meth:`PGPKey.decrypt_sessionkey`)
+        must be given, and the new recipients are added to it, without decrypting or re-encrypting the contents.
+
+        :param recipients: The public keys to encrypt to. As with :py:meth:`PGPKey.encrypt`, a subkey capable of
+                           encryption is used if the key itself is not.
+        :type recipients: An iterable of :py:obj:`PGPKey`
+        :param passphrases: Passphrases that should also be able to decrypt the message. Default is no passphrases.
+        :type passphrases: ``str``, ``unicode``, or an iterable of them
+        :optional param cipher: The symmetric cipher to use. If ``None``, the first cipher in the preferences of the
+                                first recipient that every recipient supports is used, which is
+                                :py:obj:`~constants.SymmetricKeyAlgorithm.TripleDES` if there is nothing better, as
+                                every OpenPGP implementation is required to support it. If there are no recipients,
+                                :py:obj:`~constants.SymmetricKeyAlgorithm.AES256` is used.
+        :type cipher: :py:obj:`~constants.SymmetricKeyAlgorithm`
+        :optional param sessionkey: Provide a session key to use when encrypting something. Default is ``None``.
+                                    If ``None``, a session key of the appropriate length will be generated randomly.
+                                    The same caveats apply as for :py:meth:`encrypt`.
+        :type sessionkey: ``bytes``, ``str``
+        :raises: :py:exc:`~errors.PGPError` if this message is already encrypted and ``cipher`` or ``sessionkey`` was
+                 not given, or does not match the ones it is encrypted with, or there is nothing to encrypt to.
+        :raises: :py:exc:`~errors.PGPEncryptionError`
+        :returns: A new :py:obj:`PGPMessage` containing the encrypted contents of this message.
+
+        The following optional keyword arguments can be used with :py:meth:`PGPMessage.encrypt_to`:
+
+        :keyword hash: The hash algorithm used to derive keys from ``passphrases``. Default is
+                       :py:obj:`~constants.HashAlgorithm.SHA256`.
+        :type hash: :py:obj:`~constants.HashAlgorithm`
+        :keyword throw_keyid: Whether to zero out the keyid of every recipient. An all zero keyid MAY be used as a
+                              wild-card keyid.
+        :type throw_keyid: ``bool``
+        :keyword workers: The number of threads to use to encrypt the session key to ``recipients``. Default is ``1``.
+                          Public key operations do not hold the GIL, so this can help when there are a lot of
+                          recipients.
+        :type workers: ``int``
+        """
+        def _negotiate(prefsets):
+            # TripleDES is implicitly at the end of every preference list
+            prefsets = [list(p) + [SymmetricKeyAlgorithm.TripleDES] for p in prefsets]
+            for alg in prefsets[0]:
+                if not alg.is_insecure and callable(alg.cipher) and all(alg in p for p in prefsets[1:]):
+                    return alg
+
+        hash_algo = prefs.pop('hash', HashAlgorithm.SHA256)
+        throw_keyid = prefs.pop('throw_keyid', False)
+        workers = prefs.pop('workers', 1)
+
+        recipients = list(recipients)
+        if isinstance(passphrases, six.string_types):
+            passphrases = [passphrases]
+        passphrases = list(passphrases)
+
+        if self.is_encrypted and (cipher is None or sessionkey is None):
+            raise PGPError("This message is already encrypted! Its cipher and session key are needed to add recipients")
+
+        if self.is_encrypted:
+            # new recipients given the wrong session key could never decrypt the message, so rule that out first
+            try:
+                matched = len(sessionkey) * 8 == cipher.key_size and self._message.quick_check(sessionkey, cipher)
+
+            except (PGPDecryptionError, ValueError):
+                matched = False
+
+            if not matched:
+                raise PGPError("The cipher and session key given are not the ones this message is encrypted with")
+
+        if len(recipients) + len(passphrases) == 0:
+            raise PGPError("No recipients or passphrases to encrypt to!")
+
+        prefsets = []
+        for key in recipients:
+            uid = key._pref_uid()
+            prefsets.append(uid.selfsig.cipherprefs if uid is not None else [])
+
+            if uid is not None and self.is_compressed and self._compression not in uid.selfsig.compprefs:
+                warnings.warn("Selected compression algorithm not in key preferences", stacklevel=2)
+
+        if cipher is None:
+            cipher = _negotiate(prefsets) if prefsets else SymmetricKeyAlgorithm.AES256
+
+        elif any(cipher not in p for p in prefsets):
+            warnings.warn("Selected symmetric algorithm not in key preferences", stacklevel=2)
+
+        if sessionkey is None:
+            sessionkey = cipher.gen_key()
+
+        def _pkesk(key):
+            return key._pkesk(cipher, sessionkey, throw_keyid=throw_keyid)
+
+        if workers > 1 and len(recipients) > 1:
+            pool = ThreadPool(min(workers, len(recipients)))
+            try:
+                pkesks = pool.map(_pkesk, recipients)
+
+            finally:
+                pool.close()
+                pool.join()
+
+        else:
+            pkesks = [_pkesk(key) for key in recipients]
+
+        msg = PGPMessage()
+        for pkesk in pkesks:
+            msg |= pkesk
+
+        for passphrase in passphrases:
+            msg |= PGPMessage._skesk(passphrase, sessionkey, cipher, hash_algo)
+        del passphrases
+
+        if self.is_encrypted:
+            # keep the existing session key packets and encrypted contents
+            for sk in self._sessionkeys:
+                msg |= sk
+            msg |= self._message
+
+        else:
+            skedata = IntegrityProtectedSKEDataV1()
+            skedata.encrypt(sessionkey, cipher, self.iter_bytes())
+            msg |= skedata
+
+        return msg
+
+    def decrypt(self, passphrase, sink=None):
         """
         Attempt to decrypt this message using a passphrase.
 
         :param passphrase: The passphrase to use to attempt to decrypt this message.
         :type passphrase: ``str``, ``unicode``, ``bytes``
+        :param sink: If given, the contents of the decrypted message are written to it as they are parsed, instead of
+                     being kept in the returned message, which then only has the metadata of the contents
+                     (:py:attr:`filename`, :py:attr:`mtime`, and format). The contents are written as they are,
+                     without being decoded, even if the message is textual. See :py:meth:`~pgpy.packet.packets.LiteralData.redirect`.
+        :type sink: A writable binary file object, or a ``callable`` taking each piece of the contents
         :raises: :py:exc:`~errors.PGPDecryptionError` if decryption failed for any reason.
         :returns: A new :py:obj:`PGPMessage` containing the decrypted contents of this message
         """
@@ -1236,8 +1663,7 @@ class PGPMessage(Armorable, PGPObject):
         for skesk in iter(sk for sk in self._sessionkeys if isinstance(sk, SKESessionKey)):
             try:
                 symalg, key = skesk.decrypt_sk(passphrase)
-                decmsg = PGPMessage()
-                decmsg.parse(self.message.decrypt(key, symalg))
+                pt = self.message.decrypt(key, symalg)
 
             except (TypeError, ValueError, NotImplementedError, PGPDecryptionError):
                 continue
@@ -1249,6 +1675,36 @@ class PGPMessage(Armorable, PGPObject):
         else:
             raise PGPDecryptionError("Decryption failed")
 
+        # anything that goes wrong writing to sink is not a decryption failure, so it is not caught above
+        return self._parse_decrypted(pt, sink)
+
+    def decrypt_with_sessionkey(self, cipher, sessionkey, sink=None):
+        """
+        Decrypt this message using a session key that is already known, such as one obtained earlier from
+        :py:meth:`PGPKey.decrypt_sessionkey`. No public key or passphrase operations are needed.
+
+        :param cipher: The symmetric cipher the message was encrypted with.
+        :type cipher: :py:obj:`~constants.SymmetricKeyAlgorithm`
+        :param sessionkey: The session key.
+        :type sessionkey: ``bytes``, ``bytearray``
+        :param sink: If given, the contents of the decrypted message are written to it as they are parsed, instead of
+                     being kept in the returned message. See :py:meth:`decrypt`.
+        :type sink: A writable binary file object, or a ``callable`` taking each piece of the contents
+        :raises: :py:exc:`~errors.PGPError` if this message is not encrypted.
+        :raises: :py:exc:`~errors.PGPDecryptionError` if decryption failed for any reason.
+        :returns: A new :py:obj:`PGPMessage` containing the decrypted contents of this message
+        """
+        if not self.is_encrypted:
+            raise PGPError("This message is not encrypted!")
+
+        return self._parse_decrypted(self.message.decrypt(sessionkey, cipher), sink)
+
+    @staticmethod
+    def _parse_decrypted(pt, sink):
+        decmsg = PGPMessage()
+        with LiteralData.redirect(sink):
+            decmsg.parse(pt)
+
         return decmsg
 
     def parse(self, packet):
@@ -1274,8 +1730,43 @@ class PGPMessage(Armorable, PGPObject):
                 self |= PGPSignature() | pkt
 
         else:
-            while len(data) > 0:
-                self |= Packet(data)
+            view = None
+            base = 0
+
+            for entry in scan(data):
+                inplace = (entry.tag, entry.version) in [(PacketTag.SymmetricallyEncryptedData, None),
+                                                         (PacketTag.SymmetricallyEncryptedIntegrityProtectedData, 1)]
+                inplace &= not entry.partial
+
+                if view is None and not inplace:
+                    self |= Packet(data)
+                    continue
+
+                if view is None:
+                    # from here on, packets are sliced out of data rather than consumed from the front of it,
+                    # so that the ciphertext can be referenced where it is instead of being copied
+                    view = memoryview(data)
+                    base = entry.offset
+
+                start = entry.offset - base
+                end = entry.end - base
+                pkt = None
+
+                if inplace:
+                    ctstart = start + entry.hlen + (0 if entry.version is None else 1)
+                    pkt = Packet(data[start:ctstart])
+
+                    if pkt.header.length == entry.length:
+                        pkt.ct = view[ctstart:end]
+
+                    else:  # pragma: no cover
+                        # indeterminate length
+                        pkt = None
+
+                if pkt is None:
+                    pkt = Packet(data[start:end])
+
+                self |= pkt
 
 
 class PGPKey(Armorable, ParentRef, PGPObject):
@@ -1362,8 +1853,8 @@ class PGPKey(Armorable, ParentRef, PGPObject):
     especially if a transferable public key accompanies the transferable
     secret key.
     """
-    __zero_keyid = bytearray(8)
-    __zero_keyid_str = '0000000000000000'
+    __zero_keyid = KeyID(bytearray(8))
+    _merged = collections.namedtuple('merged', ['userids', 'subkeys', 'signatures'])
 
     @property
     def created(self):
@@ -1373,15 +1864,18 @@ class PGPKey(Armorable, ParentRef, PGPObject):
     @property
     def expires_at(self):
         """A :py:obj:`~datetime.datetime` object of when this key is to be considered expired, if any. Otherwise, ``None``"""
-        try:
-            expires = min(sig.key_expiration for sig in itertools.chain(iter(uid.selfsig for uid in self.userids), self.self_signatures)
-                          if sig.key_expiration is not None)
+        def _expires_at():
+            try:
+                expires = min(sig.key_expiration for sig in itertools.chain(iter(uid.selfsig for uid in self.userids), self.self_signatures)
+                              if sig.key_expiration is not None)
 
-        except ValueError:
-            return None
+            except ValueError:
+                return None
 
-        else:
-            return (self.created + expires)
+            else:
+                return (self.created + expires)
+
+        return self._memo('expires_at', _expires_at)
 
     @property
     def fingerprint(self):
@@ -1518,14 +2012,14 @@ class PGPKey(Armorable, ParentRef, PGPObject):
             else (self.parent.fingerprint.keyid, SignatureType.Subkey_Binding)
 
         ##TODO: filter out revoked signatures as well
-        for sig in iter(sig for sig in self._signatures
-                        if all([sig.type == keytype, sig.signer == keyid, not sig.is_expired])):
-            yield sig
+        for sig in self._signatures.by_type(keytype, keyid):
+            if not sig.is_expired:
+                yield sig
 
     @property
     def signers(self):
         """A ``set`` of key ids of keys that were used to sign this key"""
-        return {sig.signer for sig in self._signatures}
+        return self._signatures.signers
 
     @property
     def signatures(self):
@@ -1537,9 +2031,9 @@ class PGPKey(Armorable, ParentRef, PGPObject):
         keyid, keytype = (self.fingerprint.keyid, SignatureType.KeyRevocation) if self.is_primary \
             else (self.parent.fingerprint.keyid, SignatureType.SubkeyRevocation)
 
-        for sig in iter(sig for sig in self._signatures
-                        if all([sig.type == keytype, sig.signer == keyid, not sig.is_expired])):
-            yield sig
+        for sig in self._signatures.by_type(keytype, keyid):
+            if not sig.is_expired:
+                yield sig
 
     @property
     def subkeys(self):
@@ -1566,20 +2060,37 @@ class PGPKey(Armorable, ParentRef, PGPObject):
         :type user: ``str``, ``unicode``
         :return: a ``set`` of :py:obj:`KeyFlags` of this key.
         """
-        if self.is_primary:
-            if user is not None:
-                user = self.get_uid(user)
+        def _usage_flags():
+            if self.is_primary:
+                if user is not None:
+                    uid = self.get_uid(user)
 
-            elif len(self._uids) == 0:
-                return {KeyFlags.Certify}
+                elif len(self._uids) == 0:
+                    return {KeyFlags.Certify}
 
-            else:
-                user = next(iter(self.userids))
+                else:
+                    uid = next(iter(self.userids))
+
+                # RFC 4880 says that primary keys *must* be capable of certification
+                return {KeyFlags.Certify} | uid.selfsig.key_flags
+
+            return next(self.self_signatures).key_flags
 
-            # RFC 4880 says that primary keys *must* be capable of certification
-            return {KeyFlags.Certify} | user.selfsig.key_flags
+        return set(self._memo(('usage_flags', user), _usage_flags))
 
-        return next(self.self_signatures).key_flags
+    def select(self, *usage, **prefs):
+        """
+        Get the key that will be used for an action that needs any of the given usage flags: this key if it has one of
+        them, or otherwise the first subkey that does. Calling an action like :py:meth:`sign` on the result directly
+        skips looking for a suitable subkey, and the warning that is issued each time one is used in place of this key.
+
+        :param usage: One or more :py:obj:`~constants.KeyFlags`.
+        :keyword user: If specified, it is used to select the uid from which flags are loaded.
+        :type user: ``str``, ``unicode``
+        :raises: :py:exc:`~pgpy.errors.PGPError` if neither this key nor any of its subkeys has any of the usage flags.
+        :returns: :py:obj:`PGPKey`
+        """
+        return KeyAction(*usage).select(self, prefs.pop('user', None))
 
     @classmethod
     def new(cls, key_algorithm, key_size):
@@ -1621,9 +2132,11 @@ class PGPKey(Armorable, ParentRef, PGPObject):
         super(PGPKey, self).__init__()
         self._key = None
         self._children = collections.OrderedDict()
-        self._signatures = SorteDeque()
-        self._uids = SorteDeque()
+        self._signatures = SignatureList()
+        self._uids = SortedList()
         self._sibling = None
+        self._state = {}
+        self._state_until = None
 
     def __bytearray__(self):
         _bytes = bytearray()
@@ -1682,7 +2195,38 @@ class PGPKey(Armorable, ParentRef, PGPObject):
                 for sigpacket in sig:
                     yield sigpacket
 
+    def _memo(self, name, compute):
+        # the effective state of a key (its usage flags, expiration, preferences, ...) is derived from its signatures
+        # and user ids, so it is only computed once, and kept until something is added to or removed from the key,
+        # or until one of the self-signatures it may have been derived from expires
+        if self._state_until is not None and self._state_until <= datetime.utcnow():
+            self._invalidate()
+
+        if name not in self._state:
+            if not self._state and self._key is not None and (self.is_primary or self.parent is not None):
+                sigs = itertools.chain(self.self_signatures, *(sk.self_signatures for sk in self._children.values()))
+                expires = [sig.expires_at for sig in sigs if sig.expires_at is not None]
+                self._state_until = min(expires) if expires else None
+
+            self._state[name] = compute()
+
+        return self._state[name]
+
+    def _invalidate(self):
+        self._state = {}
+        self._state_until = None
+
+        # the state of a subkey can depend on its primary key, too
+        for subkey in self._children.values():
+            subkey._invalidate()
+
     def __or__(self, other, from_sib=False):
+        self._invalidate()
+
+        # the subkeys of a primary key are part of its state, too (see KeyAction.select)
+        if isinstance(self._parent, PGPKey):
+            self._parent._invalidate()
+
         if isinstance(other, Key) and self._key is None:
             self._key = other
 
@@ -1867,6 +2411,153 @@ class PGPKey(Armorable, ParentRef, PGPObject):
 
         u._parent = None
         self._uids.remove(u)
+        self._invalidate()
+
+    def merge(self, other):
+        """
+        Merge another copy of this key into it, such as one just fetched from a key server, adding only the User IDs,
+        subkeys, and signatures that this key does not have yet. Packets are compared by their contents, so merging the
+        same copy again, or one that only has some of the same packets, adds nothing.
+
+        :param other: Another copy of this key. A public copy can be merged into a private key, but subkeys that only
+                      the public copy has are left out, because they have no private key material.
+        :type other: :py:obj:`PGPKey`
+        :raises: :py:exc:`ValueError` if ``other`` is not a copy of this key.
+        :returns: a namedtuple of what was added, with the following attributes:
+
+                  ``merged.userids`` - a ``list`` of the :py:obj:`PGPUID` s that were added.
+
+                  ``merged.subkeys`` - a ``list`` of the :py:obj:`PGPKey` s that were added as subkeys.
+
+                  ``merged.signatures`` - a ``list`` of ``(subject, signature)`` pairs for the :py:obj:`PGPSignature` s
+                  that were added to this key, or to its User IDs and subkeys.
+        """
+        if not isinstance(other, PGPKey) or other.fingerprint != self.fingerprint:
+            raise ValueError("Expected: a copy of key {:s}".format(self.fingerprint.keyid))
+
+        merged = self._merged([], [], [])
+
+        def _canonical(packet):
+            # the header of a packet can be encoded in more than one way, so only the body is compared
+            return bytes(packet.__bytearray__()[len(packet.header):])
+
+        def _merge_sigs(subject, sigs):
+            seen = {_canonical(sig._signature) for sig in subject._signatures}
+            for sig in sigs:
+                # embedded signatures come along with the signature they are embedded in
+                if sig.embedded:
+                    continue
+
+                c = _canonical(sig._signature)
+                if c not in seen:
+                    seen.add(c)
+                    sig = copy.copy(sig)
+                    subject |= sig
+                    merged.signatures.append((subject, sig))
+
+        _merge_sigs(self, other._signatures)
+
+        uids = {(uid.is_uid, bytes(uid.hashdata)): uid for uid in self._uids}
+        for uid in other._uids:
+            if (uid.is_uid, bytes(uid.hashdata)) in uids:
+                _merge_sigs(uids[(uid.is_uid, bytes(uid.hashdata))], uid._signatures)
+
+            else:
+                uid = copy.copy(uid)
+                uids[(uid.is_uid, bytes(uid.hashdata))] = uid
+                self |= uid
+                merged.userids.append(uid)
+
+        for keyid, subkey in other._children.items():
+            if keyid in self._children:
+                _merge_sigs(self._children[keyid], subkey._signatures)
+
+            elif subkey.is_public == self.is_public:
+                subkey = copy.copy(subkey)
+                self |= subkey
+                merged.subkeys.append(subkey)
+
+        return merged
+
+    def minimize(self, certifiers=(), cache=None):
+        """
+        Remove the signatures that have no bearing on what this key is, in place: superseded and invalid
+        self-signatures, expired certifications, and certifications by keys other than ``certifiers``. User IDs and
+        subkeys that are not validly bound to the key (see :py:meth:`validate`) are removed as well.
+
+        What is kept is the newest valid self-certification of each User ID, the newest valid binding signature of each
+        subkey (and the primary key binding signature embedded in it), the newest valid direct-key signature,
+        revocations made by this key that verify (or that use an algorithm PGPy cannot verify), revocations of the key
+        made by other keys (which may be designated revokers), and the unexpired certifications made by ``certifiers``,
+        along with their revocations of them.
+
+        :param certifiers: The keys whose certifications should be kept, as :py:obj:`PGPKey` s, fingerprints, or key ids.
+        :type certifiers: ``iterable``
+        :param cache: Passed to :py:meth:`validate`.
+        :type cache: :py:obj:`~pgpy.types.VerificationCache`
+        :raises: :py:exc:`~pgpy.errors.PGPError` if this is not a primary key, or it is not validly self-signed.
+        :returns: this key.
+        """
+        if not self.is_primary:
+            raise PGPError("Only primary keys can be minimized")
+
+        report = self.validate(cache)
+        if not report.primary.bound:
+            raise PGPError("Key {:s} is not validly self-signed".format(self.fingerprint.keyid))
+
+        keyid = self.fingerprint.keyid
+        certifiers = {c.fingerprint.keyid if isinstance(c, PGPKey) else c.keyid if isinstance(c, Fingerprint) else c
+                      for c in certifiers} - {keyid}
+
+        def _verified(sig, subject):
+            # a signature made with an algorithm PGPy does not support cannot be checked, so it is not thrown away
+            try:
+                return self._verify_sig(sig, subject, cache)
+
+            except NotImplementedError:
+                return True
+
+        def _revocations(subject, sigtype):
+            # revocations of subject made by this key that verify
+            return [sig for sig in subject._signatures.by_type(sigtype, keyid) if _verified(sig, subject)]
+
+        # the primary key
+        sigs = [report.primary.signature] if report.primary.signature.type == SignatureType.DirectlyOnKey else []
+        sigs += _revocations(self, SignatureType.KeyRevocation)
+        sigs += [sig for sig in self._signatures if sig.type == SignatureType.KeyRevocation and sig.signer != keyid]
+        self._signatures = SignatureList(sigs)
+
+        # user ids
+        for status in report.userids:
+            uid = status.subject
+            if not status.bound:
+                uid._parent = None
+                continue
+
+            sigs = [status.signature] + _revocations(uid, SignatureType.CertRevocation)
+            for certifier in certifiers:
+                certs = [sig for sig in uid._signatures.by_signer(certifier) if not sig.is_expired]
+                sigs += [sig for sig in certs if sig.type in {SignatureType.Generic_Cert, SignatureType.Persona_Cert,
+                                                              SignatureType.Casual_Cert, SignatureType.Positive_Cert,
+                                                              SignatureType.CertRevocation}]
+            uid._signatures = SignatureList(sigs)
+
+        self._uids = SortedList(status.subject for status in report.userids if status.bound)
+
+        # subkeys
+        for subkeyid, status in report.subkeys.items():
+            subkey = status.subject
+            if not status.bound:
+                subkey._parent = None
+                del self._children[subkeyid]
+                continue
+
+            sigs = [status.signature] + _revocations(subkey, SignatureType.SubkeyRevocation)
+            sigs += [sig for sig in subkey._signatures if sig.embedded and sig._parent is status.signature]
+            subkey._signatures = SignatureList(sigs)
+
+        self._invalidate()
+        return self
 
     def add_subkey(self, key, **prefs):
         """
@@ -1910,6 +2601,38 @@ class PGPKey(Armorable, ParentRef, PGPObject):
         :param sig: The :py:obj:`PGPSignature` object the new signature is to be encapsulated within
         :returns: ``sig``, after the signature is added to it.
         """
+        self._prepare_sig(sig, **prefs)
+
+        h = sig.hash_algorithm.hasher
+        for chunk in sig.iter_hashdata(subject):
+            h.update(chunk)
+
+        return self._finish_sig(sig, h, subject)
+
+    @KeyAction(KeyFlags.Sign, is_unlocked=True, is_public=False)
+    def _sign_onepass(self, **prefs):
+        """
+        Start a new binary document signature over data that is going to be hashed elsewhere, as in one-pass signing,
+        where the signatures are only finished once all of the data has gone by.
+
+        :returns: The new :py:obj:`PGPSignature`, and a function that finishes it given a hash context (of the
+                  signature's hash algorithm) that has been fed the document.
+        """
+        if Prehashed is None:  # pragma: no cover
+            raise NotImplementedError("One-pass signing requires cryptography >= 1.6")
+
+        sig = PGPSignature.new(SignatureType.BinaryDocument, self.key_algorithm, prefs.pop('hash', None),
+                               self.fingerprint.keyid)
+        self._prepare_sig(sig, **prefs)
+
+        def _finish(h):
+            h.update(sig.hashdata(b''))
+            return self._finish_sig(sig, h)
+
+        return sig, _finish
+
+    def _prepare_sig(self, sig, **prefs):
+        # everything about a new signature that has to be settled before hashing, including its hash algorithm
         user = prefs.pop('user', None)
         uid = None
         if user is not None:
@@ -1924,7 +2647,7 @@ class PGPKey(Armorable, ParentRef, PGPObject):
             sig._signature.halg = uid.selfsig.hashprefs[0]
 
         if uid is not None and sig.hash_algorithm not in uid.selfsig.hashprefs:
-            warnings.warn("Selected hash algorithm not in key preferences", stacklevel=4)
+            warnings.warn("Selected hash algorithm not in key preferences", stacklevel=5)
 
         # signature options that can be applied at any level
         expires = prefs.pop('expires', None)
@@ -1962,12 +2685,18 @@ class PGPKey(Armorable, ParentRef, PGPObject):
         if sig.type == SignatureType.Timestamp and len(sig._signature.subpackets._hashed_sp) > 1:
             sig._signature.sigtype = SignatureType.Standalone
 
-        sigdata = sig.hashdata(subject)
-        h2 = sig.hash_algorithm.hasher
-        h2.update(sigdata)
-        sig._signature.hash2 = bytearray(h2.digest()[:2])
+    def _finish_sig(self, sig, h, subject=None):
+        # the digest provides both the left 16 bits of the hash and the signature itself; older versions of
+        # cryptography cannot sign a digest, so there the data is hashed by cryptography a second time
+        digest = h.digest()
+        sig._signature.hash2 = bytearray(digest[:2])
+
+        if Prehashed is not None:
+            _sig = self._key.sign(digest, Prehashed(getattr(hashes, sig.hash_algorithm.name)()))
+
+        else:
+            _sig = self._key.sign(sig.iter_hashdata(subject), getattr(hashes, sig.hash_algorithm.name)())
 
-        _sig = self._key.sign(sigdata, getattr(hashes, sig.hash_algorithm.name)())
         if _sig is NotImplemented:
             raise NotImplementedError(self.key_algorithm)
 
@@ -2013,12 +2742,51 @@ class PGPKey(Armorable, ParentRef, PGPObject):
             if subject.type == 'cleartext':
                 sig_type = SignatureType.CanonicalDocument
 
-            subject = subject.message
+            # hash file-backed contents a piece at a time, rather than loading them
+            subject = subject._message if subject.type == 'literal' and subject._message.is_file else subject.message
 
         sig = PGPSignature.new(sig_type, self.key_algorithm, hash_algo, self.fingerprint.keyid)
 
         return self._sign(subject, sig, **prefs)
 
+    @KeyAction(KeyFlags.Sign, is_unlocked=True, is_public=False)
+    def sign_cleartext(self, src, dst, **prefs):
+        """
+        Sign a text document in the cleartext signature framework, one line at a time. Each line is read from
+        ``src``, dash-escaped and written to ``dst``, and canonicalized and hashed, in a single pass, so documents of
+        any size can be signed without loading them into memory. The output is the same as ``str(message)`` of a
+        cleartext :py:obj:`PGPMessage` with the resulting signature added to it, encoded as bytes.
+
+        :param src: The document to sign, as a binary file object, or any other iterable of lines of ``bytes``.
+        :param dst: A writable binary file object to write the signed document to.
+        :raises: :py:exc:`~pgpy.errors.PGPError` if the key is passphrase-protected and has not been unlocked
+        :raises: :py:exc:`~pgpy.errors.PGPError` if the key is public
+        :returns: :py:obj:`PGPSignature`
+
+        Accepts the same optional keyword arguments as :py:meth:`PGPKey.sign`.
+        """
+        if Prehashed is None:  # pragma: no cover
+            # the lines cannot be read a second time
+            raise NotImplementedError("Signing a cleartext document line by line requires cryptography >= 1.6")
+
+        sig = PGPSignature.new(SignatureType.CanonicalDocument, self.key_algorithm, prefs.pop('hash', None),
+                               self.fingerprint.keyid)
+
+        def _lines():
+            # the hash algorithm is only settled once _sign starts hashing, so the armor headers are written lazily
+            dst.write("-----BEGIN PGP SIGNED MESSAGE-----\nHash: {:s}\n\n".format(sig.hash_algorithm.name).encode('ascii'))
+
+            for line in src:
+                dst.write(b'- ' + line if line.startswith(b'-') else line)
+                yield line
+
+            dst.write(b'\n')
+
+        self._sign(PGPSignature._document(_lines()), sig, **prefs)
+        dst.write(str(sig).encode('ascii'))
+
+        return sig
+
     @KeyAction(KeyFlags.Certify, is_unlocked=True, is_public=False)
     def certify(self, subject, level=SignatureType.Generic_Cert, **prefs):
         """
@@ -2297,30 +3065,32 @@ class PGPKey(Armorable, ParentRef, PGPObject):
         sspairs = []
 
         # some type checking
-        if not isinstance(subject, (type(None), PGPMessage, PGPKey, PGPUID, PGPSignature, six.string_types, bytes, bytearray)):
+        if not isinstance(subject, (type(None), PGPMessage, PGPKey, PGPUID, PGPSignature, LiteralData, six.string_types, bytes, bytearray)):
             raise TypeError("Unexpected subject value: {:s}".format(str(type(subject))))
         if not isinstance(signature, (type(None), PGPSignature, PGPDetachedSignature)):
             raise TypeError("Unexpected signature value: {:s}".format(str(type(signature))))
 
         def _filter_sigs(sigs):
+            # sigs is the SignatureList of the subject, which is already indexed by signer
             _ids = {self.fingerprint.keyid} | set(self.subkeys)
-            return [ sig for sig in sigs if sig.signer in _ids ]
+            return sorted((sig for keyid in _ids for sig in sigs.by_signer(keyid)), key=operator.attrgetter('created'))
 
         # collect signature(s)
         if signature is None:
             if isinstance(subject, PGPMessage):
-                sspairs += [ (sig, subject.message) for sig in _filter_sigs(subject.signatures) ]
+                msg = subject._message if subject.type == 'literal' and subject._message.is_file else subject.message
+                sspairs += [ (sig, msg) for sig in _filter_sigs(subject._signatures) ]
 
             if isinstance(subject, (PGPUID, PGPKey)):
-                sspairs += [ (sig, subject) for sig in _filter_sigs(subject.signatures) ]
+                sspairs += [ (sig, subject) for sig in _filter_sigs(subject._signatures) ]
 
             if isinstance(subject, PGPKey):
                 # user ids
-                sspairs += [ (sig, uid) for uid in subject.userids for sig in _filter_sigs(uid.signatures) ]
+                sspairs += [ (sig, uid) for uid in subject.userids for sig in _filter_sigs(uid._signatures) ]
                 # user attributes
-                sspairs += [ (sig, ua) for ua in subject.userattributes for sig in _filter_sigs(ua.signatures) ]
+                sspairs += [ (sig, ua) for ua in subject.userattributes for sig in _filter_sigs(ua._signatures) ]
                 # subkey binding signatures
-                sspairs += [ (sig, subkey) for subkey in subject.subkeys.values() for sig in _filter_sigs(subkey.signatures) ]
+                sspairs += [ (sig, subkey) for subkey in subject.subkeys.values() for sig in _filter_sigs(subkey._signatures) ]
 
         elif isinstance(signature, PGPSignature) and signature.signer in {self.fingerprint.keyid} | set(self.subkeys):
             sspairs += [(signature, subject)]
@@ -2343,11 +3113,286 @@ class PGPKey(Armorable, ParentRef, PGPObject):
                 sigv &= self.subkeys[sig.signer].verify(subj, sig)
 
             else:
-                verified = self._key.verify(sig.hashdata(subj), sig.__sig__, getattr(hashes, sig.hash_algorithm.name)())
+                sigv.add_sigsubj(sig, self, subj, self._verify_sig(sig, subj))
+
+        return sigv
+
+    def _verify_sig(self, sig, subject, cache=None):
+        # verify one signature made by this key (not one of its subkeys) over subject
+        h = sig.hash_algorithm.hasher
+        for chunk in sig.iter_hashdata(subject):
+            h.update(chunk)
+        digest = h.digest()
+
+        if cache is not None:
+            ckey = (self.fingerprint, bytes(sig), digest)
+            verified = cache.get(ckey)
+            if verified is not None:
+                return verified
+
+        if Prehashed is not None:
+            verified = self._key.verify(digest, sig.__sig__, Prehashed(getattr(hashes, sig.hash_algorithm.name)()))
+
+        else:
+            verified = self._key.verify(sig.iter_hashdata(subject), sig.__sig__, getattr(hashes, sig.hash_algorithm.name)())
+
+        if verified is NotImplemented:
+            raise NotImplementedError(sig.key_algorithm)
+
+        if cache is not None:
+            cache[ckey] = verified
+        return verified
+
+    def validate(self, cache=None):
+        """
+        Check which parts of this key are validly bound to it. Only the signatures that decide that are verified: the
+        newest self-certification of each User ID, the newest binding signature of each subkey (and the primary key
+        binding signature of each signing subkey), direct-key signatures, and revocations made by this key. Third
+        party certifications are not looked at.
+
+        The report is kept until the key is changed, and expiration is checked each time it is asked for, so calling
+        this again is cheap.
+
+        :param cache: If given, verification results are looked up in and added to it, so that validating this key
+                      again after it has been reloaded, or another copy of it, does not need to verify signatures that
+                      were already verified.
+        :type cache: :py:obj:`~pgpy.types.VerificationCache`
+        :returns: :py:obj:`~pgpy.types.KeyValidation`
+        """
+        if not self.is_primary:
+            return self.parent.validate(cache)
+
+        return self._memo('validation', functools.partial(self._validate, cache))
+
+    def _validate(self, cache=None):
+        keyid = self.fingerprint.keyid
+        report = KeyValidation()
+
+        def _newest(sigs, signer, subject):
+            # the newest of sigs that verifies; signatures made with algorithms PGPy does not support do not
+            for sig in sorted(sigs, key=operator.attrgetter('created'), reverse=True):
+                try:
+                    if signer._verify_sig(sig, subject, cache):
+                        return sig
+
+                except NotImplementedError:
+                    continue
+
+            return None
+
+        def _revoked(revocations, signer, subject, binding):
+            # a revocation that is older than the newest self-signature has been superseded by it
+            rev = _newest(revocations, signer, subject)
+            return rev is not None and (binding is None or rev.created >= binding.created)
+
+        direct = _newest(self._signatures.by_type(SignatureType.DirectlyOnKey, keyid), self, self)
+
+        certs = {SignatureType.Generic_Cert, SignatureType.Persona_Cert, SignatureType.Casual_Cert, SignatureType.Positive_Cert}
+        for uid in self._uids:
+            cert = _newest(itertools.chain(*(uid._signatures.by_type(t, keyid) for t in certs)), self, uid)
+            revoked = _revoked(uid._signatures.by_type(SignatureType.CertRevocation, keyid), self, uid, cert)
+            report.add_status(uid, cert is not None, revoked, cert.expires_at if cert is not None else None, cert)
+
+        binding = direct or next((s.signature for s in report.userids if s), None)
+        revoked = _newest(self._signatures.by_type(SignatureType.KeyRevocation, keyid), self, self) is not None
+        report.add_status(self, binding is not None, revoked, self.expires_at, binding)
+
+        for subkey in self._children.values():
+            binding = _newest(subkey._signatures.by_type(SignatureType.Subkey_Binding, keyid), self, subkey)
+
+            # a signing subkey also has to sign the primary key, so that it cannot be claimed by someone else's key
+            if binding is not None and KeyFlags.Sign in binding.key_flags:
+                backsigs = subkey._signatures.by_type(SignatureType.PrimaryKey_Binding, subkey.fingerprint.keyid)
+                if _newest(backsigs, subkey, subkey) is None:
+                    binding = None
+
+            revoked = _revoked(subkey._signatures.by_type(SignatureType.SubkeyRevocation, keyid), self, subkey, binding)
+            report.add_status(subkey, binding is not None, revoked, subkey.expires_at, binding)
+
+        return report
+
+    def verify_cleartext(self, src, dst=None):
+        """
+        Verify a document signed in the cleartext signature framework, one line at a time. Each line of the text is
+        read from ``src``, dash-unescaped, and canonicalized and hashed with every algorithm named in the ``Hash``
+        armor header, in a single pass; only the signature block at the end is ever held in memory.
+
+        :param src: The signed document, as a binary file object, or any other iterable of lines of ``bytes``.
+        :param dst: If given, a writable binary file object to write the (dash-unescaped) text to as it is read.
+        :raises: :py:exc:`ValueError` if ``src`` is not a cleartext signed document.
+        :raises: :py:exc:`~pgpy.errors.PGPError` if any of the signatures is not a
+                 :py:obj:`~constants.SignatureType.CanonicalDocument` signature, or none of them were made by this key
+                 or its subkeys.
+        :returns: :py:obj:`~pgpy.types.SignatureVerification`. The subject of each signature is ``src``.
+        """
+        lines = iter(src)
+
+        if next(lines, b'').rstrip(b'\r\n') != b'-----BEGIN PGP SIGNED MESSAGE-----':
+            raise ValueError("Expected: a cleartext signed document")
+
+        # armor headers; if there is no Hash header, MD5 is implied
+        hashers = {}
+        for line in lines:
+            line = line.rstrip(b'\r\n')
+            if not line:
+                break
+
+            if line.startswith(b'Hash: '):
+                hashers.update((HashAlgorithm[n.strip()], HashAlgorithm[n.strip()].hasher)
+                               for n in line[6:].decode('ascii').split(',') if n.strip() in HashAlgorithm.__members__)
+
+        if not hashers:
+            hashers[HashAlgorithm.MD5] = HashAlgorithm.MD5.hasher
+
+        # the text; the line ending before the signature block belongs to the armor, not the text,
+        # so each line is only hashed once the next one has been read
+        prev = None
+        for line in lines:
+            if line.startswith(b'-----BEGIN PGP SIGNATURE-----'):
+                block = [line]
+                break
+
+            if prev is not None:
+                for h in hashers.values():
+                    h.update(re.subn(br'\r?\n', b'\r\n', prev)[0])
+                if dst is not None:
+                    dst.write(prev)
+
+            prev = line[2:] if line.startswith(b'- ') else line
+
+        else:
+            raise ValueError("Expected: a cleartext signed document")
+
+        if prev is not None:
+            prev = prev[:-2] if prev.endswith(b'\r\n') else prev[:-1]
+            for h in hashers.values():
+                h.update(prev)
+            if dst is not None:
+                dst.write(prev)
+
+        block.extend(lines)
+        signature = PGPDetachedSignature.from_blob(b''.join(block))
+
+        # the text has been canonicalized and hashed as a text document, which is all a cleartext signature can be
+        if any(sig.type != SignatureType.CanonicalDocument for sig in signature):
+            raise PGPError("Expected: only CanonicalDocument signatures in a cleartext signed document")
+
+        return self._verify_hashed(signature, dict(((SignatureType.CanonicalDocument, halg), h) for halg, h in hashers.items()), src)
+
+    def verify_onepass(self, src, dst=None):
+        """
+        Verify a signed (and possibly compressed) binary message as it is read from ``src``, in a single pass. The
+        one-pass signature packets (or signature packets) in front of the literal data set up the hash contexts before
+        it arrives, and the contents are hashed (and optionally written to ``dst``) as they are read, without ever
+        being held in memory.
+
+        :param src: A readable binary file object containing the message. It must not be ASCII-armored or encrypted.
+        :param dst: If given, a writable binary file object to write the contents of the message to as they are read.
+        :raises: :py:exc:`~pgpy.errors.PGPError` if the message is malformed, contains packets that do not belong in a
+                 signed message, or none of its signatures were made by this key or its subkeys.
+        :returns: :py:obj:`~pgpy.types.SignatureVerification`. The subject of each signature is ``src``.
+        """
+        chunksize = LiteralData.chunksize
+        # how much has been decompressed so far, over all of the compressed data packets in src
+        total = [0]
+
+        def _packets(chunks, depth=0):
+            # yield (tag, body) for each packet, unwrapping compressed data as it goes
+            for tag, body in scan_stream(chunks, chunksize):
+                if tag != PacketTag.CompressedData:
+                    yield tag, body
+                    continue
+
+                bread = _reader(body)
+                calg = bread(1)
+                if not calg:
+                    raise PGPError("Truncated packet")
+
+                # the same limits apply here as when parsing compressed data packets
+                pieces = iter(functools.partial(bread, chunksize), bytearray())
+                output = CompressedData.decompress_checked(CompressionAlgorithm(calg[0]), pieces, total, depth)
+                for item in _packets(output, depth + 1):
+                    yield item
+
+        def _parse(tag, body):
+            data = bytearray()
+            for chunk in body:
+                data += chunk
+            return Packet(bytearray([0xC0 | tag]) + Header.encode_length(len(data)) + data)
+
+        hashers = {}
+        sigs = []
+        literal = False
+
+        for tag, body in _packets(iter(functools.partial(src.read, chunksize), b'')):
+            if tag == PacketTag.OnePassSignature:
+                ops = _parse(tag, body)
+                hashers.setdefault((ops.sigtype, ops.halg), ops.halg.hasher)
+
+            elif tag == PacketTag.Signature:
+                sig = PGPSignature() | _parse(tag, body)
+                sigs.append(sig)
+                if not literal:
+                    hashers.setdefault((sig.type, sig.hash_algorithm), sig.hash_algorithm.hasher)
+
+            elif tag == PacketTag.LiteralData and not literal:
+                literal = True
+                bread = _reader(body)
+                bread(1)
+                bread(bread(1)[0] + 4)
+
+                binary = [h for (sigtype, _), h in hashers.items() if sigtype == SignatureType.BinaryDocument]
+                canonical = [h for (sigtype, _), h in hashers.items() if sigtype == SignatureType.CanonicalDocument]
+
+                def _contents():
+                    for chunk in iter(functools.partial(bread, chunksize), bytearray()):
+                        if dst is not None:
+                            dst.write(chunk)
+                        for h in binary:
+                            h.update(chunk)
+                        yield chunk
+
+                for chunk in (PGPSignature.canonicalize(_contents()) if canonical else _contents()):
+                    for h in canonical:
+                        h.update(chunk)
+
+            elif tag != PacketTag.Marker:
+                raise PGPError("Unexpected packet in a signed message: tag {:d}".format(tag))
+
+        if not literal:
+            raise PGPError("No literal data to verify")
+
+        return self._verify_hashed(sigs, hashers, src)
+
+    def _verify_hashed(self, signatures, hashers, subject):
+        # finish verifying each of signatures by this key or its subkeys, given hash contexts that have been fed
+        # the document, keyed by (signature type, hash algorithm)
+        if Prehashed is None:  # pragma: no cover
+            raise NotImplementedError("Verifying a document as it is read requires cryptography >= 1.6")
+
+        sigv = SignatureVerification()
+        for sig in signatures:
+            if sig.signer == self.fingerprint.keyid:
+                key = self
+
+            elif sig.signer in self.subkeys:
+                key = self.subkeys[sig.signer]
+
+            else:
+                continue
+
+            verified = False
+            if (sig.type, sig.hash_algorithm) in hashers:
+                h = hashers[(sig.type, sig.hash_algorithm)].copy()
+                h.update(sig.hashdata(b''))
+                verified = key._key.verify(h.digest(), sig.__sig__, Prehashed(getattr(hashes, sig.hash_algorithm.name)()))
                 if verified is NotImplemented:
                     raise NotImplementedError(sig.key_algorithm)
 
-                sigv.add_sigsubj(sig, self, subj, verified)
+            sigv.add_sigsubj(sig, key, subject, verified)
+
+        if len(sigv._subjects) == 0:
+            raise PGPError("No signatures to verify")
 
         return sigv
 
@@ -2381,14 +3426,7 @@ class PGPKey(Armorable, ParentRef, PGPObject):
         :keyword throw_keyid: Whether to zero out the keyid. An all zero keyid MAY be used as a wild-card keyid.
         :type throw_keyid: ``bool``
         """
-        user = prefs.pop('user', None)
-        uid = None
-        if user is not None:
-            uid = self.get_uid(user)
-        else:
-            uid = next(iter(self.userids), None)
-            if uid is None and self.parent is not None:
-                uid = next(iter(self.parent.userids), None)
+        uid = self._pref_uid(prefs.pop('user', None))
         cipher_algo = prefs.pop('cipher', uid.selfsig.cipherprefs[0])
 
         if cipher_algo not in uid.selfsig.cipherprefs:
@@ -2400,46 +3438,147 @@ class PGPKey(Armorable, ParentRef, PGPObject):
         if sessionkey is None:
             sessionkey = cipher_algo.gen_key()
 
-        throw_keyid = prefs.pop('throw_keyid', False)
+        pkesk = self._pkesk(cipher_algo, sessionkey, throw_keyid=prefs.pop('throw_keyid', False))
+
+        if message.is_encrypted:  # pragma: no cover
+            _m = message
+
+        else:
+            _m = PGPMessage()
+            skedata = IntegrityProtectedSKEDataV1()
+            skedata.encrypt(sessionkey, cipher_algo, message.iter_bytes())
+            _m |= skedata
 
+        _m |= pkesk
+
+        return _m
+
+    @KeyAction(KeyFlags.EncryptCommunications, KeyFlags.EncryptStorage, is_public=True)
+    def _pkesk(self, cipher_algo, sessionkey, throw_keyid=False):
         # set up a new PKESessionKeyV3
         pkesk = PKESessionKeyV3()
         if throw_keyid:
             pkesk.encrypter = PGPKey.__zero_keyid
         else:
-            pkesk.encrypter = bytearray(binascii.unhexlify(self.fingerprint.keyid.encode('latin-1')))
+            pkesk.encrypter = self.fingerprint.keyid
         pkesk.pkalg = self.key_algorithm
         # pkesk.encrypt_sk(self.__key__, cipher_algo, sessionkey)
         pkesk.encrypt_sk(self._key, cipher_algo, sessionkey)
+        return pkesk
 
-        if message.is_encrypted:  # pragma: no cover
-            _m = message
+    def _pref_uid(self, user=None):
+        # the User ID that recipient preferences are taken from
+        def _uid():
+            if user is not None:
+                return self.get_uid(user)
 
-        else:
-            _m = PGPMessage()
-            skedata = IntegrityProtectedSKEDataV1()
-            skedata.encrypt(sessionkey, cipher_algo, message.__bytes__())
-            _m |= skedata
+            uid = next(iter(self.userids), None)
+            if uid is None and self.parent is not None:
+                uid = next(iter(self.parent.userids), None)
+            return uid
+
+        return self._memo(('pref_uid', user), _uid)
+
+    def _decrypt_sk(self, pkesk, cache=None):
+        if cache is None:
+            return pkesk.decrypt_sk(self._key)
+
+        ckey = (self.fingerprint, bytes(pkesk))
+        sk = cache.get(ckey)
+        if sk is None:
+            sk = cache[ckey] = pkesk.decrypt_sk(self._key)
+        return sk
+
+    def _sessionkeys(self, message, cache=None, workers=1):
+        # decrypt the session key packets in message that this key or its subkeys might be able to decrypt,
+        # yielding (cipher, sessionkey) for each one that succeeds.
+        # candidate (key, pkesk) pairs are planned up front: pkesks addressed to one of the keys come first,
+        # followed by anonymous (zero keyid) pkesks paired with each key of the right algorithm that can encrypt
+        encflags = {KeyFlags.EncryptCommunications, KeyFlags.EncryptStorage}
+        keys = [self] + list(self.subkeys.values())
+        pkesks = [pk for pk in message._sessionkeys if isinstance(pk, PKESessionKey)]
+
+        def _rank(key):
+            # keys that do not state that they can encrypt are given the benefit of the doubt, after the ones that do,
+            # unless they state some other usage; ECDH is cheaper than the other algorithms, so it goes first
+            flags = set(key.usage_flags()) - {KeyFlags.Certify}
+            if flags and not flags & encflags:
+                return None
+            return (not flags, key.key_algorithm != PubKeyAlgorithm.ECDH)
+
+        addressed = [(key, pk) for pk in pkesks for key in keys
+                     if pk.encrypter == key.fingerprint.keyid and pk.pkalg == key.key_algorithm]
+
+        ranked = sorted((r, i, key) for i, key in enumerate(keys) for r in [_rank(key)] if r is not None)
+        anonymous = [(key, pk) for _, _, key in ranked for pk in pkesks
+                     if pk.encrypter == PGPKey.__zero_keyid and pk.pkalg == key.key_algorithm]
+
+        for key, _ in addressed:
+            if key is not self:
+                warnings.warn("Message was encrypted with this key's subkey: {:s}. "
+                              "Decrypting with that...".format(key.fingerprint.keyid),
+                              stacklevel=4)
+                break
 
-        _m |= pkesk
+        def _attempt(candidate):
+            key, pkesk = candidate
+            try:
+                alg, sessionkey = key._decrypt_sk(pkesk, cache)
 
-        return _m
+                # here we assume that if decrypting an anonymous pkesk does not fail, and the session key passes
+                # the quick check, that it decrypted successfully. Decrypting the message itself checks the MDC.
+                if pkesk.encrypter == PGPKey.__zero_keyid and not message.message.quick_check(sessionkey, alg):
+                    return None
 
-    def _decrypt(self, pkesk, message):
-        alg, key = pkesk.decrypt_sk(self._key)
+                return (alg, sessionkey)
 
-        # now that we have the symmetric cipher used and the key, we can decrypt the actual message
-        decmsg = PGPMessage()
-        decmsg.parse(message.message.decrypt(key, alg))
+            except (PGPDecryptionError, ValueError, InvalidUnwrap):
+                return None
 
-        return decmsg
+        # the decrypt action only checks this key, but a subkey can still be locked or public only; those are left out,
+        # and if that leaves nothing to try, the error is the same as it would have been for this key
+        candidates = addressed + anonymous
+        usable = [(key, pk) for key, pk in candidates if key.is_unlocked and not key.is_public]
+        if candidates and not usable:
+            KeyAction(is_unlocked=True, is_public=False).check_attributes(candidates[0][0])
+        candidates = usable
+
+        if workers > 1 and len(candidates) > 1:
+            pool = ThreadPool(min(workers, len(candidates)))
+            # try the candidates a batch at a time, so that at most one batch of work is done after the first success
+            results = itertools.chain.from_iterable(pool.map(_attempt, candidates[i:i + workers])
+                                                    for i in range(0, len(candidates), workers))
+
+        else:
+            pool = None
+            results = six.moves.map(_attempt, candidates)
+
+        try:
+            for result in results:
+                if result is not None:
+                    yield result
+
+        finally:
+            if pool is not None:
+                pool.terminate()
 
     @KeyAction(is_unlocked=True, is_public=False)
-    def decrypt(self, message):
+    def decrypt(self, message, sink=None, cache=None, workers=1):
         """
         Decrypt a PGPMessage using this key.
 
         :param message: An encrypted :py:obj:`PGPMessage`
+        :param sink: If given, the contents of the decrypted message are written to it as they are parsed, instead of
+                     being kept in the returned message. See :py:meth:`PGPMessage.decrypt`.
+        :type sink: A writable binary file object, or a ``callable`` taking each piece of the contents
+        :param cache: If given, decrypted session keys are looked up in and added to this cache, so that decrypting
+                      the same message again does not need another private key operation.
+        :type cache: :py:obj:`~pgpy.types.SessionKeyCache`
+        :param workers: The number of threads to use to try the session key packets in ``message`` that might have
+                        been encrypted to this key. Default is ``1``. This only helps with messages that have a lot of
+                        anonymous recipients (see the ``throw_keyid`` option of :py:meth:`encrypt`), because every
+                        one of them has to be tried.
+        :type workers: ``int``
         :raises: :py:exc:`~errors.PGPError` if the key is not private, or protected but not unlocked.
         :raises: :py:exc:`~errors.PGPDecryptionError` if decryption fails for any other reason.
         :returns: A new :py:obj:`PGPMessage` with the decrypted contents of ``message``.
@@ -2448,46 +3587,44 @@ class PGPKey(Armorable, ParentRef, PGPObject):
             warnings.warn("This message is not encrypted", stacklevel=3)
             return message
 
-        if self.fingerprint.keyid in message.encrypters:
-            # we have some pkesks encrypted to this key, try decrypting them.
-            pkesks = [pk for pk in message._sessionkeys
-                      if pk.pkalg == self.key_algorithm and pk.encrypter == self.fingerprint.keyid]
-            # decrypt appropriate pkesk
-            for pkesk in pkesks:
-                try:
-                    return self._decrypt(pkesk, message)
-                except (PGPDecryptionError, ValueError): # pragma: no cover
-                    pass
-            # fallthrough if we haven't succeeded
-        else:
-            # we don't have any pkesks encrypted to this key, see if we have some for subkeys
-            # if not check if we have some zero keyid pkesks and try decrypting them with this key and finally subkeys
-            sks = set(self.subkeys)
-            mis = set(message.encrypters)
-            if sks & mis:
-                skid = list(sks & mis)[0]
-                warnings.warn("Message was encrypted with this key's subkey: {:s}. "
-                              "Decrypting with that...".format(skid),
-                              stacklevel=2)
-                return self.subkeys[skid].decrypt(message)
-            elif PGPKey.__zero_keyid_str in mis:
-                # decrypt zero keyid pkesks, first try with this key, then pass on to subkeys
-                # here we assume that if self._decrypt doesnt raise a PGPError that it decrypted successfully
-                # however, that assumption may not be correct so we might return some garbage back to the caller
-                # but that's really the most we can do with decrypting thrown keyid pkesks.
-                zero_keyid_pkesks = [pk for pk in message._sessionkeys
-                                     if pk.pkalg == self.key_algorithm and pk.encrypter == PGPKey.__zero_keyid_str]
-                for pkesk in zero_keyid_pkesks:
-                    try:
-                        return self._decrypt(pkesk, message)
-                    except (PGPDecryptionError, ValueError):
-                        pass
-                for subkey in self.subkeys.values():
-                    try:
-                        return subkey.decrypt(message)
-                    except PGPError:
-                        pass
-                # fallthrough if we haven't succeeded
+        for alg, sessionkey in self._sessionkeys(message, cache, workers):
+            try:
+                return message.decrypt_with_sessionkey(alg, sessionkey, sink)
+
+            except PGPDecryptionError:  # pragma: no cover
+                # a wrong session key from an anonymous pkesk that got past the quick check
+                continue
+
+        raise PGPError("Cannot decrypt the provided message with this key")
+
+    @KeyAction(is_unlocked=True, is_public=False)
+    def decrypt_sessionkey(self, message, cache=None, workers=1):
+        """
+        Decrypt the session key of a PGPMessage using this key, without decrypting the message itself. The session key
+        can then be used to decrypt the message as many times as needed with
+        :py:meth:`PGPMessage.decrypt_with_sessionkey`, or to encrypt it to more recipients with
+        :py:meth:`PGPMessage.encrypt_to`, without any further private key operations.
+
+        :param message: An encrypted :py:obj:`PGPMessage`
+        :param cache: If given, decrypted session keys are looked up in and added to this cache.
+        :type cache: :py:obj:`~pgpy.types.SessionKeyCache`
+        :param workers: The number of threads to use to try session key packets. See :py:meth:`decrypt`.
+        :type workers: ``int``
+        :raises: :py:exc:`~errors.PGPError` if the message is not encrypted, if the key is not private, or protected
+                 but not unlocked, or if no session key in the message could be decrypted with this key.
+        :returns: A ``tuple`` of the :py:obj:`~constants.SymmetricKeyAlgorithm` the message was encrypted with, and the
+                  session key as ``bytes``.
+
+        .. warning::
+
+            Anyone who has the session key of a message can decrypt it, so it should be handled as carefully as the
+            private key it was decrypted with.
+        """
+        if not message.is_encrypted:
+            raise PGPError("This message is not encrypted!")
+
+        for sessionkey in self._sessionkeys(message, cache, workers):
+            return sessionkey
 
         raise PGPError("Cannot decrypt the provided message with this key")
 
@@ -2573,6 +3710,19 @@ class PGPKey(Armorable, ParentRef, PGPObject):
 
 
 class PGPKeyring(collections.Container, collections.Iterable, collections.Sized):
+    #: How many marginally trusted introducers need to certify a User ID for it to be fully valid.
+    marginals_needed = 3
+    #: How many fully trusted introducers need to certify a User ID for it to be fully valid.
+    completes_needed = 1
+    #: How many certifications away from an ultimately trusted key a key can be, and still be valid.
+    max_cert_depth = 5
+    #: If ``True``, trust signatures (see :py:attr:`PGPSignature.trust`) made by trusted keys make the keys they certify
+    #: trusted introducers, as in the PGP trust model. If ``False``, they count as ordinary certifications.
+    trust_signatures = True
+
+    _certifications = {SignatureType.Generic_Cert, SignatureType.Persona_Cert, SignatureType.Casual_Cert,
+                       SignatureType.Positive_Cert}
+
     def __init__(self, *args):
         """
         PGPKeyring objects represent in-memory keyrings that can contain any combination of supported private and public
@@ -2583,6 +3733,15 @@ class PGPKeyring(collections.Container, collections.Iterable, collections.Sized)
         self._pubkeys = collections.deque()
         self._privkeys = collections.deque()
         self._aliases = collections.deque([{}])
+
+        # the web of trust: third party certifications of the User IDs of loaded keys, indexed by issuer key id,
+        # owner trust by fingerprint, and the validity computed from them for each set of trust model parameters.
+        # Signature verification results outlive the computed validity, so it is cheap to compute again
+        self._certs = collections.defaultdict(list)
+        self._ownertrust = {}
+        self._trustdb = {}
+        self._vcache = VerificationCache()
+
         self.load(*args)
 
     def __contains__(self, alias):
@@ -2652,6 +3811,19 @@ class PGPKeyring(collections.Container, collections.Iterable, collections.Sized)
             self._aliases[adepth][alias] = pkid
             self._sort_alias(alias)
 
+    def _add_uid(self, uid, pkid):
+        if uid.is_uid:
+            self._add_alias(uid.name, pkid)
+            if uid.comment:
+                self._add_alias(uid.comment, pkid)
+
+            if uid.email:
+                self._add_alias(uid.email, pkid)
+
+        for sig in uid._signatures:
+            if sig.type in self._certifications and sig.signer != uid.parent.fingerprint.keyid:
+                self._certs[sig.signer].append((sig, uid))
+
     def _add_key(self, pgpkey):
         pkid = id(pgpkey)
         if pkid not in self._keys:
@@ -2669,13 +3841,12 @@ class PGPKeyring(collections.Container, collections.Iterable, collections.Sized)
             self._add_alias(pgpkey.fingerprint, pkid)
             self._add_alias(pgpkey.fingerprint.keyid, pkid)
             self._add_alias(pgpkey.fingerprint.shortid, pkid)
-            for uid in pgpkey.userids:
-                self._add_alias(uid.name, pkid)
-                if uid.comment:
-                    self._add_alias(uid.comment, pkid)
+            # user ids, and their certifications
+            for uid in pgpkey._uids:
+                self._add_uid(uid, pkid)
 
-                if uid.email:
-                    self._add_alias(uid.email, pkid)
+            if pgpkey.is_primary:
+                self._trustdb.clear()
 
             # subkeys
             for subkey in pgpkey.subkeys.values():
@@ -2690,12 +3861,19 @@ class PGPKeyring(collections.Container, collections.Iterable, collections.Sized)
         :type \*args: ``list``, ``tuple``, ``str``, ``unicode``, ``bytes``, ``bytearray``
         :returns: a ``set`` containing the unique fingerprints of all of the keys that were loaded during this operation.
         """
+        loaded = set()
+        for ik in self._iter_keys(*args):
+            self._add_key(ik)
+            loaded |= {ik.fingerprint} | {isk.fingerprint for isk in ik.subkeys.values()}
+
+        return list(loaded)
+
+    def _iter_keys(self, *args):
         def _preiter(first, iterable):
             yield first
             for item in iterable:
                 yield item
 
-        loaded = set()
         for key in iter(item for ilist in iter(ilist if isinstance(ilist, (tuple, list)) else [ilist] for ilist in args)
                         for item in ilist):
             keys = {}
@@ -2707,10 +3885,52 @@ class PGPKeyring(collections.Container, collections.Iterable, collections.Sized)
                 _key, keys = PGPKey.from_blob(key)
 
             for ik in _preiter(_key, keys.values()):
+                yield ik
+
+    def merge(self, *args):
+        r"""
+        Load keys into this keyring, as with :py:meth:`load`, except that each key that has the same fingerprint as a
+        loaded key of the same half (public or private) is merged into that key with :py:meth:`PGPKey.merge`, instead of
+        being loaded alongside it. Repeatedly importing updated copies of the same keys does not make the keyring grow,
+        except by what is new in them.
+
+        :param \*args: Anything that :py:meth:`load` accepts.
+        :returns: a ``dict`` mapping the fingerprint of each key that was merged into a loaded key to what was added to
+                  it, as returned by :py:meth:`PGPKey.merge`. Keys that were loaded instead are mapped to ``None``.
+        """
+        merged = {}
+        seen = set()
+        for ik in self._iter_keys(*args):
+            if id(ik) in seen or id(ik) in self._keys:
+                continue
+            seen.add(id(ik))
+
+            loaded = next((k for k in self._get_keys(ik.fingerprint) if k.is_primary and k.is_public == ik.is_public), None) \
+                if ik.is_primary else None
+
+            if loaded is None:
                 self._add_key(ik)
-                loaded |= {ik.fingerprint} | {isk.fingerprint for isk in ik.subkeys.values()}
+                merged.setdefault(ik.fingerprint, None)
+                continue
 
-        return list(loaded)
+            added = merged[ik.fingerprint] = loaded.merge(ik)
+
+            # index what was added as if it had been there when the key was loaded
+            pkid = id(loaded)
+            for uid in added.userids:
+                self._add_uid(uid, pkid)
+
+            for subkey in added.subkeys:
+                self._add_key(subkey)
+
+            for subject, sig in added.signatures:
+                if isinstance(subject, PGPUID) and sig.type in self._certifications and sig.signer != loaded.fingerprint.keyid:
+                    self._certs[sig.signer].append((sig, subject))
+
+            if any(added):
+                self._trustdb.clear()
+
+        return merged
 
     @contextlib.contextmanager
     def key(self, identifier):
@@ -2775,6 +3995,260 @@ class PGPKeyring(collections.Container, collections.Iterable, collections.Sized)
                 if a in self:
                     self._sort_alias(a)
 
-            # if key is a primary key, unload its subkeys as well
+            # if key is a primary key, unload its subkeys and certifications as well
             if key.is_primary:
                 [ self.unload(sk) for sk in key.subkeys.values() ]
+
+                for certs in self._certs.values():
+                    certs[:] = [ (sig, uid) for sig, uid in certs if uid.parent is not key ]
+
+                self._trustdb.clear()
+
+    def minimize(self, certifiers=None):
+        """
+        Minimize every loaded primary key with :py:meth:`PGPKey.minimize`, and index the keyring again. Keys that are
+        not validly self-signed are left as they are.
+
+        :param certifiers: The keys whose certifications should be kept, as in :py:meth:`PGPKey.minimize`. By default,
+                           the certifications made by keys in this keyring are kept, and those made by any other keys,
+                           which could not be used to compute :py:meth:`validity` anyway, are removed.
+        :type certifiers: ``iterable``
+        """
+        if certifiers is None:
+            certifiers = {key.fingerprint.keyid for key in self._keys.values()}
+
+        for key in self._keys.values():
+            if key.is_primary:
+                try:
+                    key.minimize(certifiers, self._vcache)
+
+                except PGPError:
+                    pass
+
+        # User IDs and subkeys may have been removed, so the aliases and certifications are indexed from scratch
+        keys = [ self._keys[pkid] for pkid in itertools.chain(self._pubkeys, self._privkeys) ]
+        self._keys = {}
+        self._pubkeys.clear()
+        self._privkeys.clear()
+        self._aliases = collections.deque([{}])
+        self._certs.clear()
+        self._trustdb.clear()
+
+        for key in keys:
+            self._add_key(key)
+
+    def _get_primary(self, identifier):
+        key = identifier if isinstance(identifier, PGPKey) else self._get_key(identifier)
+        return key if key.is_primary else key.parent
+
+    def set_ownertrust(self, identifier, level):
+        """
+        Set how much the owner of a key is trusted to certify other keys. Owner trust is kept by fingerprint, so it
+        applies to both halves of a key, and is kept if the key is unloaded and loaded again.
+
+        Keys with :py:obj:`~constants.TrustLevel.Ultimate` owner trust are the roots of the web of trust, and are always
+        valid. The certifications of a valid key with :py:obj:`~constants.TrustLevel.Fully` or
+        :py:obj:`~constants.TrustLevel.Marginal` owner trust count towards the validity of the keys it certified.
+        :py:obj:`~constants.TrustLevel.Never` means that the key's certifications are never counted, not even if a
+        trust signature says otherwise.
+
+        :param identifier: The key to set the owner trust of, or an identifier of it, as in :py:meth:`key`.
+        :type identifier: :py:obj:`PGPKey`, ``str``
+        :param level: The owner trust.
+        :type level: :py:obj:`~constants.TrustLevel`
+        :raises: :py:exc:`KeyError` if there is no loaded key that satisfies the identifier.
+        """
+        self._ownertrust[self._get_primary(identifier).fingerprint] = TrustLevel(level)
+        self._trustdb.clear()
+
+    def ownertrust(self, identifier):
+        """
+        Get the owner trust of a key.
+
+        :param identifier: The key, or an identifier of it, as in :py:meth:`key`.
+        :type identifier: :py:obj:`PGPKey`, ``str``
+        :raises: :py:exc:`KeyError` if there is no loaded key that satisfies the identifier.
+        :returns: :py:obj:`~constants.TrustLevel`
+        """
+        return self._ownertrust.get(self._get_primary(identifier).fingerprint, TrustLevel.Unknown)
+
+    def validity(self, identifier):
+        """
+        Get how valid a key is, as computed from the owner trust set with :py:meth:`set_ownertrust` and the
+        certifications of the loaded keys, as in the GnuPG classic trust model:
+
+         - a key with :py:obj:`~constants.TrustLevel.Ultimate` owner trust is valid
+         - a User ID is fully valid if it was certified by an ultimately trusted key, by :py:attr:`completes_needed` fully
+           trusted keys, or by :py:attr:`marginals_needed` marginally trusted keys, all of them fully valid themselves,
+           and no more than :py:attr:`max_cert_depth` certifications away from an ultimately trusted key. It is
+           marginally valid if it was certified by fewer than that
+         - a key is as valid as its most valid User ID
+
+        Only self-signed User IDs of keys that are validly self-signed (see :py:meth:`PGPKey.validate`), and
+        certifications that verify and were not revoked by their issuer, are counted. Trust signatures that are
+        constrained by a regular expression count as ordinary certifications.
+
+        The validity of every loaded key is computed the first time it is asked for, and kept until keys are loaded or
+        unloaded, or owner trust is changed. Certifications added to a key after it was loaded are not noticed until it
+        is loaded again.
+
+        :param identifier: The key, or an identifier of it, as in :py:meth:`key`. If it is the name, comment, or email
+                           address of a User ID, the validity of that User ID is returned instead.
+        :type identifier: :py:obj:`PGPKey`, ``str``
+        :raises: :py:exc:`KeyError` if there is no loaded key that satisfies the identifier.
+        :returns: :py:obj:`~constants.TrustLevel`. :py:obj:`~constants.TrustLevel.Never` if the key is not validly
+                  self-signed, or is revoked, and :py:obj:`~constants.TrustLevel.Expired` if it has expired.
+        """
+        primaries, validity, uidvalidity, _ = self._compute_trust()
+        key = primaries[self._get_primary(identifier).fingerprint]
+
+        if isinstance(identifier, six.string_types):
+            uid = key.get_uid(identifier)
+            if uid is not None and id(uid) in uidvalidity:
+                return uidvalidity[id(uid)]
+
+        return validity.get(key.fingerprint, TrustLevel.Unknown)
+
+    def trust_path(self, identifier):
+        """
+        Get a path of certifications that makes a key valid.
+
+        :param identifier: The key, or an identifier of it, as in :py:meth:`key`.
+        :type identifier: :py:obj:`PGPKey`, ``str``
+        :raises: :py:exc:`KeyError` if there is no loaded key that satisfies the identifier.
+        :returns: a ``list`` of :py:obj:`PGPKey`, starting with an ultimately trusted key, in which each key certified
+                  the one after it, and ending with the key. Empty if the key is not valid.
+        """
+        primaries, validity, _, paths = self._compute_trust()
+        fp = self._get_primary(identifier).fingerprint
+
+        path = []
+        while fp is not None and validity.get(fp) in {TrustLevel.Marginal, TrustLevel.Fully, TrustLevel.Ultimate}:
+            path.insert(0, primaries[fp])
+            fp = paths.get(fp)
+
+        return path
+
+    def _compute_trust(self):
+        params = (self.marginals_needed, self.completes_needed, self.max_cert_depth, self.trust_signatures)
+        if params in self._trustdb:
+            return self._trustdb[params]
+
+        keyids = {}
+        primaries = {}
+        for key in self._keys.values():
+            keyids.setdefault(key.fingerprint.keyid, key)
+            if key.is_primary:
+                primaries.setdefault(key.fingerprint, key)
+
+        validity = {}
+        uidvalidity = {}
+        paths = {}
+        # fingerprint -> (owner trust, how many levels of trust signatures below it are honored)
+        introducers = {}
+
+        def _invalid(key):
+            report = key.validate(self._vcache)
+            if not report.primary.bound or report.primary.revoked:
+                return TrustLevel.Never
+
+            if report.primary.is_expired:
+                return TrustLevel.Expired
+
+            return None
+
+        def _verifies(signer, sig, uid):
+            try:
+                if sig.is_expired or not signer._verify_sig(sig, uid, self._vcache):
+                    return False
+
+                # a certification is withdrawn by a newer revocation from the same key
+                return not any(rev.created >= sig.created and signer._verify_sig(rev, uid, self._vcache)
+                               for rev in uid._signatures.by_type(SignatureType.CertRevocation, sig.signer))
+
+            except NotImplementedError:
+                return False
+
+        # ultimately trusted keys are the roots
+        frontier = []
+        for fp, level in self._ownertrust.items():
+            if level == TrustLevel.Ultimate and fp in primaries:
+                key = primaries[fp]
+                validity[fp] = _invalid(key) or TrustLevel.Ultimate
+                if validity[fp] == TrustLevel.Ultimate:
+                    uidvalidity.update((id(uid), TrustLevel.Ultimate) for uid in key.validate(self._vcache).valid_userids)
+                    introducers[fp] = (TrustLevel.Ultimate, 255)
+                    frontier.append(key)
+
+        final = {TrustLevel.Fully, TrustLevel.Ultimate, TrustLevel.Never, TrustLevel.Expired}
+        for _ in range(self.max_cert_depth):
+            # the keys certified by the introducers found in the last round are the only ones whose validity can change
+            targets = collections.OrderedDict()
+            for key in frontier:
+                for keyid in itertools.chain([key.fingerprint.keyid], key.subkeys):
+                    for sig, uid in self._certs.get(keyid, ()):
+                        targets.setdefault(uid.parent.fingerprint, primaries[uid.parent.fingerprint])
+
+            frontier = []
+            for fp, key in targets.items():
+                if validity.get(fp) in final:
+                    continue
+
+                invalid = _invalid(key)
+                if invalid is not None:
+                    validity[fp] = invalid
+                    continue
+
+                best, via, trust = TrustLevel.Unknown, None, (self._ownertrust.get(fp, TrustLevel.Unknown), 0)
+                for uid in key.validate(self._vcache).valid_userids:
+                    ultimate, full, marginal, certifiers = False, 0, 0, []
+                    for sig in uid._signatures:
+                        signer = keyids.get(sig.signer)
+                        if sig.type not in self._certifications or signer is None:
+                            continue
+
+                        sfp = (signer if signer.is_primary else signer.parent).fingerprint
+                        if sfp == fp or sfp not in introducers or not _verifies(signer, sig, uid):
+                            continue
+
+                        strust, sdepth = introducers[sfp]
+                        ultimate |= strust == TrustLevel.Ultimate
+                        full += strust == TrustLevel.Fully
+                        marginal += strust == TrustLevel.Marginal
+                        certifiers.append((strust, sfp))
+
+                        # a level n trust signature makes the certified key trusted to make level n - 1 trust signatures,
+                        # but only as far as the signer is trusted to make them
+                        tsig = sig.trust
+                        if self.trust_signatures and tsig is not None and sig.regex is None \
+                                and trust[0] != TrustLevel.Never and min(tsig.level, sdepth) >= 1 and tsig.amount > 0:
+                            trust = max(trust, (TrustLevel.Fully if tsig.amount >= 120 else TrustLevel.Marginal,
+                                                min(tsig.level, sdepth) - 1))
+
+                    if ultimate or full >= self.completes_needed or marginal >= self.marginals_needed:
+                        uidvalidity[id(uid)] = TrustLevel.Fully
+
+                    elif certifiers:
+                        uidvalidity[id(uid)] = TrustLevel.Marginal
+
+                    else:
+                        continue
+
+                    if uidvalidity[id(uid)] > best:
+                        best, via = uidvalidity[id(uid)], max(certifiers)[1]
+
+                if best == TrustLevel.Unknown:
+                    continue
+
+                validity[fp], paths[fp] = best, via
+
+                # only fully valid keys can introduce other keys
+                if best == TrustLevel.Fully and trust[0] in {TrustLevel.Fully, TrustLevel.Marginal} and fp not in introducers:
+                    introducers[fp] = trust
+                    frontier.append(key)
+
+            if not frontier:
+                break
+
+        self._trustdb[params] = (primaries, validity, uidvalidity, paths)
+        return self._trustdb[params]
@@ -13,46 +13,126 @@ from .errors import PGPDecryptionError
 from .errors import PGPEncryptionError
 from .errors import PGPInsecureCipher
 
-__all__ = ['_encrypt',
+__all__ = ['_CFB',
+           '_encrypt',
            '_decrypt']
 
 
-def _encrypt(pt, key, alg, iv=None):
-    if iv is None:
-        iv = b'\x00' * (alg.block_size // 8)
+class _CFB(object):
+    """
+    A streaming CFB context for one encryption or decryption operation.
+
+    Data can be fed to it in as many chunks as is convenient, using :py:meth:`update` to get a new buffer back, or
+    :py:meth:`update_into` to write into a buffer that has already been allocated. Since CFB is a stream mode, the
+    output is always exactly as long as the input.
+    """
+    @property
+    def block_size(self):
+        """The block size of the cipher, in octets."""
+        return self.alg.block_size // 8
 
-    if alg.is_insecure:
-        raise PGPInsecureCipher("{:s} is not secure. Do not use it for encryption!".format(alg.name))
+    def __init__(self, key, alg, iv=None, encrypt=True):
+        """
+        :param key: The symmetric key.
+        :type key: ``bytes``
+        :param alg: The symmetric cipher to use.
+        :type alg: :py:obj:`~constants.SymmetricKeyAlgorithm`
+        :param iv: The initialization vector. Defaults to all zeros, which is what OpenPGP uses everywhere except
+                   for secret key material.
+        :type iv: ``bytes``
+        :param encrypt: ``True`` to encrypt, ``False`` to decrypt.
+        :type encrypt: ``bool``
+        :raises: :py:exc:`~errors.PGPInsecureCipher` if encrypting with an insecure cipher.
+        :raises: :py:exc:`~errors.PGPEncryptionError` or :py:exc:`~errors.PGPDecryptionError` if the cipher is not
+                 supported.
+        """
+        self.alg = alg
+        err = PGPEncryptionError if encrypt else PGPDecryptionError
 
-    if not callable(alg.cipher):
-        raise PGPEncryptionError("Cipher {:s} not supported".format(alg.name))
+        if iv is None:
+            """
+            Instead of using an IV, OpenPGP prefixes a string of length
+            equal to the block size of the cipher plus two to the data before it
+            is encrypted. The first block-size octets (for example, 8 octets for
+            a 64-bit block length) are random, and the following two octets are
+            copies of the last two octets of the IV.
+            """
+            iv = b'\x00' * self.block_size
 
-    try:
-        encryptor = Cipher(alg.cipher(key), modes.CFB(iv), default_backend()).encryptor()
+        if encrypt and alg.is_insecure:
+            raise PGPInsecureCipher("{:s} is not secure. Do not use it for encryption!".format(alg.name))
 
-    except UnsupportedAlgorithm as ex:  # pragma: no cover
-        six.raise_from(PGPEncryptionError, ex)
+        if not callable(alg.cipher):
+            raise err("Cipher {:s} not supported".format(alg.name))
 
-    else:
-        return bytearray(encryptor.update(pt) + encryptor.finalize())
+        try:
+            cipher = Cipher(alg.cipher(key), modes.CFB(iv), default_backend())
+            self._ctx = cipher.encryptor() if encrypt else cipher.decryptor()
 
+        except UnsupportedAlgorithm as ex:  # pragma: no cover
+            six.raise_from(err, ex)
 
-def _decrypt(ct, key, alg, iv=None):
-    if iv is None:
+    def update(self, data):
         """
-        Instead of using an IV, OpenPGP prefixes a string of length
-        equal to the block size of the cipher plus two to the data before it
-        is encrypted. The first block-size octets (for example, 8 octets for
-        a 64-bit block length) are random, and the following two octets are
-        copies of the last two octets of the IV.
+        Process the next chunk of data.
+
+        :param data: The chunk to process.
+        :type data: ``bytes``, ``bytearray``, ``memoryview``
+        :returns: ``bytearray``
         """
-        iv = b'\x00' * (alg.block_size // 8)
+        out = bytearray(len(data) + self.block_size - 1)
+        del out[self.update_into(data, out):]
+        return out
 
-    try:
-        decryptor = Cipher(alg.cipher(key), modes.CFB(iv), default_backend()).decryptor()
+    def update_into(self, data, buf):
+        """
+        Process the next chunk of data, writing the output into ``buf``.
+
+        :param data: The chunk to process.
+        :type data: ``bytes``, ``bytearray``, ``memoryview``
+        :param buf: A writable buffer to write the output to. It must be at least ``len(data) + block_size - 1``
+                    octets long, where ``block_size`` is the block size of the cipher in octets.
+        :type buf: ``bytearray``, ``memoryview``
+        :returns: The number of octets written to ``buf``, which is always ``len(data)``.
+        """
+        if not hasattr(self._ctx, 'update_into'):  # pragma: no cover
+            # older versions of cryptography can only hand back a new bytes object
+            out = self._ctx.update(bytes(data))
+            buf[:len(out)] = out
+            return len(out)
 
-    except UnsupportedAlgorithm as ex:  # pragma: no cover
-        six.raise_from(PGPDecryptionError, ex)
+        return self._ctx.update_into(data, buf)
 
-    else:
-        return bytearray(decryptor.update(ct) + decryptor.finalize())
+    def stream(self, chunks):
+        """
+        Process an iterable of chunks, yielding the output for each one in turn. The context is finalized once
+        ``chunks`` is exhausted.
+
+        :param chunks: The data to process.
+        :type chunks: an iterable of ``bytes``, ``bytearray``, or ``memoryview``
+        :returns: A generator of ``bytearray``
+        """
+        for chunk in chunks:
+            yield self.update(chunk)
+
+        self.finalize()
+
+    def finalize(self):
+        """
+        Finish the operation. CFB never buffers any data, so there is never any output left over.
+        """
+        self._ctx.finalize()
+
+
+def _encrypt(pt, key, alg, iv=None):
+    cfb = _CFB(key, alg, iv)
+    ct = cfb.update(pt)
+    cfb.finalize()
+    return ct
+
+
+def _decrypt(ct, key, alg, iv=None):
+    cfb = _CFB(key, alg, iv, encrypt=False)
+    pt = cfb.update(ct)
+    cfb.finalize()
+    return pt
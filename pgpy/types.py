@@ -8,12 +8,15 @@ import binascii
 import bisect
 import codecs
 import collections
-import operator
 import os
+import operator
 import re
+import threading
 import warnings
 import weakref
 
+from datetime import datetime
+
 from enum import EnumMeta
 from enum import IntEnum
 
@@ -23,6 +26,7 @@ from ._author import __version__
 
 from .decorators import sdproperty
 
+from .errors import PGPDecompressionError
 from .errors import PGPError
 
 __all__ = ['Armorable',
@@ -33,9 +37,15 @@ __all__ = ['Armorable',
            'MetaDispatchable',
            'Dispatchable',
            'SignatureVerification',
+           'KeyValidation',
            'FlagEnumMeta',
            'FlagEnum',
+           'KeyID',
            'Fingerprint',
+           'SessionKeyCache',
+           'VerificationCache',
+           'SortedList',
+           'SignatureList',
            'SorteDeque']
 
 if six.PY2:
@@ -490,6 +500,27 @@ class MetaDispatchable(abc.ABCMeta):
          - the given typeid/ver combination is not already registered
     """
 
+    _rootcls = {}
+    """
+    _rootcls maps every registered Dispatchable class (including the RootClasses themselves) to its RootClass,
+    so that dispatch does not need to search _roots with issubclass on every call.
+    """
+    _dispatch = {}
+    """
+    _dispatch is a flat dispatch table derived from _registry as classes are created. It uses the following format:
+
+    { (RootClass, TypeID, None): SubClass }:
+        the class that handles an unversioned TypeID
+
+    { (RootClass, TypeID, Ver): VerSubClass }:
+        the class that handles version Ver of a versioned TypeID
+    """
+    _versioned = {}
+    """
+    _versioned maps (RootClass, TypeID) to the header class to use for TypeIDs that have multiple versions,
+    which tells dispatch that a version octet immediately follows the header.
+    """
+
     def __new__(mcs, name, bases, attrs):  # NOQA
         ncls = super(MetaDispatchable, mcs).__new__(mcs, name, bases, attrs)
 
@@ -497,15 +528,26 @@ class MetaDispatchable(abc.ABCMeta):
             if ncls.__typeid__ == -1 and not issubclass(ncls, tuple(MetaDispatchable._roots)):
                 # this is a root class
                 MetaDispatchable._roots.add(ncls)
+                MetaDispatchable._rootcls[ncls] = ncls
 
             elif issubclass(ncls, tuple(MetaDispatchable._roots)) and ncls.__typeid__ != -1:
                 for rcls in [ root for root in MetaDispatchable._roots if issubclass(ncls, root) ]:
+                    MetaDispatchable._rootcls.setdefault(ncls, rcls)
+
                     if (rcls, ncls.__typeid__) not in MetaDispatchable._registry:
                         MetaDispatchable._registry[(rcls, ncls.__typeid__)] = ncls
 
+                        if ncls.__typeid__ is not None:
+                            if ncls.__ver__ == 0:
+                                MetaDispatchable._versioned[(rcls, ncls.__typeid__)] = ncls.__headercls__
+
+                            else:
+                                MetaDispatchable._dispatch[(rcls, ncls.__typeid__, None)] = ncls
+
                     if (ncls.__ver__ is not None and ncls.__ver__ > 0 and
                             (rcls, ncls.__typeid__, ncls.__ver__) not in MetaDispatchable._registry):
                         MetaDispatchable._registry[(rcls, ncls.__typeid__, ncls.__ver__)] = ncls
+                        MetaDispatchable._dispatch[(rcls, ncls.__typeid__, ncls.__ver__)] = ncls
 
         # finally, return the new class object
         return ncls
@@ -517,38 +559,34 @@ class MetaDispatchable(abc.ABCMeta):
             return obj
 
         if packet is not None:
-            if cls in MetaDispatchable._roots:
-                rcls = cls
-
-            elif issubclass(cls, tuple(MetaDispatchable._roots)):  # pragma: no cover
+            rcls = MetaDispatchable._rootcls.get(cls, None)
+            if rcls is None:
+                # intermediate classes, such as VersionedPacket, are not registered, but still dispatch from their root
                 rcls = next(root for root in MetaDispatchable._roots if issubclass(cls, root))
 
-            ##TODO: else raise an exception of some kind, but this should never happen
-
             header = rcls.__headercls__()
             header.parse(packet)
 
-            ncls = None
-            if (rcls, header.typeid) in MetaDispatchable._registry:
-                ncls = MetaDispatchable._registry[(rcls, header.typeid)]
+            ver = None
+            vhcls = MetaDispatchable._versioned.get((rcls, header.typeid), None)
+            if vhcls is not None:
+                # this type is versioned, so the version octet immediately follows the header.
+                # rather than re-parsing the whole header, carry over what was already parsed and read just the version
+                if header.__class__ is not vhcls:
+                    nh = vhcls()
+                    nh.__dict__.update(header.__dict__)
+                    header = nh
 
-                if ncls.__ver__ == 0:
-                    if header.__class__ != ncls.__headercls__:
-                        nh = ncls.__headercls__()
-                        nh.__dict__.update(header.__dict__)
-                        try:
-                            nh.parse(packet)
+                try:
+                    header.version = packet[0]
+                    del packet[0]
 
-                        except Exception as ex:
-                            six.raise_from(PGPError, ex)
+                except Exception as ex:
+                    six.raise_from(PGPError, ex)
 
-                        header = nh
+                ver = header.version
 
-                    if (rcls, header.typeid, header.version) in MetaDispatchable._registry:
-                        ncls = MetaDispatchable._registry[(rcls, header.typeid, header.version)]
-
-                    else:  # pragma: no cover
-                        ncls = None
+            ncls = MetaDispatchable._dispatch.get((rcls, header.typeid, ver), None)
 
             if ncls is None:
                 ncls = MetaDispatchable._registry[(rcls, None)]
@@ -559,6 +597,10 @@ class MetaDispatchable(abc.ABCMeta):
             try:
                 obj.parse(packet)
 
+            except PGPDecompressionError:
+                # this needs to reach the caller as-is, even from a nested packet
+                raise
+
             except Exception as ex:
                 six.raise_from(PGPError, ex)
 
@@ -654,6 +696,92 @@ class SignatureVerification(object):
         self._subjects.append(self._sigsubj(verified, by, signature, subject))
 
 
+class KeyValidation(object):
+    class _Status(collections.namedtuple('KeyStatus', ['subject', 'bound', 'revoked', 'expires_at', 'signature'])):
+        __slots__ = ()
+
+        @property
+        def is_expired(self):
+            return self.expires_at is not None and self.expires_at < datetime.utcnow()
+
+        def __bool__(self):
+            return self.bound and not self.revoked and not self.is_expired
+
+        def __nonzero__(self):
+            return self.__bool__()
+
+    @property
+    def is_valid(self):
+        """
+        ``True`` if the primary key is bound to itself by a self-signature that verified, and is neither revoked nor
+        expired. Otherwise, ``False``.
+        """
+        return bool(self.primary)
+
+    @property
+    def valid_userids(self):
+        """
+        A ``list`` of the User IDs and User Attributes of a valid key that have a self-certification that verified,
+        and that are neither revoked nor expired.
+        """
+        return [s.subject for s in self.userids if self.is_valid and s]
+
+    @property
+    def valid_subkeys(self):
+        """
+        A ``list`` of the key ids of the subkeys of a valid key that have a binding signature that verified (and, for
+        signing subkeys, a primary key binding signature as well), and that are neither revoked nor expired.
+        """
+        return [keyid for keyid, s in self.subkeys.items() if self.is_valid and s]
+
+    def __init__(self):
+        """
+        Returned by :py:meth:`PGPKey.validate`
+
+        Can be compared directly as a boolean to determine whether or not the key is valid. The status of the primary
+        key, each User ID, and each subkey is a namedtuple with the following attributes:
+
+        ``status.subject`` - the :py:obj:`~pgpy.PGPKey` or :py:obj:`~pgpy.PGPUID` the status is about.
+
+        ``status.bound`` - ``bool`` of whether a self-signature binding the subject to the primary key verified.
+
+        ``status.revoked`` - ``bool`` of whether a revocation signature by the primary key verified.
+
+        ``status.expires_at`` - the :py:obj:`~datetime.datetime` the subject expires at, or ``None``.
+
+        ``status.signature`` - the :py:obj:`~pgpy.PGPSignature` the subject is bound by, or ``None``.
+
+        Each status is ``True`` when compared as a boolean if the subject is bound, not revoked, and not expired.
+        Expiration is checked each time, so a report stays correct as time passes.
+        """
+        super(KeyValidation, self).__init__()
+        self.primary = None
+        self.userids = []
+        self.subkeys = collections.OrderedDict()
+
+    def __bool__(self):
+        return self.is_valid
+
+    def __nonzero__(self):
+        return self.__bool__()
+
+    def __repr__(self):
+        return "<KeyValidation({valid})>".format(valid=str(self.is_valid))
+
+    def add_status(self, subject, bound, revoked=False, expires_at=None, signature=None):
+        status = self._Status(subject, bound, revoked, expires_at, signature)
+
+        # subject is a PGPKey or a PGPUID, but pgpy.pgp cannot be imported here
+        if not hasattr(subject, 'subkeys'):
+            self.userids.append(status)
+
+        elif subject.is_primary:
+            self.primary = status
+
+        else:
+            self.subkeys[subject.fingerprint.keyid] = status
+
+
 class FlagEnumMeta(EnumMeta):
     def __and__(self, other):
         return { f for f in iter(self) if f.value & other }
@@ -671,49 +799,122 @@ else:
     FlagEnum = FlagEnumMeta('FlagEnum', (IntEnum,), namespace)
 
 
+class KeyID(str):
+    """
+    A subclass of ``str``. Can be compared using == and != to ``str``, ``unicode``, and other :py:obj:`KeyID` instances.
+
+    Key IDs are handled in their binary form from the time they are parsed until they are serialized again, so that
+    looking up a signer or a recipient does not convert back and forth between hex and octets. The string value is the
+    16 hex digits of the key id, as it has always been, and the 8 octets are available from ``bytes()``.
+    """
+    def __new__(cls, content):
+        if isinstance(content, KeyID):
+            return content
+
+        if isinstance(content, bytearray) or (isinstance(content, bytes) and not isinstance(content, str)):
+            # the raw key id
+            if len(content) != 8:
+                raise ValueError("Expected: 8 octets")
+
+            raw = bytes(content)
+            content = str(binascii.hexlify(raw).decode('ascii').upper())
+
+        else:
+            # validate input before continuing: this should be a string of 16 hex digits
+            content = str(content.upper().replace(' ', ''))
+            try:
+                raw = binascii.unhexlify(content) if len(content) == 16 else None
+
+            except (TypeError, ValueError):
+                raw = None
+
+            if raw is None:
+                raise ValueError("Expected: String of 16 hex digits")
+
+        keyid = str.__new__(cls, content)
+        keyid._raw = raw
+        keyid._hash = hash(content)
+        return keyid
+
+    def __eq__(self, other):
+        if isinstance(other, KeyID):
+            return self._raw == other._raw
+
+        if isinstance(other, Fingerprint):
+            return other == self
+
+        return str.__eq__(self, other)
+
+    def __ne__(self, other):
+        return not (self == other)
+
+    def __hash__(self):
+        return self._hash
+
+    def __bytes__(self):
+        return self._raw
+
+
 class Fingerprint(str):
     """
     A subclass of ``str``. Can be compared using == and != to ``str``, ``unicode``, and other :py:obj:`Fingerprint` instances.
 
-    Primarily used as a key for internal dictionaries, so it ignores spaces when comparing and hashing
+    Primarily used as a key for internal dictionaries, so it ignores spaces when comparing and hashing. The raw
+    fingerprint, the key id, the short id, and the hash are all worked out once, when it is created, from a string of
+    40 hex digits, or from the 20 octets of the fingerprint itself.
     """
     @property
     def keyid(self):
-        return str(self).replace(' ', '')[-16:]
+        return self._keyid
 
     @property
     def shortid(self):
-        return str(self).replace(' ', '')[-8:]
+        return self._shortid
 
     def __new__(cls, content):
         if isinstance(content, Fingerprint):
             return content
 
-        # validate input before continuing: this should be a string of 40 hex digits
-        content = content.upper().replace(' ', '')
-        if not bool(re.match(r'^[A-F0-9]{40}$', content)):
-            raise ValueError("Expected: String of 40 hex digits")
+        if isinstance(content, bytearray) or (isinstance(content, bytes) and not isinstance(content, str)):
+            # the raw fingerprint
+            if len(content) != 20:
+                raise ValueError("Expected: 20 octets")
+
+            raw = bytes(content)
+            content = str(binascii.hexlify(raw).decode('ascii').upper())
+
+        else:
+            # validate input before continuing: this should be a string of 40 hex digits
+            content = str(content.upper().replace(' ', ''))
+            try:
+                raw = binascii.unhexlify(content) if len(content) == 40 else None
+
+            except (TypeError, ValueError):
+                raw = None
+
+            if raw is None:
+                raise ValueError("Expected: String of 40 hex digits")
 
         # store in the format: "AAAA BBBB CCCC DDDD EEEE  FFFF 0000 1111 2222 3333"
         #                                               ^^ note 2 spaces here
-        spaces = [ ' ' if i != 4 else '  ' for i in range(10) ]
-        chunks = [ ''.join(g) for g in six.moves.zip_longest(*[iter(content)] * 4) ]
-        content = ''.join(j for i in six.moves.zip_longest(chunks, spaces, fillvalue='') for j in i).strip()
-
-        return str.__new__(cls, content)
+        fp = str.__new__(cls, '  '.join(' '.join(content[i:i + 4] for i in range(h, h + 20, 4)) for h in (0, 20)))
+        fp._raw = raw
+        fp._hex = content
+        fp._keyid = KeyID(content[-16:])
+        fp._shortid = content[-8:]
+        fp._hash = hash(content)
+        return fp
 
     def __eq__(self, other):
         if isinstance(other, Fingerprint):
-            return str(self) == str(other)
+            return self._hash == other._hash and self._raw == other._raw
 
         if isinstance(other, (six.text_type, bytes, bytearray)):
             if isinstance(other, (bytes, bytearray)):  # pragma: no cover
                 other = other.decode('latin-1')
 
             other = str(other).replace(' ', '')
-            return any([self.replace(' ', '') == other,
-                        self.keyid == other,
-                        self.shortid == other])
+            return other == self._hex or other == self._keyid or other == self._shortid
 
         return False  # pragma: no cover
 
@@ -721,14 +922,238 @@ class Fingerprint(str):
         return not (self == other)
 
     def __hash__(self):
-        return hash(str(self.replace(' ', '')))
+        return self._hash
 
     def __bytes__(self):
-        return binascii.unhexlify(six.b(self.replace(' ', '')))
+        return self._raw
+
+
+class SessionKeyCache(object):
+    """
+    A bounded cache of decrypted session keys, for use with :py:meth:`~pgpy.PGPKey.decrypt` and
+    :py:meth:`~pgpy.PGPKey.decrypt_sessionkey`. Entries are keyed on the fingerprint of the decrypting key and the
+    serialized session key packet, so decrypting the same message again, or another message that shares its session
+    key packet, does not need another private key operation. When full, the least recently used entry is evicted.
+
+    .. warning::
+
+        The session keys are kept in memory in the clear for as long as they are cached. Anyone who can read from a
+        cache can decrypt the messages its keys came from.
+    """
+    def __init__(self, maxsize=1024):
+        """
+        :param maxsize: The maximum number of session keys to keep. Default is ``1024``.
+        :type maxsize: ``int``
+        """
+        super(SessionKeyCache, self).__init__()
+        self.maxsize = maxsize
+        self._cache = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._cache)
+
+    def __contains__(self, key):
+        return key in self._cache
+
+    def __setitem__(self, key, value):
+        with self._lock:
+            self._cache.pop(key, None)
+            self._cache[key] = value
+
+            while len(self._cache) > self.maxsize:
+                self._cache.popitem(last=False)
+
+    def get(self, key, default=None):
+        with self._lock:
+            if key not in self._cache:
+                return default
+
+            # move the entry to the most recently used end
+            value = self._cache[key] = self._cache.pop(key)
+            return value
+
+    def clear(self):
+        with self._lock:
+            self._cache.clear()
+
+
+class VerificationCache(SessionKeyCache):
+    """
+    A bounded cache of signature verification results, for use with :py:meth:`~pgpy.PGPKey.validate`. Entries are
+    keyed on the fingerprint of the verifying key, the serialized signature, and the digest of the data it was made
+    over, so validating a key again, even after it has been reloaded, only needs public key operations for signatures
+    that were not seen before. When full, the least recently used entry is evicted.
+    """
+    def __init__(self, maxsize=65536):
+        """
+        :param maxsize: The maximum number of verification results to keep. Default is ``65536``.
+        :type maxsize: ``int``
+        """
+        super(VerificationCache, self).__init__(maxsize)
+
+
+class SortedList(object):
+    """
+    A sequence that keeps itself in sorted order as items are added with :py:meth:`insort`, using :py:mod:`bisect` on
+    a ``list``.
+
+    If ``key`` is given, it is called once for each item as it is inserted, and the result is kept alongside the item,
+    so that the items themselves never need to be compared. Otherwise, the items are compared directly.
+    """
+    def __init__(self, iterable=(), key=None):
+        super(SortedList, self).__init__()
+        self.key = key
+        self._items = []
+        self._keys = self._items if key is None else []
+
+        for item in iterable:
+            self.insort(item)
+
+    def __len__(self):
+        return len(self._items)
+
+    def __bool__(self):
+        return len(self._items) > 0
+
+    def __nonzero__(self):
+        return self.__bool__()
+
+    def __iter__(self):
+        return iter(self._items)
+
+    def __reversed__(self):
+        return reversed(self._items)
+
+    def __getitem__(self, index):
+        return self._items[index]
+
+    def __contains__(self, item):
+        return item in self._items
+
+    def __iadd__(self, other):
+        for item in other:
+            self.insort(item)
+        return self
+
+    def __repr__(self):
+        return "{:s}({!r})".format(self.__class__.__name__, self._items)
+
+    def _keyof(self, item):
+        return item if self.key is None else self.key(item)
+
+    def insort(self, item):
+        self._insort(item, self._keyof(item))
+
+    def _insort(self, item, key):
+        i = bisect.bisect_left(self._keys, key)
+        self._items.insert(i, item)
+        if self.key is not None:
+            self._keys.insert(i, key)
+
+    def remove(self, item):
+        i = self._items.index(item)
+        del self._items[i]
+        if self.key is not None:
+            del self._keys[i]
+
+    def resort(self, item):  # pragma: no cover
+        if item in self:
+            # if item is already in self, see if it is still in sorted order.
+            # if not, re-sort it by removing it and then inserting it into its sorted order
+            i = bisect.bisect_left(self._keys, self._keyof(item))
+            if i == len(self) or self._items[i] is not item:
+                self.remove(item)
+                self.insort(item)
+
+        else:
+            # if item is not in self, just insert it in sorted order
+            self.insort(item)
+
+    def check(self):  # pragma: no cover
+        """re-sort any items in self that are not sorted"""
+        items = self._items[:]
+        del self._items[:]
+        del self._keys[:]
+        for item in items:
+            self.insort(item)
+
+
+class SignatureList(SortedList):
+    """
+    A :py:obj:`SortedList` of signatures, in order of creation, that also indexes them by issuer key ID, and by
+    signature type and issuer key ID, as they are inserted. Looking up the signatures of a given type made by a
+    given key does not need to look at any other signatures.
+    """
+    def __init__(self, iterable=()):
+        self._by_signer = {}
+        self._by_type = {}
+        super(SignatureList, self).__init__(iterable, key=operator.attrgetter('created'))
+
+    @property
+    def signers(self):
+        """A ``set`` of the key ids of the issuers of the signatures in this list."""
+        return set(self._by_signer)
+
+    def by_signer(self, keyid):
+        """
+        :param keyid: The 16-character key id of an issuer.
+        :returns: A ``tuple`` of the signatures in this list made by ``keyid``, in order of creation.
+        """
+        return tuple(self._by_signer.get(keyid, ((), ()))[1])
+
+    def by_type(self, sigtype, keyid):
+        """
+        :param sigtype: The type of signatures to look for.
+        :type sigtype: :py:obj:`~constants.SignatureType`
+        :param keyid: The 16-character key id of an issuer.
+        :returns: A ``tuple`` of the signatures in this list of type ``sigtype`` made by ``keyid``, in order of creation.
+        """
+        return tuple(self._by_type.get((sigtype, keyid), ((), ()))[1])
+
+    def _indexes(self, sig):
+        yield self._by_signer, sig.signer
+        yield self._by_type, (sig.type, sig.signer)
+
+    def _insort(self, sig, key):
+        super(SignatureList, self)._insort(sig, key)
+
+        # each index entry is a pair of lists: the sort keys, and the signatures
+        for index, ikey in self._indexes(sig):
+            keys, sigs = index.setdefault(ikey, ([], []))
+            i = bisect.bisect_left(keys, key)
+            keys.insert(i, key)
+            sigs.insert(i, sig)
+
+    def remove(self, sig):
+        super(SignatureList, self).remove(sig)
+
+        for index, ikey in self._indexes(sig):
+            keys, sigs = index[ikey]
+            i = sigs.index(sig)
+            del keys[i]
+            del sigs[i]
+            if not sigs:
+                del index[ikey]
+
+    def check(self):  # pragma: no cover
+        self._by_signer.clear()
+        self._by_type.clear()
+        super(SignatureList, self).check()
 
 
 class SorteDeque(collections.deque):
-    """A deque subclass that tries to maintain sorted ordering using bisect"""
+    """
+    A deque subclass that tries to maintain sorted ordering using bisect
+
+    .. deprecated:: 0.4.4
+        PGPy no longer uses this; it will be removed in a future release. Use :py:obj:`SortedList` instead.
+    """
+    def __init__(self, *args, **kwargs):
+        warnings.warn("SorteDeque is deprecated and will be removed in a future release; use SortedList instead",
+                      DeprecationWarning, stacklevel=2)
+        super(SorteDeque, self).__init__(*args, **kwargs)
+
     def insort(self, item):
         i = bisect.bisect_left(self, item)
         self.rotate(- i)
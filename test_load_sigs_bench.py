@@ -0,0 +1,56 @@
+#!/usr/bin/env python
+""" benchmark adding and loading lots of signatures on a single User ID
+
+usage: test_load_sigs_bench.py [number of signatures ...]
+"""
+import copy
+import os
+import sys
+import time
+import warnings
+
+from datetime import datetime, timedelta
+
+from pgpy.pgp import PGPKey
+
+
+counts = [ int(c) for c in sys.argv[1:] ] or [1000, 5000, 20000]
+
+key, _ = PGPKey.from_file('tests/testdata/keys/rsa.1.pub.asc')
+uid = key.userids[0]
+template = uid.selfsig
+
+print('{:>10s} {:>12s} {:>12s} {:>12s}'.format('sigs', 'insert (s)', 'load (s)', 'selfsig (s)'))
+
+for count in counts:
+    # make count copies of the self-signature, each one with a different issuer and creation time, in shuffled order,
+    # to stand in for certifications by other keys. They do not verify, but that does not matter here
+    epoch = datetime(2010, 1, 1)
+    sigs = []
+    for i in range(count):
+        sig = copy.copy(template)
+        sig._signature.subpackets['h_CreationTime'][-1].created = epoch + timedelta(seconds=(i * 7919) % count)
+        sig._signature.subpackets['Issuer'][-1].issuer = bytearray(os.urandom(8))
+        sigs.append(sig)
+
+    ukey = copy.copy(key)
+    u = ukey.userids[0]
+
+    t0 = time.time()
+    for sig in sigs:
+        u |= sig
+    t1 = time.time()
+
+    blob = bytes(ukey)
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')
+        t2 = time.time()
+        lkey, _ = PGPKey.from_blob(blob)
+        t3 = time.time()
+
+    assert len(lkey.userids[0]._signatures) == len(u._signatures)
+    t4 = time.time()
+    lkey.userids[0].selfsig
+    t5 = time.time()
+
+    print('{:>10,d} {:>12.3f} {:>12.3f} {:>12.4f}'.format(count, t1 - t0, t3 - t2, t5 - t4))
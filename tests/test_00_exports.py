@@ -14,6 +14,7 @@ modules = ['pgpy.constants',
            'pgpy.types',
            'pgpy.packet.fields',
            'pgpy.packet.packets',
+           'pgpy.packet.scanner',
            'pgpy.packet.types',
            'pgpy.packet.subpackets.signature',
            'pgpy.packet.subpackets.types',
@@ -3,7 +3,22 @@
 """
 import pytest
 
+import binascii
+import collections
+import copy
+import os
+
+from pgpy.constants import SymmetricKeyAlgorithm
+from pgpy.symenc import _CFB
+from pgpy.symenc import _decrypt
+from pgpy.symenc import _encrypt
+from pgpy.types import Fingerprint
+from pgpy.types import KeyID
 from pgpy.types import PGPObject
+from pgpy.types import SessionKeyCache
+from pgpy.types import SignatureList
+from pgpy.types import SortedList
+from pgpy.types import SorteDeque
 
 text = {
     # some basic utf-8 test strings - these should all pass
@@ -70,3 +85,148 @@ class TestPGPObject(object):
 
     def test_bytes_to_text_text(self):
         assert PGPObject.bytes_to_text('asdf') == 'asdf'
+
+
+class TestCFB(object):
+    @pytest.mark.parametrize('alg', [SymmetricKeyAlgorithm.AES128, SymmetricKeyAlgorithm.CAST5],
+                             ids=['AES128', 'CAST5'])
+    def test_stream(self, alg):
+        key = alg.gen_key()
+        pt = bytearray(os.urandom(1000))
+        ct = _encrypt(pt, key, alg)
+
+        # chunk boundaries that do not line up with the block size give the same output as one big update
+        chunks = [pt[i:i + 37] for i in range(0, len(pt), 37)]
+        assert bytearray().join(_CFB(key, alg).stream(chunks)) == ct
+        assert bytearray().join(_CFB(key, alg, encrypt=False).stream(memoryview(ct)[i:i + 37]
+                                                                     for i in range(0, len(ct), 37))) == pt
+
+    def test_update_into(self):
+        alg = SymmetricKeyAlgorithm.AES256
+        key = alg.gen_key()
+        ct = _encrypt(b'\x00' * 64, key, alg)
+
+        cfb = _CFB(key, alg, encrypt=False)
+        buf = bytearray(len(ct) + cfb.block_size - 1)
+        assert cfb.update_into(ct, buf) == 64
+        cfb.finalize()
+        assert buf[:64] == _decrypt(ct, key, alg) == bytearray(64)
+
+
+class TestFingerprint(object):
+    def test_forms(self):
+        hexfp = 'F4294BC8094A7E0585C85E8637473B3758C44F36'
+        fp = Fingerprint(hexfp.lower())
+        raw = Fingerprint(bytearray(binascii.unhexlify(hexfp)))
+
+        assert fp == raw
+        assert str(fp) == str(raw) == 'F429 4BC8 094A 7E05 85C8  5E86 3747 3B37 58C4 4F36'
+        assert bytes(raw) == binascii.unhexlify(hexfp)
+        assert (raw.keyid, raw.shortid) == ('37473B3758C44F36', '58C44F36')
+        assert all(raw == s for s in [hexfp, str(fp), '37473B3758C44F36', '58C44F36'])
+        assert raw != Fingerprint('EBC88A94ACB110F1BE3FE3C12B474BB02084C712')
+
+        # spaces are ignored when hashing, so a fingerprint can be looked up with either form
+        assert {raw: True}[hexfp] and {hexfp: True}[raw]
+        assert Fingerprint(raw) is raw
+        assert copy.copy(raw) == raw and copy.deepcopy(raw).keyid == raw.keyid
+
+
+class TestKeyID(object):
+    def test_forms(self):
+        hexid = '37473B3758C44F36'
+        keyid = KeyID(hexid.lower())
+        raw = KeyID(bytearray(binascii.unhexlify(hexid)))
+
+        assert keyid == raw == hexid
+        assert str(raw) == hexid
+        assert bytes(raw) == binascii.unhexlify(hexid)
+        assert raw != KeyID('2B474BB02084C712') and raw != '2B474BB02084C712'
+        assert KeyID(raw) is raw
+
+        # key ids and plain strings are interchangeable as dictionary keys
+        assert {raw: True}[hexid] and {hexid: True}[raw]
+        assert Fingerprint('F4294BC8094A7E0585C85E8637473B3758C44F36').keyid == raw
+        assert raw == Fingerprint('F4294BC8094A7E0585C85E8637473B3758C44F36')
+
+
+class TestSessionKeyCache(object):
+    def test_lru(self):
+        cache = SessionKeyCache(maxsize=2)
+        cache['a'] = 1
+        cache['b'] = 2
+
+        # looking up 'a' makes 'b' the least recently used entry
+        assert cache.get('a') == 1
+        cache['c'] = 3
+
+        assert len(cache) == 2
+        assert 'b' not in cache
+        assert cache.get('b') is None
+        assert cache.get('a') == 1
+        assert cache.get('c') == 3
+
+        cache.clear()
+        assert len(cache) == 0
+
+
+class TestSortedList(object):
+    def test_insort(self):
+        sl = SortedList([5, 1, 4])
+        sl.insort(3)
+        sl += [2, 0]
+
+        assert list(sl) == [0, 1, 2, 3, 4, 5]
+        assert list(reversed(sl)) == [5, 4, 3, 2, 1, 0]
+        assert sl[-1] == 5
+        assert 3 in sl
+
+        sl.remove(3)
+        assert list(sl) == [0, 1, 2, 4, 5]
+        assert len(sl) == 5
+
+    def test_insort_key(self):
+        # the key is only computed once per item, when it is inserted
+        calls = []
+
+        def key(item):
+            calls.append(item)
+            return item[1]
+
+        sl = SortedList([('c', 3), ('a', 1)], key=key)
+        sl.insort(('b', 2))
+        sl.insort(('a2', 1))
+
+        assert [i for i, _ in sl] == ['a2', 'a', 'b', 'c']
+        assert len(calls) == 4
+
+        sl.remove(('a', 1))
+        sl.insort(('d', 0))
+        assert [i for i, _ in sl] == ['d', 'a2', 'b', 'c']
+
+    def test_sortedeque_deprecated(self):
+        with pytest.warns(DeprecationWarning):
+            sd = SorteDeque([1, 4])
+
+        sd.insort(3)
+        assert list(sd) == [1, 3, 4]
+
+
+class TestSignatureList(object):
+    fakesig = collections.namedtuple('fakesig', ['created', 'type', 'signer'])
+
+    def test_index(self):
+        sigs = [self.fakesig(3, 'cert', 'AAAA'), self.fakesig(1, 'cert', 'BBBB'),
+                self.fakesig(2, 'revoke', 'AAAA'), self.fakesig(0, 'cert', 'AAAA')]
+        sl = SignatureList(sigs)
+
+        assert [sig.created for sig in sl] == [0, 1, 2, 3]
+        assert sl.signers == {'AAAA', 'BBBB'}
+        assert [sig.created for sig in sl.by_signer('AAAA')] == [0, 2, 3]
+        assert [sig.created for sig in sl.by_type('cert', 'AAAA')] == [0, 3]
+        assert list(sl.by_type('revoke', 'BBBB')) == []
+        assert list(sl.by_signer('CCCC')) == []
+
+        sl.remove(sigs[1])
+        assert sl.signers == {'AAAA'}
+        assert [sig.created for sig in sl] == [0, 2, 3]
@@ -5,9 +5,18 @@ import pytest
 import glob
 import os
 
+from pgpy.constants import CompressionAlgorithm
+from pgpy.constants import SymmetricKeyAlgorithm
+from pgpy.packet import CompressedData
+from pgpy.packet import IntegrityProtectedSKEDataV1
 from pgpy.packet import Packet
 from pgpy.packet import PubKeyV4, PubSubKeyV4, PrivKeyV4, PrivSubKeyV4
+from pgpy.errors import PGPError
 from pgpy.packet import Opaque
+from pgpy.packet import scan
+from pgpy.packet import scan_stream
+from pgpy.packet.types import VersionedPacket
+from pgpy.types import MetaDispatchable
 
 # import pgpy.packet.fields
 
@@ -41,6 +50,7 @@ def binload(f):
 
 
 pktfiles = sorted(glob.glob('tests/testdata/packets/[0-9]*'))
+compfiles = [f for f in pktfiles if f.endswith('.compressed')]
 
 
 class TestPacket(object):
@@ -78,3 +88,103 @@ class TestPacket(object):
         # if this is a key, ensure len(p.keymaterial) == len(bytes(p.keymaterial))
         if isinstance(p, (PubKeyV4, PubSubKeyV4, PrivKeyV4, PrivSubKeyV4)):
             assert len(p.keymaterial) == len(p.keymaterial.__bytes__())
+
+    @pytest.mark.parametrize('packet', pktfiles, ids=[os.path.basename(f) for f in pktfiles])
+    def test_dispatch(self, packet):
+        b = binload(packet)
+        p = Packet(b[:])
+
+        # the class the dispatch table picks is the one the registry lookup would have picked
+        ncls = MetaDispatchable._registry.get((Packet, p.header.tag), None)
+        if ncls is not None and ncls.__ver__ == 0:
+            assert isinstance(p.header, ncls.__headercls__)
+            ncls = MetaDispatchable._registry.get((Packet, p.header.tag, p.header.version), None)
+
+        assert p.__class__ is (ncls or Opaque)
+
+        # calling an intermediate class dispatches the same way as calling the root class
+        assert VersionedPacket(b[:]).__class__ is p.__class__
+
+    @pytest.mark.parametrize('packet', pktfiles, ids=[os.path.basename(f) for f in pktfiles])
+    def test_scan(self, packet):
+        b = binload(packet)
+        index = scan(b)
+
+        # scanning should not consume anything
+        assert b == binload(packet)
+        assert len(index) == 1
+
+        entry = index[0]
+        p = Packet(b[:])
+
+        assert entry.offset == 0
+        assert entry.size == len(b)
+        assert entry.tag == p.header.tag
+        assert entry.length == p.header.length
+        assert entry.version == getattr(p.header, 'version', None)
+        assert entry.partial is (packet == 'tests/testdata/packets/11.partial.literal')
+
+    def test_scan_stream(self):
+        b = bytearray().join(binload(f) for f in pktfiles)
+        index = scan(b)
+
+        assert len(index) == len(pktfiles)
+        assert index[-1].end == len(b)
+        assert all(a.end == b.offset for a, b in zip(index, index[1:]))
+
+    def test_scan_stream_chunks(self):
+        b = bytearray().join(binload(f) for f in pktfiles)
+
+        # walking the same data in odd-sized pieces finds the same packets with the same bodies
+        walked = [(tag, bytearray().join(body)) for tag, body in scan_stream(b[i:i + 37] for i in range(0, len(b), 37))]
+
+        index = scan(b)
+        assert [(tag, len(pbody)) for tag, pbody in walked] == [(entry.tag, entry.length) for entry in index]
+        assert all(pbody == b[entry.offset + entry.hlen:entry.end] for (_, pbody), entry in zip(walked, index) if not entry.partial)
+
+        # bodies that are not read are skipped
+        assert [tag for tag, _ in scan_stream([b])] == [entry.tag for entry in index]
+
+        with pytest.raises(PGPError):
+            list(scan_stream([b[:-1]]))
+
+    def test_scan_truncated(self):
+        b = binload('tests/testdata/packets/11.literal')
+        with pytest.raises(PGPError):
+            scan(b[:-1])
+
+    @pytest.mark.parametrize('packet', compfiles, ids=[os.path.basename(f) for f in compfiles])
+    def test_compressed_chunked(self, packet, monkeypatch):
+        b = binload(packet)
+        p = Packet(b[:])
+
+        # feeding the decompressor tiny pieces gives the same result
+        monkeypatch.setattr(CompressedData, 'chunksize', 7)
+        cp = Packet(b[:])
+
+        assert [bytes(pkt) for pkt in cp.packets] == [bytes(pkt) for pkt in p.packets]
+        assert bytes(cp) == bytes(b)
+
+    @pytest.mark.parametrize('calg', CompressionAlgorithm, ids=[c.name for c in CompressionAlgorithm])
+    def test_compress_iter(self, calg):
+        data = bytearray(os.urandom(512)) * 64
+        chunks = [data[i:i + 1000] for i in range(0, len(data), 1000)]
+        compressed = b''.join(calg.compress_iter(chunks))
+
+        assert bytes(calg.decompress(compressed)) == bytes(data)
+        assert b''.join(calg.decompress_iter(compressed[i:i + 10] for i in range(0, len(compressed), 10))) == data
+
+    def test_seipd_encrypt_chunked(self):
+        alg = SymmetricKeyAlgorithm.AES256
+        key = alg.gen_key()
+        data = bytearray(os.urandom(5000))
+
+        # the ciphertext buffer is sized up front for bytes, and grows as chunks of unknown total length arrive
+        whole = IntegrityProtectedSKEDataV1()
+        whole.encrypt(key, alg, data)
+        chunked = IntegrityProtectedSKEDataV1()
+        chunked.encrypt(key, alg, (data[i:i + 37] for i in range(0, len(data), 37)))
+
+        for pkt in (whole, chunked):
+            assert len(pkt.ct) == alg.block_size // 8 + 2 + len(data) + 22
+            assert pkt.decrypt(key, alg)[:-22] == data
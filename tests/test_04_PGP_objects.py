@@ -11,7 +11,8 @@ from pgpy import PGPMessage
 from pgpy import PGPSignature
 from pgpy import PGPDetachedSignature
 from pgpy import PGPUID
-from pgpy.packet import Packet, CompressedData
+from pgpy.constants import HashAlgorithm, PubKeyAlgorithm, SignatureType, TrustLevel
+from pgpy.packet import Packet, CompressedData, LiteralData
 from pgpy.types import Fingerprint, Armorable
 
 from conftest import gpg_ver
@@ -54,6 +55,62 @@ class TestPGPMessage(object):
         assert len(msg_packets) == len(packets)
         assert all(isinstance(pkt, Packet) for pkt in msg_packets)
 
+    @pytest.mark.parametrize('msgfile', _msgfiles, ids=[os.path.basename(f) for f in _msgfiles])
+    def test_peek(self, msgfile):
+        msg = PGPMessage.from_file(msgfile)
+
+        with open(msgfile, 'r') as mf:
+            peek = PGPMessage.peek(mf.read())
+
+        assert set(r.keyid for r in peek.recipients) == msg.encrypters
+        assert set(s.keyid for s in peek.signers) == msg.signers
+        assert peek.encrypted == msg.is_encrypted
+        assert len(peek.passphrases) == len([sk for sk in msg._sessionkeys if sk.__class__.__name__.startswith('SKE')])
+
+        # binary input gives the same answer, although PGPy may have reordered the signatures
+        bpeek = PGPMessage.peek(bytes(msg))
+        assert bpeek.recipients == peek.recipients
+        assert set(bpeek.signers) == set(peek.signers)
+
+    def test_peek_mixed_signers(self):
+        rsa, _ = PGPKey.from_file('tests/testdata/keys/rsa.1.sec.asc')
+        dsa, _ = PGPKey.from_file('tests/testdata/keys/dsa.1.sec.asc')
+        msg = PGPMessage.new('mixed signers')
+        rsig = rsa.sign(msg)
+        dsig = dsa.sign(msg)
+
+        # one signature with a one-pass signature packet, and one without
+        data = bytes(rsig.make_onepass()) + bytes(msg._message) + bytes(rsig._signature) + bytes(dsig._signature)
+        peek = PGPMessage.peek(data)
+
+        assert [s.keyid for s in peek.signers] == [rsig.signer, dsig.signer]
+
+    @pytest.mark.parametrize('msgfile', [f for f in _msgfiles if 'encrypted' in f or 'cast5' in f],
+                             ids=[os.path.basename(f) for f in _msgfiles if 'encrypted' in f or 'cast5' in f])
+    def test_ciphertext_not_copied(self, msgfile):
+        msg = PGPMessage.from_file(msgfile)
+
+        assert msg.is_encrypted
+        assert isinstance(msg.message.ct, memoryview)
+
+        # and it still round-trips
+        assert bytes(PGPMessage.from_blob(bytes(msg))) == bytes(msg)
+
+    @pytest.mark.parametrize('sigtype', [SignatureType.BinaryDocument, SignatureType.CanonicalDocument])
+    def test_iter_hashdata_file(self, sigtype, tmpdir, monkeypatch):
+        path = str(tmpdir.join('hashme.txt'))
+        with open(path, 'wb') as mf:
+            mf.write(b'line one\r\nline two\nline three\r\r\n\n')
+
+        msg = PGPMessage.new(path, file=True)
+        sig = PGPSignature.new(sigtype, PubKeyAlgorithm.RSAEncryptOrSign, HashAlgorithm.SHA256, 'AAAAAAAAAAAAAAAA')
+
+        # read the file in pieces small enough that line endings get split between them
+        monkeypatch.setattr(LiteralData, 'chunksize', 3)
+        chunked = b''.join(bytes(chunk) for chunk in sig.iter_hashdata(msg._message))
+
+        assert chunked == sig.hashdata(msg.message)
+
 
 class TestPGPDetachedSignature(object):
     @pytest.mark.parametrize('msgfile', _msgfiles, ids=[os.path.basename(f) for f in _msgfiles])
@@ -368,3 +425,105 @@ class TestPGPKeyring(object):
         assert 'F429 4BC8 094A 7E05 85C8  5E86 3747 3B37 58C4 4F36' in keyring
         assert '37473B3758C44F36' in keyring
         assert '58C44F36' in keyring
+
+    def test_merge(self):
+        dsa, _ = PGPKey.from_file('tests/testdata/keys/dsa.1.sec.asc')
+        upd, _ = PGPKey.from_file('tests/testdata/keys/rsa.1.pub.asc')
+        uid = upd.userids[0]
+        uid |= dsa.certify(uid)
+
+        kr = PGPKeyring()
+        assert kr.merge('tests/testdata/keys/rsa.1.sec.asc') == {upd.fingerprint: None}
+        assert kr.merge('tests/testdata/keys/rsa.1.pub.asc') == {upd.fingerprint: None}
+        assert len(kr) == 6
+
+        # keys that are already loaded are merged into, not loaded again
+        merged = kr.merge(upd)
+        assert len(kr) == 6
+        [(subject, sig)] = merged[upd.fingerprint].signatures
+        assert sig.signer == dsa.fingerprint.keyid
+        assert any(s is sig and u is subject for s, u in kr._certs[dsa.fingerprint.keyid])
+
+        assert kr.merge(upd, 'tests/testdata/keys/rsa.1.pub.asc') == {upd.fingerprint: ([], [], [])}
+
+    def test_minimize(self):
+        kr = PGPKeyring('tests/testdata/keys/rsa.1.pub.asc', 'tests/testdata/keys/dsa.1.pub.asc')
+        dsaid = '2B474BB02084C712'
+        size = sum(len(bytes(key)) for key in kr._keys.values() if key.is_primary)
+        assert len(kr._certs[dsaid]) == 1
+
+        # the certification by dsa.1 is kept while dsa.1 is in the keyring
+        kr.minimize()
+        assert len(kr._certs[dsaid]) == 1
+        assert len(kr) == 6
+        assert 'RSA von TestKey' in kr
+
+        with kr.key(dsaid) as dsa:
+            kr.unload(dsa)
+        kr.minimize()
+        assert dsaid not in kr._certs
+        assert sum(len(bytes(key)) for key in kr._keys.values() if key.is_primary) < size
+
+    def test_web_of_trust_unhashed(self):
+        secs = [ PGPKey.from_file('tests/testdata/keys/{}.asc'.format(f))[0] for f in ('rsa.1.sec', 'dsa.1.sec', 'ecc.1.sec') ]
+        pubs = [ sec.pubkey for sec in secs ]
+        rsa, dsa, ecc = pubs
+
+        # anyone can add a trust signature to the unhashed area of rsa's certification of dsa, but it is not
+        # covered by the signature, so it must not make dsa a trusted introducer
+        cert = secs[0].certify(dsa.userids[0])
+        cert._signature.subpackets.addnew('TrustSignature', level=1, amount=120)
+        assert cert.trust is None
+
+        uid = dsa.userids[0]
+        uid |= cert
+        uid = ecc.userids[0]
+        uid |= secs[1].certify(uid)
+
+        kr = PGPKeyring(pubs)
+        kr.set_ownertrust(rsa.fingerprint, TrustLevel.Ultimate)
+        assert kr.validity(dsa) == TrustLevel.Fully
+        assert kr.validity(ecc) == TrustLevel.Unknown
+
+    def test_web_of_trust(self):
+        secs = [ PGPKey.from_file('tests/testdata/keys/{}.asc'.format(f))[0]
+                 for f in ('rsa.1.sec', 'dsa.1.sec', 'ecc.1.sec', 'targette.sec.rsa') ]
+        pubs = [ sec.pubkey for sec in secs ]
+        rsa, dsa, ecc, targette = pubs
+
+        # rsa makes dsa a trusted introducer, dsa certifies ecc, and ecc certifies targette
+        for signer, signee, prefs in [(0, 1, {'trust': (1, 120)}), (1, 2, {}), (2, 3, {})]:
+            uid = pubs[signee].userids[0]
+            uid |= secs[signer].certify(uid, **prefs)
+
+        kr = PGPKeyring(pubs)
+        assert set(kr._certs) == {rsa.fingerprint.keyid, dsa.fingerprint.keyid, ecc.fingerprint.keyid}
+        assert all(kr.validity(key) == TrustLevel.Unknown for key in pubs)
+
+        kr.set_ownertrust(rsa.fingerprint, TrustLevel.Ultimate)
+        assert kr.ownertrust('RSA von TestKey') == TrustLevel.Ultimate
+        assert kr.validity(rsa) == TrustLevel.Ultimate
+        assert kr.validity(dsa) == TrustLevel.Fully
+        assert kr.validity(ecc) == TrustLevel.Fully
+        assert kr.validity(targette) == TrustLevel.Unknown
+        assert kr.trust_path(ecc) == [rsa, dsa, ecc]
+        assert kr.trust_path(targette) == []
+
+        # ecc is not trusted to introduce anyone until it is given owner trust
+        kr.set_ownertrust(ecc.fingerprint.keyid, TrustLevel.Marginal)
+        assert kr.validity(targette.userids[0].name) == TrustLevel.Marginal
+        kr.marginals_needed = 1
+        assert kr.validity(targette) == TrustLevel.Fully
+        assert kr.trust_path(targette) == [rsa, dsa, ecc, targette]
+
+        kr.max_cert_depth = 2
+        assert kr.validity(targette) == TrustLevel.Unknown
+
+        # without trust signatures, dsa is only a valid key, not an introducer
+        kr.trust_signatures = False
+        assert kr.validity(dsa) == TrustLevel.Fully
+        assert kr.validity(ecc) == TrustLevel.Unknown
+
+        # unloading a key removes its certifications
+        kr.unload(dsa)
+        assert all(uid.parent is not dsa for certs in kr._certs.values() for sig, uid in certs)
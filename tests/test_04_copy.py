@@ -7,6 +7,7 @@ import copy
 import glob
 import inspect
 import os.path
+import pickle
 import six
 
 import pgpy
@@ -15,7 +16,8 @@ from pgpy import PGPSignature, PGPUID, PGPMessage, PGPKey
 
 
 _keys = glob.glob('tests/testdata/keys/*.1.pub.asc') + glob.glob('tests/testdata/keys/*.1.sec.asc')
-_msgs = [ 'tests/testdata/messages/message.{}.asc'.format(f) for f in ['signed', 'rsa.cast5.no-mdc', 'rsa.dsa.pass.aes']]
+_msgs = [ 'tests/testdata/messages/message.{}.asc'.format(f) for f in ['signed', 'rsa.cast5.no-mdc', 'rsa.dsa.pass.aes',
+                                                                       'ecdh.encrypted.aes']]
 
 
 def sig():
@@ -85,11 +87,11 @@ def test_copy_obj(request, obj):
 
     for k in sorted(objflat, key=ksort):
         print("checking attribute: {} ".format(k), end="")
-        if isinstance(objflat[k], pgpy.types.SorteDeque):
-            print("[SorteDeque] ", end="")
+        if isinstance(objflat[k], pgpy.types.SortedList):
+            print("[SortedList] ", end="")
             assert len(objflat[k]) == len(obj2flat[k])
 
-        if not isinstance(objflat[k], (pgpy.types.PGPObject, pgpy.types.SorteDeque)):
+        if not isinstance(objflat[k], (pgpy.types.PGPObject, pgpy.types.SortedList)):
             print("[{} ]".format(type(objflat[k])), end="")
             assert objflat[k] == objflat[k], k
 
@@ -100,3 +102,14 @@ def test_copy_obj(request, obj):
 
         else:
             print()
+
+
+@pytest.mark.parametrize('msgfile', _msgs[1:], ids=[os.path.basename(m) for m in _msgs[1:]])
+def test_deepcopy_pickle_encrypted(msgfile):
+    # the ciphertext of a parsed message refers to the data it was parsed from, until it is copied
+    msg = PGPMessage.from_file(msgfile)
+    assert msg.is_encrypted
+
+    for msg2 in (copy.deepcopy(msg), pickle.loads(pickle.dumps(msg))):
+        assert bytes(msg2) == bytes(msg)
+        assert not isinstance(msg2.message.ct, memoryview)
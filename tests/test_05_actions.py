@@ -5,6 +5,7 @@ import pytest
 from conftest import gpg_ver, gnupghome
 
 import copy
+import gc
 import glob
 import gpg
 import itertools
@@ -12,6 +13,7 @@ import os
 import six
 import tempfile
 import time
+import warnings
 
 from datetime import datetime, timedelta
 from pgpy import PGPKey
@@ -24,6 +26,7 @@ from pgpy.constants import Features
 from pgpy.constants import HashAlgorithm
 from pgpy.constants import KeyFlags
 from pgpy.constants import KeyServerPreferences
+from pgpy.constants import PacketTag
 from pgpy.constants import PubKeyAlgorithm
 from pgpy.constants import RevocationReason
 from pgpy.constants import SignatureType
@@ -31,8 +34,14 @@ from pgpy.constants import SymmetricKeyAlgorithm
 from pgpy.errors import PGPError
 from pgpy.packet import Packet
 from pgpy.packet import Signature
+from pgpy.packet import scan
+from pgpy.packet.packets import CompressedData
+from pgpy.packet.packets import PKESessionKeyV3
 from pgpy.packet.packets import PrivKeyV4
 from pgpy.packet.packets import PrivSubKeyV4
+from pgpy.packet.packets import PubKeyV4
+from pgpy.types import SessionKeyCache
+from pgpy.types import VerificationCache
 
 
 enc_msgs = [ PGPMessage.from_file(f) for f in sorted(glob.glob('tests/testdata/messages/message*.pass*.asc')) ]
@@ -94,6 +103,108 @@ class TestPGPMessage(object):
             # see if GPG can parse our message
             assert self.gpg_message(msg) == mtxt
 
+    @pytest.mark.parametrize('comp_alg,mmap', itertools.product(CompressionAlgorithm, [False, True]))
+    def test_new_from_file_lazy(self, comp_alg, mmap, tmpdir):
+        path = str(tmpdir.join('lazy.bin'))
+        mtxt = bytearray(os.urandom(1 << 17)) + b'\r\nThis is a new message!\r\n' * 4096
+        with open(path, 'wb') as mf:
+            mf.write(mtxt)
+
+        msg = PGPMessage.new(path, file=True, compression=comp_alg, mmap=mmap)
+
+        # the contents are only read when they are needed
+        assert msg._message.is_file
+        assert len(msg._message._contents) == 0
+        assert msg.filename == 'lazy.bin'
+        assert msg.message == mtxt
+
+        # serializing in pieces gives the same message, compressed or not
+        pmsg = PGPMessage.from_blob(b''.join(bytes(chunk) for chunk in msg.iter_bytes()))
+        assert pmsg.message == mtxt
+
+        # both ways of encrypting should agree with each other, too
+        emsg = PGPMessage.from_blob(bytes(msg.encrypt("QwertyUiop")))
+        assert emsg.decrypt("QwertyUiop").message == mtxt
+
+        # see if GPG can parse our message
+        assert self.gpg_message(msg) == mtxt
+
+    @pytest.mark.parametrize('mmap', [False, True])
+    def test_new_from_file_closed(self, mmap):
+        path = 'tests/testdata/files/literal.1.txt'
+        with open(path, 'rb') as mf:
+            mtxt = mf.read().decode('latin-1')
+
+        lit = PGPMessage.new(path, file=True, mmap=mmap)._message
+        cpy = copy.copy(lit)
+        src, csrc = lit._file[0], cpy._file[0]
+
+        with lit:
+            assert lit.contents == mtxt
+        assert src.closed
+
+        # a copy has its own file, which is closed when the copy is garbage collected
+        assert not csrc.closed
+        assert cpy.contents == mtxt
+        del cpy
+        gc.collect()
+        assert csrc.closed
+
+    def test_new_from_file_object(self):
+        with open('tests/testdata/files/literal.1.txt', 'rb') as mf:
+            mtxt = mf.read()
+            mf.seek(0)
+            msg = PGPMessage.new(mf, file=True)
+
+            assert msg._message.is_file
+            assert msg.filename == 'literal.1.txt'
+            assert msg._message.format == 't'
+            assert msg.message == mtxt.decode('latin-1')
+
+            # a file object that was passed in is left open
+            msg._message.close()
+            assert not mf.closed
+
+    @pytest.mark.parametrize('comp_alg', [CompressionAlgorithm.ZIP, CompressionAlgorithm.ZLIB, CompressionAlgorithm.BZ2])
+    def test_new_compression_level(self, comp_alg):
+        mtxt = u"This is a new message!\n" * 1024
+        fast = PGPMessage.new(mtxt, compression=comp_alg, compression_level=1)
+        small = PGPMessage.new(mtxt, compression=comp_alg, compression_level=9)
+
+        assert fast._compression == small._compression == comp_alg
+        assert len(bytes(fast)) >= len(bytes(small))
+        assert PGPMessage.from_blob(bytes(fast)).message == mtxt
+
+        # see if GPG can parse our message
+        assert self.gpg_message(fast).decode('utf-8') == mtxt
+
+    def test_compressed_data_changed(self):
+        comp = CompressedData()
+        comp.calg = CompressionAlgorithm.ZLIB
+        comp.packets = [PGPMessage.new(u"one")._message]
+        comp.update_hlen()
+
+        # changing the packets after update_hlen must not serialize the compressed data kept from before
+        comp.packets.append(PGPMessage.new(u"two")._message)
+        assert [pkt.contents for pkt in Packet(bytearray(bytes(comp))).packets] == [u"one", u"two"]
+
+        comp.level = 1
+        assert [pkt.contents for pkt in Packet(bytearray(bytes(comp))).packets][-1] == u"two"
+
+        # or if the contents of a packet change, even without changing its length
+        comp.update_hlen()
+        comp.packets[-1]._contents = bytearray(b"owt")
+        assert [pkt.contents for pkt in Packet(bytearray(bytes(comp))).packets][-1] == u"owt"
+
+    def test_new_skip_incompressible(self):
+        noise = bytearray(os.urandom(1 << 17))
+        msg = PGPMessage.new(noise, skip_incompressible=True)
+        assert not msg.is_compressed
+        assert msg.message == noise
+
+        text = PGPMessage.new(u"This is a new message!\n" * 1024, skip_incompressible=True)
+        assert text._compression == CompressionAlgorithm.ZIP
+
     @pytest.mark.regression(issue=154)
     # @pytest.mark.parametrize('cleartext', [False, True])
     def test_new_non_unicode(self):
@@ -138,6 +249,35 @@ class TestPGPMessage(object):
         assert decmsg is not enc_msg
         assert decmsg.message == b"This is stored, literally\\!\n\n"
 
+    @pytest.mark.parametrize('comp_alg', CompressionAlgorithm)
+    def test_decrypt_passphrase_sink(self, comp_alg):
+        mtxt = bytearray(os.urandom(1 << 17))
+        encmsg = PGPMessage.from_blob(bytes(PGPMessage.new(mtxt, compression=comp_alg).encrypt("QwertyUiop")))
+
+        # a file object
+        out = six.BytesIO()
+        decmsg = encmsg.decrypt("QwertyUiop", sink=out)
+
+        assert out.getvalue() == mtxt
+        assert decmsg._message.is_redirected
+        assert decmsg.filename == ''
+        with pytest.raises(PGPError):
+            decmsg.message
+
+        # or a callable
+        chunks = []
+        encmsg.decrypt("QwertyUiop", sink=chunks.append)
+        assert b''.join(bytes(c) for c in chunks) == mtxt
+
+        # errors from the sink itself are not mistaken for a wrong passphrase
+        out.close()
+        with pytest.raises(PGPError) as exc:
+            encmsg.decrypt("QwertyUiop", sink=out)
+        cause = exc.value
+        while isinstance(cause, PGPError):
+            cause = cause.__cause__
+        assert isinstance(cause, ValueError)
+
     @pytest.mark.parametrize('comp_alg', CompressionAlgorithm)
     def test_encrypt_passphrase(self, comp_alg):
         mtxt = "This message is to be encrypted"
@@ -709,6 +849,23 @@ class TestPGPKey_Actions(object):
         # verify with GnuPG
         self.gpg_verify(message, pubkey=targette_pub)
 
+    def test_sign_file_message(self, targette_sec, targette_pub, tmpdir):
+        # test signing a message that is backed by a file, which is hashed a piece at a time
+        path = str(tmpdir.join('signme.txt'))
+        with open(path, 'wb') as mf:
+            mf.write(b'This is a file!\r\n' * 40000)
+
+        message = PGPMessage.new(path, file=True)
+        sig = targette_sec.sign(message)
+        message |= sig
+
+        assert message._message.is_file
+        assert targette_pub.verify(message)
+        assert targette_pub.verify(message.message, sig)
+
+        # verify with GnuPG
+        self.gpg_verify(message, pubkey=targette_pub)
+
     @pytest.mark.run(after='test_sign_message')
     def test_verify_message(self, targette_pub, message):
         # test verifying a signed message
@@ -731,6 +888,116 @@ class TestPGPKey_Actions(object):
         # verify with GnuPG
         self.gpg_verify(ctmessage, pubkey=targette_pub)
 
+    @pytest.mark.parametrize('comp_alg', CompressionAlgorithm)
+    def test_sign_onepass_stream(self, targette_sec, targette_pub, comp_alg):
+        # test signing a message in the same pass as it is written out
+        sec, _ = PGPKey.from_file('tests/testdata/keys/rsa.1.sec.asc')
+        pub, _ = PGPKey.from_file('tests/testdata/keys/rsa.1.pub.asc')
+        mtxt = bytearray(os.urandom(1 << 17))
+        message = PGPMessage.new(mtxt, compression=comp_alg)
+
+        raw = b''.join(bytes(chunk) for chunk in message.iter_signed(targette_sec, sec))
+        assert len(message.signatures) == 2
+
+        # the message is in memory, so it is written with definite lengths, even though it was signed as it went
+        assert not any(entry.partial for entry in scan(raw))
+        assert b''.join(bytes(chunk) for chunk in message.iter_bytes()) == bytes(message)
+
+        pmessage = PGPMessage.from_blob(raw)
+        assert pmessage.message == mtxt
+        assert targette_pub.verify(pmessage)
+        assert pub.verify(pmessage)
+
+        # and verify it again in a single pass
+        out = six.BytesIO()
+        assert targette_pub.verify_onepass(six.BytesIO(raw), out)
+        assert out.getvalue() == mtxt
+
+    @pytest.mark.parametrize('comp_alg', CompressionAlgorithm)
+    def test_verify_onepass_stream(self, targette_sec, targette_pub, comp_alg):
+        # signatures in front of the literal data set up the hash contexts just like one-pass signatures do
+        message = PGPMessage.new("This is a message!", compression=comp_alg)
+        message |= targette_sec.sign(message)
+
+        sv = targette_pub.verify_onepass(six.BytesIO(bytes(message)))
+        assert sv
+        assert [s.signature for s in sv.good_signatures] == message.signatures
+
+        # a signed message generated by GnuPG
+        pub, _ = PGPKey.from_file('tests/testdata/keys/rsa.1.pub.asc')
+        with open('tests/testdata/messages/message.signed.asc', 'r') as mf:
+            raw = PGPMessage.ascii_unarmor(mf.read())['body']
+        assert pub.verify_onepass(six.BytesIO(bytes(raw)))
+
+        # a message that has been tampered with does not verify
+        if comp_alg == CompressionAlgorithm.Uncompressed:
+            raw = bytearray(bytes(message))
+            raw[raw.index(b'This is a message!')] ^= 0x20
+            assert not targette_pub.verify_onepass(six.BytesIO(bytes(raw)))
+
+    def test_sign_cleartext_stream(self, targette_sec, targette_pub):
+        # test signing a cleartext document a line at a time
+        text = b'This is a cleartext document!\r\n-----dashes need escaping\n' * 1024 + b'- and the last line'
+        out = six.BytesIO()
+        sig = targette_sec.sign_cleartext(six.BytesIO(text), out)
+
+        assert sig.type == SignatureType.CanonicalDocument
+
+        # the same output as building the whole message in memory
+        ctmessage = PGPMessage.new(text.decode('latin-1'), cleartext=True)
+        ctmessage |= sig
+        assert out.getvalue() == str(ctmessage).encode('latin-1')
+        assert targette_pub.verify(PGPMessage.from_blob(out.getvalue()))
+
+        # verify with GnuPG
+        self.gpg_verify(out.getvalue().decode('latin-1'), pubkey=targette_pub)
+
+    @pytest.mark.parametrize('msgfile', sorted(glob.glob('tests/testdata/messages/cleartext*.asc')))
+    def test_verify_cleartext_stream(self, msgfile):
+        # test verifying a cleartext document a line at a time
+        pub, _ = PGPKey.from_file('tests/testdata/keys/rsa.1.pub.asc')
+        msg = PGPMessage.from_file(msgfile)
+
+        out = six.BytesIO()
+        with open(msgfile, 'rb') as mf:
+            sv = pub.verify_cleartext(mf, out)
+
+        assert sv
+        assert out.getvalue() == msg.message.encode('utf-8')
+        assert set(bytes(s.signature) for s in sv.good_signatures) == set(bytes(s.signature) for s in pub.verify(msg).good_signatures)
+
+    def test_verify_cleartext_stream_binary_sig(self, targette_sec, targette_pub):
+        # the text of a cleartext document is always hashed as text, so any other kind of signature is rejected
+        text = u'This is a cleartext document!'
+        ctmessage = PGPMessage.new(text, cleartext=True)
+        ctmessage |= targette_sec.sign(text)
+        assert ctmessage.signatures[0].type == SignatureType.BinaryDocument
+
+        with pytest.raises(PGPError):
+            targette_pub.verify_cleartext(six.BytesIO(str(ctmessage).encode('latin-1')))
+
+    @pytest.mark.parametrize('sec, pub', list(zip(seckeys, pubkeys)),
+                             ids=[os.path.basename(f) for f in sorted(glob.glob('tests/testdata/keys/*.sec.asc'))])
+    def test_sign_verify_data(self, sec, pub, monkeypatch):
+        # versions of cryptography that cannot sign and verify a digest are fed the data itself instead
+        text = u'This is a message!'
+        prehashed = sec.sign(text)
+
+        monkeypatch.setattr('pgpy.pgp.Prehashed', None)
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore')
+            sig = sec.sign(text)
+            message = PGPMessage.new(text)
+            message |= sec.sign(message)
+
+            assert pub.verify(text, sig)
+            assert pub.verify(text, prehashed)
+            assert pub.verify(message)
+
+        monkeypatch.undo()
+        assert pub.verify(text, sig)
+        assert pub.verify(message)
+
     @pytest.mark.run(after='test_sign_ctmessage')
     def test_verify_ctmessage(self, targette_pub, ctmessage):
         # test verifying a signed cleartext message
@@ -918,6 +1185,11 @@ class TestPGPKey_Actions(object):
 
         assert dmsg.message == "This message will have been encrypted"
 
+        # the contents can also be written straight to a file object, without being kept in the message
+        out = six.BytesIO()
+        assert sec.decrypt(emsg, sink=out).filename == dmsg.filename
+        assert out.getvalue() == b"This message will have been encrypted"
+
         # now check with GnuPG, if possible
         if gpg_ver < '2.1' and sec.key_algorithm in {PubKeyAlgorithm.ECDSA, PubKeyAlgorithm.ECDH}:
             # GnuPG prior to 2.1.x does not support EC* keys, so skip this step
@@ -945,6 +1217,315 @@ class TestPGPKey_Actions(object):
 
         assert self.gpg_decrypt(emsg, sec).decode('utf-8') == dmsg.message
 
+    @pytest.mark.parametrize('workers', [1, 4])
+    def test_encrypt_to(self, workers):
+        # encrypt a message to several keys and a passphrase at once
+        secs = [PGPKey.from_file('tests/testdata/keys/{}.1.sec.asc'.format(alg))[0] for alg in ('rsa', 'ecc', 'dsa')]
+        mtxt = "This message will have been encrypted"
+
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore')
+            emsg = PGPMessage.new(mtxt).encrypt_to([sec.pubkey for sec in secs[:2]], "QwertyUiop", workers=workers)
+
+        # one session key packet per recipient, but the contents are only encrypted once
+        assert len(emsg._sessionkeys) == 3
+        assert emsg.encrypters == {'EEE097A017B979CA', 'A81B93FD16BD9806'}
+        assert len([e for e in scan(emsg.__bytes__()) if e.tag == PacketTag.SymmetricallyEncryptedIntegrityProtectedData]) == 1
+
+        for sec in secs[:2]:
+            assert sec.decrypt(emsg).message == mtxt
+        assert emsg.decrypt("QwertyUiop").message == mtxt
+
+        with pytest.raises(PGPError):
+            secs[2].decrypt(emsg)
+
+        # now check with GnuPG
+        assert self.gpg_decrypt(emsg, secs[0]).decode('utf-8') == mtxt
+
+    def test_encrypt_to_cipher(self):
+        rsa, _ = PGPKey.from_file('tests/testdata/keys/rsa.1.sec.asc')
+        ecc, _ = PGPKey.from_file('tests/testdata/keys/ecc.1.sec.asc')
+        msg = PGPMessage.new("This message will have been encrypted")
+
+        def _cipher(emsg):
+            pkesk = next(sk for sk in emsg._sessionkeys if sk.encrypter == 'EEE097A017B979CA')
+            return pkesk.decrypt_sk(rsa.subkeys['EEE097A017B979CA']._key)[0]
+
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore')
+
+            # the first cipher in the first recipient's preferences that every recipient supports is used
+            assert _cipher(msg.encrypt_to([rsa.pubkey, ecc.pubkey])) == SymmetricKeyAlgorithm.AES256
+            assert _cipher(msg.encrypt_to([ecc.pubkey, rsa.pubkey])) == SymmetricKeyAlgorithm.AES128
+
+        # an explicit cipher is used even if it is not preferred
+        with pytest.warns(UserWarning, match="Selected symmetric algorithm not in key preferences"):
+            emsg = msg.encrypt_to([rsa.pubkey], cipher=SymmetricKeyAlgorithm.Blowfish)
+        assert _cipher(emsg) == SymmetricKeyAlgorithm.Blowfish
+
+        # only passphrases
+        emsg = msg.encrypt_to([], passphrases=["QwertyUiop", "AsdfGhjkl"])
+        assert emsg.encrypters == set()
+        assert emsg.decrypt("AsdfGhjkl").message == "This message will have been encrypted"
+
+        with pytest.raises(PGPError):
+            msg.encrypt_to([])
+
+        with pytest.raises(PGPError):
+            emsg.encrypt_to([], passphrases="QwertyUiop")
+
+    def test_decrypt_sessionkey(self, monkeypatch):
+        rsa, _ = PGPKey.from_file('tests/testdata/keys/rsa.1.sec.asc')
+        ecc, _ = PGPKey.from_file('tests/testdata/keys/ecc.1.sec.asc')
+        mtxt = "This message will have been encrypted"
+
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore')
+            emsg = rsa.pubkey.encrypt(PGPMessage.new(mtxt), cipher=SymmetricKeyAlgorithm.AES128)
+
+            # count the private key operations
+            calls = []
+            decrypt_sk = PKESessionKeyV3.decrypt_sk
+            monkeypatch.setattr(PKESessionKeyV3, 'decrypt_sk', lambda pkesk, pk: calls.append(pkesk) or decrypt_sk(pkesk, pk))
+
+            cipher, sessionkey = rsa.decrypt_sessionkey(emsg)
+            assert cipher == SymmetricKeyAlgorithm.AES128
+            assert len(sessionkey) == 16
+            assert emsg.decrypt_with_sessionkey(cipher, sessionkey).message == mtxt
+
+            # with a cache, the session key is only decrypted once
+            cache = SessionKeyCache()
+            for _ in range(3):
+                assert rsa.decrypt(PGPMessage.from_blob(str(emsg)), cache=cache).message == mtxt
+            assert rsa.decrypt_sessionkey(emsg, cache=cache) == (cipher, sessionkey)
+            assert len(cache) == 1
+            assert len(calls) == 2
+
+            # the session key can be used to add another recipient, without re-encrypting the contents
+            with pytest.raises(PGPError):
+                emsg.encrypt_to([ecc.pubkey])
+
+            # nor with a cipher or session key that the contents were not encrypted with
+            with pytest.raises(PGPError):
+                emsg.encrypt_to([ecc.pubkey], cipher=cipher, sessionkey=bytes(bytearray(b ^ 0xFF for b in sessionkey)))
+            with pytest.raises(PGPError):
+                emsg.encrypt_to([ecc.pubkey], cipher=SymmetricKeyAlgorithm.AES256, sessionkey=sessionkey)
+
+            emsg2 = emsg.encrypt_to([ecc.pubkey], cipher=cipher, sessionkey=sessionkey)
+            assert emsg2.encrypters == {'EEE097A017B979CA', 'A81B93FD16BD9806'}
+            assert emsg2.message is emsg.message
+            assert ecc.decrypt(emsg2).message == mtxt
+            assert rsa.decrypt(emsg2).message == mtxt
+
+        with pytest.raises(PGPError):
+            rsa.decrypt_sessionkey(PGPMessage.new(mtxt))
+
+        with pytest.raises(PGPError):
+            PGPMessage.new(mtxt).decrypt_with_sessionkey(cipher, sessionkey)
+
+    def test_decrypt_locked_subkey(self):
+        # the primary key is unlocked, but the subkey that the message is encrypted to is not
+        sec, _ = PGPKey.from_file('tests/testdata/keys/rsa.1.sec.asc')
+
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore')
+            sec.subkeys['EEE097A017B979CA'].protect("QwertyUiop", SymmetricKeyAlgorithm.AES256, HashAlgorithm.SHA256)
+            emsg = sec.pubkey.encrypt(PGPMessage.new("This message will have been encrypted"))
+
+            assert sec.is_unlocked
+            with pytest.raises(PGPError, match='is_unlocked == True'):
+                sec.decrypt(emsg)
+
+            with sec.subkeys['EEE097A017B979CA'].unlock("QwertyUiop"):
+                assert sec.decrypt(emsg).message == "This message will have been encrypted"
+
+    @pytest.mark.parametrize('workers', [1, 4])
+    def test_decrypt_anonymous(self, workers, monkeypatch):
+        secs = [PGPKey.from_file('tests/testdata/keys/{}.1.sec.asc'.format(alg))[0] for alg in ('rsa', 'ecc', 'dsa')]
+        rsa, ecc, dsa = secs
+        mtxt = "This message will have been encrypted"
+
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore')
+            emsg = PGPMessage.new(mtxt).encrypt_to([rsa.pubkey, ecc.pubkey, rsa.pubkey], throw_keyid=True)
+        assert emsg.encrypters == {'0000000000000000'}
+
+        # count the private key operations
+        calls = []
+        decrypt_sk = PKESessionKeyV3.decrypt_sk
+        monkeypatch.setattr(PKESessionKeyV3, 'decrypt_sk', lambda pkesk, pk: calls.append(pkesk) or decrypt_sk(pkesk, pk))
+
+        # keys that can encrypt are tried first, only with pkesks of the right algorithm, and the search stops at the
+        # first success. The rsa.1 primary key does not say it can encrypt, so it is only tried as a last resort,
+        # and the ECDSA primary key of ecc.1 is never tried.
+        for sec in (rsa, ecc):
+            del calls[:]
+            assert sec.decrypt(emsg, workers=workers).message == mtxt
+            assert len(calls) == 1 or (workers > 1 and len(calls) <= 4)
+
+        del calls[:]
+        with pytest.raises(PGPError):
+            dsa.decrypt(emsg, workers=workers)
+        assert len(calls) == 0
+
+    def test_merge(self):
+        sec, _ = PGPKey.from_file('tests/testdata/keys/rsa.1.sec.asc')
+        pub, _ = PGPKey.from_file('tests/testdata/keys/rsa.1.pub.asc')
+        dsa, _ = PGPKey.from_file('tests/testdata/keys/dsa.1.sec.asc')
+
+        # the public key has a User Attribute, and a newer self-certification of the User ID, that the private key has not
+        for _ in range(2):
+            merged = sec.merge(pub)
+            assert len(list(sec.__iter__())) == len(list(pub.__iter__()))
+        assert merged == ([], [], [])
+
+        # merging a copy with a new certification only adds that certification
+        upd = copy.copy(pub)
+        uid = upd.userids[0]
+        uid |= dsa.certify(uid)
+        merged = pub.merge(upd)
+        assert merged.userids == merged.subkeys == []
+        assert [(subject, sig.signer) for subject, sig in merged.signatures] == [(pub.userids[0], dsa.fingerprint.keyid)]
+        assert pub.merge(upd) == ([], [], [])
+        assert bytes(pub) == bytes(upd)
+
+        with pytest.raises(ValueError):
+            pub.merge(dsa)
+
+    def test_minimize(self):
+        pub, _ = PGPKey.from_file('tests/testdata/keys/rsa.1.pub.asc')
+        dsa, _ = PGPKey.from_file('tests/testdata/keys/dsa.1.pub.asc')
+        size = len(bytes(pub))
+
+        # keep the certification of the User Attribute by dsa.1
+        assert pub.minimize(certifiers=[dsa.fingerprint]) is pub
+        assert [len(uid._signatures) for uid in pub._uids] == [1, 2]
+        assert [uid.selfsig.created for uid in pub._uids] == [datetime(2014, 7, 23, 21, 34, 10), datetime(2014, 7, 23, 21, 32, 25)]
+        assert pub.userattributes[0].signers == {pub.fingerprint.keyid, dsa.fingerprint.keyid}
+
+        # keep no certifications; the signing subkey keeps its primary key binding signature
+        pub.minimize()
+        assert [len(uid._signatures) for uid in pub._uids] == [1, 1]
+        assert [len(sk._signatures) for sk in pub.subkeys.values()] == [2, 1]
+        assert len(bytes(pub)) < size
+
+        # what is left is still a valid key, and loads back to the same thing
+        assert pub.validate().valid_subkeys == list(pub.subkeys)
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore')
+            assert pub.verify(pub)
+        assert bytes(PGPKey.from_blob(bytes(pub))[0]) == bytes(pub)
+
+        with pytest.raises(PGPError):
+            next(iter(pub.subkeys.values())).minimize()
+
+    def test_minimize_unsupported_revocation(self, monkeypatch):
+        sec, _ = PGPKey.from_file('tests/testdata/keys/rsa.1.sec.asc')
+        subkey = sec.subkeys['2A834D8E5918E886']
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore')
+            rev = sec.revoke(subkey)
+        subkey |= rev
+
+        # a revocation that cannot be verified does not revoke the subkey, but it is not removed either
+        verify_sig = PGPKey._verify_sig
+
+        def _verify_sig(key, sig, subject, cache=None):
+            if sig is rev:
+                raise NotImplementedError(sig.key_algorithm)
+            return verify_sig(key, sig, subject, cache)
+
+        monkeypatch.setattr(PGPKey, '_verify_sig', _verify_sig)
+        sec.minimize()
+        assert '2A834D8E5918E886' in sec.subkeys
+        assert rev in subkey._signatures
+
+    def test_validate(self, monkeypatch):
+        cache = VerificationCache()
+        sec, _ = PGPKey.from_file('tests/testdata/keys/rsa.1.sec.asc')
+        subkey = sec.subkeys['2A834D8E5918E886']
+
+        report = sec.validate(cache)
+        assert report.is_valid
+        assert report.primary.subject is sec
+        assert report.valid_userids == sec.userids
+        assert report.valid_subkeys == list(sec.subkeys)
+        assert report.subkeys['2A834D8E5918E886'].signature in subkey._signatures
+        assert subkey.validate() is report
+        assert len(cache) == 4
+
+        # validating the key again, or another copy of it, does not verify anything again
+        calls = []
+        verify = PubKeyV4.verify
+        monkeypatch.setattr(PubKeyV4, 'verify', lambda *args: calls.append(args) or verify(*args))
+        assert sec.validate(cache) is report
+        assert PGPKey.from_file('tests/testdata/keys/rsa.1.sec.asc')[0].validate(cache).is_valid
+        assert calls == []
+
+        # a User ID with a self-certification copied from another User ID is not bound to the key
+        uid = PGPUID.new('Abraham Lincoln')
+        uid |= copy.copy(sec.userids[0].selfsig)
+        sec.add_uid(uid, selfsign=False)
+        report = sec.validate(cache)
+        assert [u.name for u in report.valid_userids] == ['RSA von TestKey']
+        assert not next(s for s in report.userids if s.subject is uid).bound
+
+        # revoking a subkey is noticed the next time the key is validated
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore')
+            subkey |= sec.revoke(subkey)
+        report = sec.validate(cache)
+        assert report.is_valid
+        assert report.subkeys['2A834D8E5918E886'].revoked
+        assert report.valid_subkeys == ['EEE097A017B979CA']
+
+    def test_select(self):
+        sec, _ = PGPKey.from_file('tests/testdata/keys/rsa.1.sec.asc')
+        msg = "This message will have been signed"
+
+        signer = sec.select(KeyFlags.Sign)
+        assert signer.fingerprint.keyid == '2A834D8E5918E886'
+        assert sec.select(KeyFlags.Certify, KeyFlags.Sign) is sec
+        assert sec.select(KeyFlags.EncryptCommunications).fingerprint.keyid == 'EEE097A017B979CA'
+        assert sec.select(KeyFlags.Sign) is signer
+
+        with pytest.raises(PGPError):
+            sec.select(KeyFlags.Authentication)
+
+        # signing with the primary key warns that the subkey is used instead; signing with the subkey does not
+        with pytest.warns(UserWarning):
+            assert sec.sign(msg).signer == signer.fingerprint.keyid
+
+        with warnings.catch_warnings():
+            warnings.simplefilter('error')
+            sig = signer.sign(msg)
+        assert sec.pubkey.verify(msg, sig)
+
+        # a new self-certification that gives the primary key the Sign flag changes what is selected
+        uid = sec.userids[0]
+        time.sleep(1)
+        uid |= sec.certify(uid, SignatureType.Positive_Cert, usage={KeyFlags.Certify, KeyFlags.Sign})
+        assert sec.select(KeyFlags.Sign) is sec
+
+    def test_key_state_cached(self):
+        sec, _ = PGPKey.from_file('tests/testdata/keys/rsa.1.sec.asc')
+        uid = sec.userids[0]
+
+        flags = sec.usage_flags()
+        assert ('usage_flags', None) in sec._state
+        assert sec.expires_at is None
+
+        # the returned set is a copy, so changing it must not change the cached value
+        flags.add(KeyFlags.Authentication)
+        assert KeyFlags.Authentication not in sec.usage_flags()
+
+        # adding a newer self-signature invalidates the cached state
+        time.sleep(1)
+        uid |= sec.certify(uid, SignatureType.Positive_Cert, usage={KeyFlags.Certify, KeyFlags.Sign},
+                           key_expiration=timedelta(days=1))
+        assert sec.usage_flags() == {KeyFlags.Certify, KeyFlags.Sign}
+        assert sec.expires_at is not None
+
     @pytest.mark.run(after='test_encrypt_message')
     @pytest.mark.parametrize('sf,cipher',
                              itertools.product(sorted(glob.glob('tests/testdata/keys/*.sec.asc')), sorted(SymmetricKeyAlgorithm)))
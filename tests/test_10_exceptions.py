@@ -3,22 +3,28 @@
 import pytest
 
 import glob
+import six
+
 from pgpy import PGPKey
 from pgpy import PGPKeyring
 from pgpy import PGPMessage
 from pgpy import PGPSignature
 from pgpy import PGPUID
+from pgpy.constants import CompressionAlgorithm
 from pgpy.constants import EllipticCurveOID
 from pgpy.constants import HashAlgorithm
 from pgpy.constants import KeyFlags
 from pgpy.constants import PubKeyAlgorithm
 from pgpy.constants import SymmetricKeyAlgorithm
+from pgpy.packet import CompressedData
 from pgpy.packet import Packet
 from pgpy.types import Armorable
 from pgpy.types import PGPObject
 from pgpy.types import Fingerprint
+from pgpy.types import KeyID
 from pgpy.types import SignatureVerification
 from pgpy.errors import PGPError
+from pgpy.errors import PGPDecompressionError
 from pgpy.errors import PGPDecryptionError
 from pgpy.errors import PGPEncryptionError
 from pgpy.errors import PGPInsecureCipher
@@ -342,6 +348,67 @@ class TestPGPKey(object):
             rsa_sec.add_subkey(temp_key)
 
 
+class TestCompressedData(object):
+    @pytest.fixture
+    def bomb(self):
+        # a megabyte of zeros deflates to about a kilobyte
+        return bytes(PGPMessage.new(bytearray(1 << 20), compression=CompressionAlgorithm.ZIP))
+
+    def test_max_size(self, bomb, monkeypatch):
+        monkeypatch.setattr(CompressedData, 'max_size', 1 << 16)
+        with pytest.raises(PGPDecompressionError):
+            PGPMessage.from_blob(bomb)
+
+    @pytest.mark.parametrize('ratio', [100, 100.0, 2.5])
+    def test_max_ratio(self, bomb, monkeypatch, ratio):
+        monkeypatch.setattr(CompressedData, 'max_ratio', ratio)
+        with pytest.raises(PGPDecompressionError):
+            PGPMessage.from_blob(bomb)
+
+    def test_max_depth(self, monkeypatch):
+        pkt = PGPMessage.new('asdf', compression=CompressionAlgorithm.Uncompressed)._message
+        for _ in range(4):
+            comp = CompressedData()
+            comp.calg = CompressionAlgorithm.ZLIB
+            comp.packets.append(pkt)
+            comp.update_hlen()
+            pkt = comp
+
+        data = bytes(pkt)
+        assert Packet(bytearray(data)).packets[0].packets[0].packets[0].packets[0].contents == u'asdf'
+
+        monkeypatch.setattr(CompressedData, 'max_depth', 3)
+        with pytest.raises(PGPDecompressionError):
+            Packet(bytearray(data))
+
+    def test_verify_onepass_limits(self, bomb, rsa_pub, monkeypatch):
+        # verifying in a single pass decompresses as it goes, but is held to the same limits
+        monkeypatch.setattr(CompressedData, 'max_size', 1 << 16)
+        with pytest.raises(PGPDecompressionError):
+            rsa_pub.verify_onepass(six.BytesIO(bomb))
+
+        monkeypatch.setattr(CompressedData, 'max_size', None)
+        monkeypatch.setattr(CompressedData, 'max_ratio', 100)
+        with pytest.raises(PGPDecompressionError):
+            rsa_pub.verify_onepass(six.BytesIO(bomb))
+
+        monkeypatch.setattr(CompressedData, 'max_ratio', None)
+        nested = bytes(PGPMessage.new('asdf', compression=CompressionAlgorithm.ZLIB))
+        for _ in range(3):
+            comp = CompressedData()
+            comp.calg = CompressionAlgorithm.ZLIB
+            comp.packets.append(Packet(bytearray(nested)))
+            nested = bytes(comp)
+
+        monkeypatch.setattr(CompressedData, 'max_depth', 3)
+        with pytest.raises(PGPDecompressionError):
+            rsa_pub.verify_onepass(six.BytesIO(nested))
+
+        # a compressed data packet with an empty body
+        with pytest.raises(PGPError):
+            rsa_pub.verify_onepass(six.BytesIO(b'\xc8\x00'))
+
+
 class TestPGPKeyring(object):
     kr = PGPKeyring(_read('tests/testdata/pubtest.asc'))
 
@@ -428,3 +495,18 @@ class TestFingerprint(object):
 
         with pytest.raises(ValueError):
             Fingerprint("ABCD EFGH IJKL MNOP QRST  UVWX YZ01 2345 6789 AABB")
+
+        with pytest.raises(ValueError):
+            Fingerprint(bytearray(16))
+
+
+class TestKeyID(object):
+    def test_bad_input(self):
+        with pytest.raises(ValueError):
+            KeyID("ABCDEFG")
+
+        with pytest.raises(ValueError):
+            KeyID("GHIJKLMNOPQRSTUV")
+
+        with pytest.raises(ValueError):
+            KeyID(bytearray(20))